@@ -45,6 +45,12 @@ export function NotificationBell() {
       }
     };
 
+    // Sent when events since our Last-Event-ID were trimmed: re-fetch instead.
+    es.addEventListener("reset", () => {
+      if (!alive) return;
+      loadCount();
+    });
+
     es.onerror = () => {
       if (!alive) return;
       es.close();
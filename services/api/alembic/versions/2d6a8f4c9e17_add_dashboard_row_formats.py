@@ -0,0 +1,66 @@
+"""add dashboard_row_formats for the dashboard format filter
+
+Revision ID: 2d6a8f4c9e17
+Revises: 7c3e9a1f5b42
+Create Date: 2026-02-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2d6a8f4c9e17"
+down_revision: Union[str, None] = "7c3e9a1f5b42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BACKFILL_CHUNK = 1000
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dashboard_row_formats",
+        sa.Column("shelf_item_id", sa.String(length=36), nullable=False),
+        sa.Column("format", sa.String(length=20), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["shelf_item_id"], ["shelf_items.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("shelf_item_id", "format"),
+    )
+
+    _backfill()
+
+
+def _backfill() -> None:
+    """Carried formats of existing rows, from their availability JSON."""
+    bind = op.get_bind()
+    dashboard_rows = sa.table(
+        "dashboard_rows",
+        sa.column("shelf_item_id", sa.String),
+        sa.column("availability", sa.JSON),
+    )
+    row_formats = sa.table(
+        "dashboard_row_formats",
+        sa.column("shelf_item_id", sa.String),
+        sa.column("format", sa.String),
+        sa.column("status", sa.String),
+    )
+
+    values = [
+        {"shelf_item_id": sid, "format": a["format"], "status": a["status"]}
+        for sid, availability in bind.execute(
+            sa.select(dashboard_rows.c.shelf_item_id, dashboard_rows.c.availability)
+        )
+        for a in availability or []
+        if a.get("status") in ("available", "hold")
+    ]
+    for i in range(0, len(values), _BACKFILL_CHUNK):
+        bind.execute(row_formats.insert(), values[i : i + _BACKFILL_CHUNK])
+
+
+def downgrade() -> None:
+    op.drop_table("dashboard_row_formats")
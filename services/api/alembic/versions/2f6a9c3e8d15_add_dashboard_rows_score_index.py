@@ -0,0 +1,31 @@
+"""index dashboard_rows by read-next score
+
+Revision ID: 2f6a9c3e8d15
+Revises: 7c1d5e9a2b84
+Create Date: 2026-01-29 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2f6a9c3e8d15"
+down_revision: Union[str, None] = "7c1d5e9a2b84"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_dashboard_rows_user_score",
+        "dashboard_rows",
+        ["user_id", sa.text("read_next_score DESC"), "shelf_item_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dashboard_rows_user_score", table_name="dashboard_rows")
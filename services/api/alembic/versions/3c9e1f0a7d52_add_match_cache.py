@@ -0,0 +1,51 @@
+"""add match_cache table
+
+Revision ID: 3c9e1f0a7d52
+Revises: 7b7d94f4f3e1
+Create Date: 2026-01-05 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9e1f0a7d52"
+down_revision: Union[str, None] = "7b7d94f4f3e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "match_cache",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("provider", sa.String(length=40), nullable=False),
+        sa.Column("normalized_key", sa.String(length=1024), nullable=False),
+        sa.Column("catalog_item_id", sa.String(length=36), nullable=False),
+        sa.Column("method", sa.String(length=40), nullable=False),
+        sa.Column("confidence", sa.Float(), nullable=False),
+        sa.Column("evidence", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["catalog_item_id"], ["catalog_items.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "provider", "normalized_key", name="uq_match_cache_provider_key"
+        ),
+    )
+    op.create_index(
+        op.f("ix_match_cache_catalog_item_id"),
+        "match_cache",
+        ["catalog_item_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_match_cache_catalog_item_id"), table_name="match_cache")
+    op.drop_table("match_cache")
@@ -0,0 +1,30 @@
+"""drop dashboard_rows.reasons (built per page on read)
+
+Revision ID: 4d2b7e1f9a36
+Revises: a83f0d6c5e21
+Create Date: 2026-02-04 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4d2b7e1f9a36"
+down_revision: Union[str, None] = "a83f0d6c5e21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("dashboard_rows") as batch_op:
+        batch_op.drop_column("reasons")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("dashboard_rows") as batch_op:
+        batch_op.add_column(
+            sa.Column("reasons", sa.JSON(), nullable=False, server_default="[]")
+        )
@@ -0,0 +1,43 @@
+"""record the fingerprint of each match attempt on shelf items
+
+Revision ID: 4f8b1d3e7a25
+Revises: 9a4c6e2d1b58
+Create Date: 2026-02-16 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f8b1d3e7a25"
+down_revision: Union[str, None] = "9a4c6e2d1b58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("shelf_items") as batch_op:
+        batch_op.add_column(
+            sa.Column("match_attempt_fingerprint", sa.String(length=40), nullable=True)
+        )
+    # Matched items keep their match's fingerprint; unmatched ones are tried
+    # once more on the next refresh, which then records the attempt.
+    op.execute(
+        """
+        UPDATE shelf_items
+        SET match_attempt_fingerprint = (
+            SELECT cm.item_fingerprint
+            FROM catalog_matches cm
+            WHERE cm.shelf_item_id = shelf_items.id
+              AND cm.user_id = shelf_items.user_id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("shelf_items") as batch_op:
+        batch_op.drop_column("match_attempt_fingerprint")
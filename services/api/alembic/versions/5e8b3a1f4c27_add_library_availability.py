@@ -0,0 +1,141 @@
+"""add library_availability table shared across users
+
+Revision ID: 5e8b3a1f4c27
+Revises: d41f7c2a9b60
+Create Date: 2026-01-26 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+from uuid import uuid4
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8b3a1f4c27"
+down_revision: Union[str, None] = "d41f7c2a9b60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BACKFILL_CHUNK = 1000
+
+
+def upgrade() -> None:
+    op.create_table(
+        "library_availability",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("library_system", sa.String(length=200), nullable=False),
+        sa.Column("catalog_item_id", sa.String(length=36), nullable=False),
+        sa.Column("format", sa.String(length=20), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("copies_available", sa.Integer(), nullable=True),
+        sa.Column("copies_total", sa.Integer(), nullable=True),
+        sa.Column("holds", sa.Integer(), nullable=True),
+        sa.Column("deep_link", sa.String(length=500), nullable=True),
+        sa.Column("last_checked_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["catalog_item_id"], ["catalog_items.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "library_system",
+            "catalog_item_id",
+            "format",
+            name="uq_library_avail_library_item_format",
+        ),
+    )
+    op.create_index(
+        op.f("ix_library_availability_catalog_item_id"),
+        "library_availability",
+        ["catalog_item_id"],
+        unique=False,
+    )
+
+    _backfill()
+
+
+def _backfill() -> None:
+    """Collapse per-user snapshots into one row per (library, item, format).
+
+    The most recently checked snapshot wins. Per-user rows are left in place.
+    """
+    bind = op.get_bind()
+    snapshots = sa.table(
+        "availability_snapshots",
+        sa.column("user_id", sa.String),
+        sa.column("catalog_item_id", sa.String),
+        sa.column("format", sa.String),
+        sa.column("status", sa.String),
+        sa.column("copies_available", sa.Integer),
+        sa.column("copies_total", sa.Integer),
+        sa.column("holds", sa.Integer),
+        sa.column("deep_link", sa.String),
+        sa.column("last_checked_at", sa.DateTime(timezone=True)),
+    )
+    user_settings = sa.table(
+        "user_settings",
+        sa.column("user_id", sa.String),
+        sa.column("library_system", sa.String),
+    )
+    library_availability = sa.table(
+        "library_availability",
+        sa.column("id", sa.String),
+        sa.column("library_system", sa.String),
+        sa.column("catalog_item_id", sa.String),
+        sa.column("format", sa.String),
+        sa.column("status", sa.String),
+        sa.column("copies_available", sa.Integer),
+        sa.column("copies_total", sa.Integer),
+        sa.column("holds", sa.Integer),
+        sa.column("deep_link", sa.String),
+        sa.column("last_checked_at", sa.DateTime(timezone=True)),
+    )
+
+    library = sa.func.coalesce(user_settings.c.library_system, "default")
+    rows = bind.execute(
+        sa.select(
+            library,
+            snapshots.c.catalog_item_id,
+            snapshots.c.format,
+            snapshots.c.status,
+            snapshots.c.copies_available,
+            snapshots.c.copies_total,
+            snapshots.c.holds,
+            snapshots.c.deep_link,
+            snapshots.c.last_checked_at,
+        )
+        .select_from(
+            snapshots.outerjoin(
+                user_settings, user_settings.c.user_id == snapshots.c.user_id
+            )
+        )
+        .order_by(snapshots.c.last_checked_at)
+    )
+
+    latest: dict[tuple[str, str, str], dict] = {}
+    for r in rows:
+        latest[(r[0], r[1], r[2])] = {
+            "id": str(uuid4()),
+            "library_system": r[0],
+            "catalog_item_id": r[1],
+            "format": r[2],
+            "status": r[3],
+            "copies_available": r[4],
+            "copies_total": r[5],
+            "holds": r[6],
+            "deep_link": r[7],
+            "last_checked_at": r[8],
+        }
+
+    values = list(latest.values())
+    for i in range(0, len(values), _BACKFILL_CHUNK):
+        bind.execute(library_availability.insert(), values[i : i + _BACKFILL_CHUNK])
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_library_availability_catalog_item_id"),
+        table_name="library_availability",
+    )
+    op.drop_table("library_availability")
@@ -0,0 +1,55 @@
+"""track dashboard row changes for delta sync
+
+Revision ID: 6e9c2a4b7f10
+Revises: 4d2b7e1f9a36
+Create Date: 2026-02-06 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6e9c2a4b7f10"
+down_revision: Union[str, None] = "4d2b7e1f9a36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("dashboard_rows") as batch_op:
+        batch_op.add_column(
+            sa.Column("change_seq", sa.Integer(), nullable=False, server_default="0")
+        )
+    op.create_index(
+        "ix_dashboard_rows_user_change_seq",
+        "dashboard_rows",
+        ["user_id", "change_seq"],
+        unique=False,
+    )
+
+    op.create_table(
+        "dashboard_tombstones",
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("shelf_item_id", sa.String(length=36), nullable=False),
+        sa.Column("change_seq", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "shelf_item_id"),
+    )
+    op.create_index(
+        "ix_dashboard_tombstones_user_seq",
+        "dashboard_tombstones",
+        ["user_id", "change_seq"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dashboard_tombstones_user_seq", table_name="dashboard_tombstones")
+    op.drop_table("dashboard_tombstones")
+    op.drop_index("ix_dashboard_rows_user_change_seq", table_name="dashboard_rows")
+    with op.batch_alter_table("dashboard_rows") as batch_op:
+        batch_op.drop_column("change_seq")
@@ -0,0 +1,68 @@
+"""add dashboard_rows read model
+
+Revision ID: 7c1d5e9a2b84
+Revises: 5e8b3a1f4c27
+Create Date: 2026-01-28 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1d5e9a2b84"
+down_revision: Union[str, None] = "5e8b3a1f4c27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows are built on first dashboard read for each user.
+    op.create_table(
+        "dashboard_rows",
+        sa.Column("shelf_item_id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("shelf_source_id", sa.String(length=36), nullable=True),
+        sa.Column("title", sa.String(length=600), nullable=False),
+        sa.Column("title_key", sa.String(length=600), nullable=False),
+        sa.Column("author", sa.String(length=400), nullable=True),
+        sa.Column("shelf", sa.String(length=80), nullable=True),
+        sa.Column("needs_fuzzy_match", sa.Boolean(), nullable=False),
+        sa.Column("match", sa.JSON(), nullable=True),
+        sa.Column("availability", sa.JSON(), nullable=False),
+        sa.Column("read_next_score", sa.Float(), nullable=False),
+        sa.Column("read_next_tier", sa.String(length=20), nullable=False),
+        sa.Column("best_format", sa.String(length=20), nullable=True),
+        sa.Column("hold_ratio", sa.Float(), nullable=True),
+        sa.Column("reasons", sa.JSON(), nullable=False),
+        sa.Column("item_updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["shelf_item_id"], ["shelf_items.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["shelf_source_id"], ["shelf_sources.id"], ondelete="SET NULL"
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("shelf_item_id"),
+    )
+    op.create_index(
+        "ix_dashboard_rows_user_title",
+        "dashboard_rows",
+        ["user_id", "title_key", "shelf_item_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_dashboard_rows_user_updated",
+        "dashboard_rows",
+        ["user_id", "item_updated_at", "shelf_item_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dashboard_rows_user_updated", table_name="dashboard_rows")
+    op.drop_index("ix_dashboard_rows_user_title", table_name="dashboard_rows")
+    op.drop_table("dashboard_rows")
@@ -0,0 +1,30 @@
+"""add users.changes_floor for dashboard tombstone retention
+
+Revision ID: 7c3e9a1f5b42
+Revises: 4f8b1d3e7a25
+Create Date: 2026-02-17 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c3e9a1f5b42"
+down_revision: Union[str, None] = "4f8b1d3e7a25"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(
+            sa.Column("changes_floor", sa.Integer(), nullable=False, server_default="0")
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("changes_floor")
@@ -0,0 +1,48 @@
+"""dashboard tier filter index without best_format
+
+Revision ID: 8e1b4c7d2f63
+Revises: 2d6a8f4c9e17
+Create Date: 2026-02-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e1b4c7d2f63"
+down_revision: Union[str, None] = "2d6a8f4c9e17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The format filter reads dashboard_row_formats; with best_format between
+    # tier and score, a tier-only filter could not scan in read-next order.
+    op.drop_index(
+        "ix_dashboard_rows_user_tier_format_score", table_name="dashboard_rows"
+    )
+    op.create_index(
+        "ix_dashboard_rows_user_tier_score",
+        "dashboard_rows",
+        ["user_id", "read_next_tier", sa.text("read_next_score DESC"), "shelf_item_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dashboard_rows_user_tier_score", table_name="dashboard_rows")
+    op.create_index(
+        "ix_dashboard_rows_user_tier_format_score",
+        "dashboard_rows",
+        [
+            "user_id",
+            "read_next_tier",
+            "best_format",
+            sa.text("read_next_score DESC"),
+            "shelf_item_id",
+        ],
+        unique=False,
+    )
@@ -0,0 +1,42 @@
+"""add notification listing indexes
+
+Revision ID: 9a4c6e2d1b58
+Revises: b5f7d2c8e340
+Create Date: 2026-02-12 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4c6e2d1b58"
+down_revision: Union[str, None] = "b5f7d2c8e340"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_notification_events_user_created",
+        "notification_events",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_notification_events_user_read_created",
+        "notification_events",
+        ["user_id", "read_at", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_notification_events_user_read_created", table_name="notification_events"
+    )
+    op.drop_index(
+        "ix_notification_events_user_created", table_name="notification_events"
+    )
@@ -0,0 +1,39 @@
+"""add content fingerprints for incremental matching
+
+Revision ID: 9a4d2e6b1c83
+Revises: 3c9e1f0a7d52
+Create Date: 2026-01-12 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4d2e6b1c83"
+down_revision: Union[str, None] = "3c9e1f0a7d52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Left NULL for existing rows. catalog_matches.item_fingerprint decided
+    # re-matching until 4f8b1d3e7a25 moved that to
+    # shelf_items.match_attempt_fingerprint; a1e5c9d7b3f2 drops it.
+    with op.batch_alter_table("shelf_items") as batch_op:
+        batch_op.add_column(
+            sa.Column("content_fingerprint", sa.String(length=40), nullable=True)
+        )
+    with op.batch_alter_table("catalog_matches") as batch_op:
+        batch_op.add_column(
+            sa.Column("item_fingerprint", sa.String(length=40), nullable=True)
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("catalog_matches") as batch_op:
+        batch_op.drop_column("item_fingerprint")
+    with op.batch_alter_table("shelf_items") as batch_op:
+        batch_op.drop_column("content_fingerprint")
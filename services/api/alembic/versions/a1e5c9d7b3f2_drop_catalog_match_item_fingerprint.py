@@ -0,0 +1,41 @@
+"""drop catalog_matches.item_fingerprint
+
+Revision ID: a1e5c9d7b3f2
+Revises: 8e1b4c7d2f63
+Create Date: 2026-02-20 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a1e5c9d7b3f2"
+down_revision: Union[str, None] = "8e1b4c7d2f63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Re-matching is decided by shelf_items.match_attempt_fingerprint.
+    with op.batch_alter_table("catalog_matches") as batch_op:
+        batch_op.drop_column("item_fingerprint")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("catalog_matches") as batch_op:
+        batch_op.add_column(
+            sa.Column("item_fingerprint", sa.String(length=40), nullable=True)
+        )
+    op.execute(
+        """
+        UPDATE catalog_matches
+        SET item_fingerprint = (
+            SELECT si.match_attempt_fingerprint
+            FROM shelf_items si
+            WHERE si.id = catalog_matches.shelf_item_id
+        )
+        """
+    )
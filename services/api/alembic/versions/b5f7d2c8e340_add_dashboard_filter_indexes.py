@@ -0,0 +1,75 @@
+"""dashboard filters: dashboard_rows.matched and filter indexes
+
+Revision ID: b5f7d2c8e340
+Revises: 6e9c2a4b7f10
+Create Date: 2026-02-09 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b5f7d2c8e340"
+down_revision: Union[str, None] = "6e9c2a4b7f10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("dashboard_rows") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "matched", sa.Boolean(), nullable=False, server_default=sa.false()
+            )
+        )
+    # JSON null and SQL NULL both mean "no match".
+    op.execute(
+        "UPDATE dashboard_rows SET matched = "
+        "(match IS NOT NULL AND CAST(match AS TEXT) <> 'null')"
+    )
+
+    # Replaced by ix_dashboard_rows_user_tier_score in 8e1b4c7d2f63, once the
+    # format filter moved to dashboard_row_formats.
+    op.create_index(
+        "ix_dashboard_rows_user_tier_format_score",
+        "dashboard_rows",
+        [
+            "user_id",
+            "read_next_tier",
+            "best_format",
+            sa.text("read_next_score DESC"),
+            "shelf_item_id",
+        ],
+        unique=False,
+    )
+    op.create_index(
+        "ix_dashboard_rows_user_shelf_score",
+        "dashboard_rows",
+        ["user_id", "shelf", sa.text("read_next_score DESC"), "shelf_item_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_dashboard_rows_user_matched_score",
+        "dashboard_rows",
+        [
+            "user_id",
+            "matched",
+            "needs_fuzzy_match",
+            sa.text("read_next_score DESC"),
+            "shelf_item_id",
+        ],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dashboard_rows_user_matched_score", table_name="dashboard_rows")
+    op.drop_index("ix_dashboard_rows_user_shelf_score", table_name="dashboard_rows")
+    op.drop_index(
+        "ix_dashboard_rows_user_tier_format_score", table_name="dashboard_rows"
+    )
+    with op.batch_alter_table("dashboard_rows") as batch_op:
+        batch_op.drop_column("matched")
@@ -0,0 +1,34 @@
+"""add availability cache stats to sync_runs
+
+Revision ID: d41f7c2a9b60
+Revises: 9a4d2e6b1c83
+Create Date: 2026-01-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41f7c2a9b60"
+down_revision: Union[str, None] = "9a4d2e6b1c83"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("sync_runs") as batch_op:
+        batch_op.add_column(
+            sa.Column("cache_hits", sa.Integer(), nullable=False, server_default="0")
+        )
+        batch_op.add_column(
+            sa.Column("cache_misses", sa.Integer(), nullable=False, server_default="0")
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("sync_runs") as batch_op:
+        batch_op.drop_column("cache_misses")
+        batch_op.drop_column("cache_hits")
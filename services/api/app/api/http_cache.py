@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from fastapi import Request, Response
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match covers `etag` (weak compare, RFC 9110)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag))
+
+
+def validator_headers(etag: str) -> dict[str, str]:
+    # Private and always revalidated: the ETag makes revalidation cheap.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
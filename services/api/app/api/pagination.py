@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any
+
+from fastapi import HTTPException
+
+
+def encode_cursor(kind: str, values: list[Any]) -> str:
+    """Opaque keyset cursor: urlsafe base64 of {"k": kind, "v": values}."""
+    raw = json.dumps({"k": kind, "v": values}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *, kind: str, size: int) -> list[Any]:
+    """Return the keyset values of `cursor`.
+
+    Raises 400 if it is malformed or was issued for another sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["v"]
+        ok = payload["k"] == kind and isinstance(values, list) and len(values) == size
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+        ok = False
+    if not ok:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
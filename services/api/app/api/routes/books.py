@@ -4,12 +4,14 @@ from dataclasses import asdict
 from datetime import datetime, timezone
 
 from app.api.deps import get_current_user
+from app.api.http_cache import if_none_match, not_modified, validator_headers
 from app.api.rate_limit import rate_limiter
 from app.core.config import settings
+from app.crud.availability import load_user_availability
 from app.db.session import get_db
-from app.models.availability_snapshot import AvailabilitySnapshot
 from app.models.catalog_item import CatalogItem
 from app.models.catalog_match import CatalogMatch
+from app.models.library_availability import LibraryAvailability
 from app.models.shelf_item import ShelfItem
 from app.models.shelf_source import ShelfSource
 from app.models.user_settings import UserSettings
@@ -21,8 +23,9 @@ from app.schemas.books import (
     BookDetailSourceOut,
 )
 from app.schemas.dashboard import AvailabilityOut, ReadNextOut
+from app.services.dashboard_cache import etag_for
 from app.services.read_next_scoring import compute_read_next
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -44,9 +47,17 @@ router = APIRouter(prefix="/v1", tags=["books"])
 )
 def get_book_detail(
     shelf_item_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
+    # Weak: `generated_at` differs between otherwise equivalent responses.
+    etag = "W/" + etag_for(f"book:{user.id}:{user.data_version}:{shelf_item_id}")
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    response.headers.update(validator_headers(etag))
+
     si = db.get(ShelfItem, shelf_item_id)
     if si is None or si.user_id != user.id:
         raise HTTPException(status_code=404, detail="Book not found")
@@ -88,17 +99,11 @@ def get_book_detail(
                 confidence=float(m.confidence or 0.0),
             )
 
-        snaps = (
-            db.execute(
-                select(AvailabilitySnapshot)
-                .where(AvailabilitySnapshot.user_id == user.id)
-                .where(AvailabilitySnapshot.catalog_item_id == m.catalog_item_id)
-            )
-            .scalars()
-            .all()
-        )
+        snaps = load_user_availability(
+            db, user_id=user.id, catalog_item_ids=[m.catalog_item_id]
+        ).get(m.catalog_item_id, [])
 
-        def _sort_key(a: AvailabilitySnapshot) -> tuple[int, str]:
+        def _sort_key(a: LibraryAvailability) -> tuple[int, str]:
             if a.format in preferred_formats:
                 return (preferred_formats.index(a.format), a.format)
             return (999, a.format)
@@ -1,11 +1,20 @@
 from typing import Literal
 
 from app.api.deps import get_current_user
+from app.api.http_cache import if_none_match, not_modified, validator_headers
 from app.api.rate_limit import rate_limiter
-from app.api.routes.dashboard_build import build_dashboard_out
+from app.api.routes.dashboard_build import (
+    build_dashboard_changes_out,
+    build_dashboard_out,
+    build_dashboard_summary_out,
+    iter_dashboard_export,
+)
+from app.api.routes.dashboard_queries import DashboardFilters
 from app.db.session import get_db
-from app.schemas.dashboard import DashboardOut
-from fastapi import APIRouter, Depends, Query
+from app.schemas.dashboard import DashboardChangesOut, DashboardOut, DashboardSummaryOut
+from app.services import dashboard_cache
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/v1", tags=["dashboard"])
@@ -18,10 +27,129 @@ router = APIRouter(prefix="/v1", tags=["dashboard"])
 )
 def get_dashboard(
     *,
+    request: Request,
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
     sort: Literal["read_next", "title", "updated"] = Query(default="read_next"),
-) -> DashboardOut:
-    return build_dashboard_out(db=db, user=user, limit=limit, offset=offset, sort=sort)
+    cursor: str | None = Query(default=None),
+    tier: Literal["available", "hold", "not_owned"] | None = Query(default=None),
+    fmt: str | None = Query(default=None, alias="format"),
+    shelf: str | None = Query(default=None),
+    needs_fuzzy_match: bool | None = Query(default=None),
+    unmatched: bool = Query(default=False),
+) -> Response:
+    filters = DashboardFilters(
+        tier=tier,
+        format=fmt,
+        shelf=shelf,
+        needs_fuzzy_match=needs_fuzzy_match,
+        unmatched=unmatched,
+    )
+    # Pages are immutable per data version: revalidate or serve from Redis
+    # before running any dashboard query.
+    key = dashboard_cache.page_cache_key(
+        user_id=user.id,
+        version=user.data_version,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+        offset=offset,
+        filters=filters.cache_part(),
+    )
+    etag = dashboard_cache.etag_for(key)
+    if if_none_match(request, etag):
+        dashboard_cache.record("not_modified")
+        return not_modified(etag)
+
+    body = dashboard_cache.get_cached_page(key)
+    status = "HIT"
+    if body is None:
+        status = "MISS"
+        body = build_dashboard_out(
+            db=db,
+            user=user,
+            limit=limit,
+            offset=offset,
+            sort=sort,
+            cursor=cursor,
+            filters=filters,
+        ).model_dump_json()
+        dashboard_cache.store_page(key, body)
+
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={**validator_headers(etag), "X-Cache": status},
+    )
+
+
+@router.get(
+    "/dashboard/summary",
+    response_model=DashboardSummaryOut,
+    dependencies=[Depends(rate_limiter("dashboard", limit=120, window_seconds=60))],
+)
+def get_dashboard_summary(
+    *,
+    request: Request,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+) -> Response:
+    # Same versioned caching as pages: a summary is immutable per data version.
+    key = dashboard_cache.summary_cache_key(user_id=user.id, version=user.data_version)
+    etag = dashboard_cache.etag_for(key)
+    if if_none_match(request, etag):
+        dashboard_cache.record("not_modified")
+        return not_modified(etag)
+
+    body = dashboard_cache.get_cached_page(key)
+    status = "HIT"
+    if body is None:
+        status = "MISS"
+        body = build_dashboard_summary_out(db=db, user=user).model_dump_json()
+        dashboard_cache.store_page(key, body)
+
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={**validator_headers(etag), "X-Cache": status},
+    )
+
+
+@router.get(
+    "/dashboard/changes",
+    response_model=DashboardChangesOut,
+    dependencies=[Depends(rate_limiter("dashboard", limit=120, window_seconds=60))],
+)
+def get_dashboard_changes(
+    *,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+    since: int = Query(ge=0),
+) -> DashboardChangesOut:
+    return build_dashboard_changes_out(db=db, user=user, since=since)
+
+
+_EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get(
+    "/dashboard/export",
+    dependencies=[
+        Depends(rate_limiter("dashboard_export", limit=10, window_seconds=60))
+    ],
+)
+def export_dashboard(
+    *,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+    fmt: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
+) -> StreamingResponse:
+    return StreamingResponse(
+        iter_dashboard_export(db=db, user=user, fmt=fmt),
+        media_type=_EXPORT_MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="shelfsync-shelf.{fmt}"'
+        },
+    )
@@ -1,18 +1,33 @@
+import csv
+import io
 from datetime import datetime, timezone
-from typing import Literal, Sequence
+from typing import Any, Iterator, Literal, Sequence
 
+from app.api.pagination import decode_cursor, encode_cursor
 from app.api.routes.dashboard_queries import (
-    build_rows,
-    load_availability,
-    load_catalog_items,
-    load_matches,
-    load_shelf_items,
-    sort_rows,
+    DashboardFilters,
+    count_groups,
+    count_rows,
+    iter_rows_batches,
+    load_changes,
+    load_rows_page,
+    page_key,
+    to_rows_out,
 )
-from app.models.shelf_item import ShelfItem
 from app.models.shelf_source import ShelfSource
 from app.models.user_settings import UserSettings
-from app.schemas.dashboard import DashboardOut, LastSyncOut, PageOut
+from app.schemas.dashboard import (
+    DashboardChangesOut,
+    DashboardOut,
+    DashboardRowOut,
+    DashboardSummaryOut,
+    LastSyncOut,
+    PageOut,
+    ShelfSummaryOut,
+    TierCountsOut,
+)
+from app.services.dashboard_rows import ensure_dashboard_rows
+from fastapi import HTTPException
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -23,100 +38,205 @@ def build_dashboard_out(
     user,
     limit: int,
     offset: int,
-    sort: Literal["read_next", "title", "updated"]
+    sort: Literal["read_next", "title", "updated"],
+    cursor: str | None = None,
+    filters: DashboardFilters | None = None,
 ) -> DashboardOut:
+    """Build one dashboard page from the `dashboard_rows` read model.
+
+    The page is a single ordered range scan over the user's rows, narrowed by
+    `filters` (`page.total` counts the filtered rows). `cursor` (from
+    `page.next_cursor`) continues after the previous page and takes
+    precedence over `offset`.
+    """
+    after = _cursor_after(cursor, sort) if cursor else None
     settings = _ensure_user_settings(db, user.id)
     preferred_formats = list(settings.preferred_formats or [])
     sources = _load_sources(db, user.id)
     source_ids = [s.id for s in sources]
     last_sync = _build_last_sync(sources)
-    shelf_items = load_shelf_items(db, user.id, source_ids)
 
-    if not shelf_items:
-        return _empty_dashboard(settings, preferred_formats, last_sync, limit, offset)
+    total = count_rows(db, user.id, source_ids, filters)
+    if total == 0 and ensure_dashboard_rows(db, user_id=user.id):
+        total = count_rows(db, user.id, source_ids, filters)
+    if total == 0:
+        return _dashboard(settings, preferred_formats, last_sync, limit, offset, 0)
 
-    matches = load_matches(db, user.id, [si.id for si in shelf_items])
-    catalog_by_id = load_catalog_items(db, matches)
-    availability_map = load_availability(db, user.id, catalog_by_id)
-    rows = build_rows(
-        shelf_items, matches, catalog_by_id, availability_map, preferred_formats
+    rows, has_more = load_rows_page(
+        db,
+        user.id,
+        source_ids,
+        sort=sort,
+        limit=limit,
+        offset=offset,
+        after=after,
+        filters=filters,
     )
-    sort_rows(rows, sort, shelf_items)
-    total = len(rows)
-    page_items = rows[offset : offset + limit]
-
-    return DashboardOut(
-        settings={
-            "library_system": settings.library_system,
-            "preferred_formats": preferred_formats,
-            "updated_at": settings.updated_at,
-        },
-        last_sync=last_sync,
-        page=PageOut(limit=limit, offset=offset, total=total),
-        items=page_items,
+    next_cursor = (
+        encode_cursor(sort, page_key(rows[-1], sort)) if rows and has_more else None
     )
 
+    return _dashboard(
+        settings,
+        preferred_formats,
+        last_sync,
+        limit,
+        offset,
+        total,
+        items=to_rows_out(rows, preferred_formats),
+        next_cursor=next_cursor,
+    )
 
-def _ensure_user_settings(db: Session, user_id: str) -> UserSettings:
-    settings = db.execute(
-        select(UserSettings).where(UserSettings.user_id == user_id)
-    ).scalar_one_or_none()
-    if settings is None:
-        settings = UserSettings(user_id=user_id)
-        db.add(settings)
-        db.commit()
-        db.refresh(settings)
-    return settings
 
+def build_dashboard_changes_out(
+    *, db: Session, user, since: int
+) -> DashboardChangesOut:
+    """Rows changed and removed since data version `since` (a delta sync).
 
-def _load_sources(db: Session, user_id: str) -> Sequence[ShelfSource]:
-    return (
-        db.execute(select(ShelfSource).where(ShelfSource.user_id == user_id))
-        .scalars()
-        .all()
+    Every row write is stamped with the data version it bumped to, and removed
+    rows leave a tombstone, so a client holding version `since` can apply the
+    delta instead of refetching pages. A `since` ahead of the user's version
+    (e.g. from another account or a reset database) is rejected with 409; one
+    older than the tombstone retention horizon (`user.changes_floor`) with 410,
+    since deletions after it may have been pruned and the client must refetch.
+    """
+    if since > user.data_version:
+        raise HTTPException(status_code=409, detail="Unknown data version")
+    if since < user.changes_floor:
+        raise HTTPException(status_code=410, detail="Data version expired")
+    settings = _ensure_user_settings(db, user.id)
+    preferred_formats = list(settings.preferred_formats or [])
+    source_ids = [s.id for s in _load_sources(db, user.id)]
+    rows, deleted = load_changes(db, user.id, source_ids, since=since)
+    return DashboardChangesOut(
+        version=user.data_version,
+        items=to_rows_out(rows, preferred_formats),
+        deleted=deleted,
     )
 
 
-def _build_last_sync(sources: Sequence[ShelfSource]) -> LastSyncOut:
-    if not sources:
-        return LastSyncOut(
-            source_type=None,
-            source_id=None,
-            last_synced_at=None,
-            last_sync_status=None,
-            last_sync_error=None,
-        )
+def build_dashboard_summary_out(*, db: Session, user) -> DashboardSummaryOut:
+    """Header counts per read-next tier, unmatched, and per shelf.
 
-    min_dt = datetime.min.replace(tzinfo=timezone.utc)
-    latest = max(sources, key=lambda s: s.last_synced_at or min_dt)
-    return LastSyncOut(
-        source_type=latest.source_type,
-        source_id=latest.id,
-        last_synced_at=latest.last_synced_at,
-        last_sync_status=latest.last_sync_status,
-        last_sync_error=latest.last_sync_error,
-    )
+    One GROUP BY over the read model; no row is loaded or rendered.
+    """
+    source_ids = [s.id for s in _load_sources(db, user.id)]
+    ensure_dashboard_rows(db, user_id=user.id)
 
+    counts = TierCountsOut()
+    shelves: dict[str | None, ShelfSummaryOut] = {}
+    for shelf, tier, matched, n in count_groups(db, user.id, source_ids):
+        by_shelf = shelves.setdefault(shelf, ShelfSummaryOut(shelf=shelf))
+        for c in (counts, by_shelf):
+            c.total += n
+            if tier in ("available", "hold", "not_owned"):
+                setattr(c, tier, getattr(c, tier) + n)
+            if not matched:
+                c.unmatched += n
 
-def _empty_dashboard(
-    settings: UserSettings,
-    preferred_formats: list[str],
-    last_sync: LastSyncOut,
-    limit: int,
-    offset: int,
-) -> DashboardOut:
-    return DashboardOut(
-        settings={
-            "library_system": settings.library_system,
-            "preferred_formats": preferred_formats,
-            "updated_at": settings.updated_at,
-        },
-        last_sync=last_sync,
-        page=PageOut(limit=limit, offset=offset, total=0),
-        items=[],
+    return DashboardSummaryOut(
+        version=user.data_version,
+        counts=counts,
+        shelves=sorted(
+            shelves.values(), key=lambda s: (s.shelf is None, s.shelf or "")
+        ),
     )
 
 
+# Rows rendered per chunk of an export stream.
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_CSV_COLUMNS = [
+    "shelf_item_id",
+    "title",
+    "author",
+    "shelf",
+    "needs_fuzzy_match",
+    "read_next_score",
+    "read_next_tier",
+    "best_format",
+    "hold_ratio",
+    "reasons",
+    "catalog_item_id",
+    "provider",
+    "match_method",
+    "match_confidence",
+    "availability",
+]
+
+
+def iter_dashboard_export(
+    *, db: Session, user, fmt: Literal["ndjson", "csv"]
+) -> Iterator[str]:
+    """Stream the whole enriched shelf as NDJSON lines or CSV rows.
+
+    Reads the read model in read-next order one batch at a time and yields a
+    chunk per batch, so memory stays flat however large the shelf is. Rows are
+    the same DashboardRowOut the dashboard pages carry.
+    """
+    settings = _ensure_user_settings(db, user.id)
+    preferred_formats = list(settings.preferred_formats or [])
+    source_ids = [s.id for s in _load_sources(db, user.id)]
+    ensure_dashboard_rows(db, user_id=user.id)
+
+    if fmt == "csv":
+        yield _csv_chunk([EXPORT_CSV_COLUMNS])
+    for batch in iter_rows_batches(
+        db, user.id, source_ids, batch_size=EXPORT_BATCH_SIZE
+    ):
+        rows = to_rows_out(batch, preferred_formats)
+        if fmt == "csv":
+            yield _csv_chunk(_csv_record(r) for r in rows)
+        else:
+            yield "".join(r.model_dump_json() + "\n" for r in rows)
+
+
+def _csv_record(row: DashboardRowOut) -> list:
+    match = row.match
+    return [
+        row.shelf_item_id,
+        row.title,
+        row.author or "",
+        row.shelf or "",
+        row.needs_fuzzy_match,
+        row.read_next.score,
+        row.read_next.tier,
+        row.read_next.best_format or "",
+        "" if row.read_next.hold_ratio is None else row.read_next.hold_ratio,
+        "; ".join(row.read_next.reasons),
+        match.catalog_item_id if match else "",
+        match.provider if match else "",
+        match.method if match else "",
+        match.confidence if match else "",
+        "; ".join(f"{a.format}:{a.status}" for a in row.availability),
+    ]
+
+
+def _csv_chunk(records) -> str:
+    buf = io.StringIO()
+    csv.writer(buf).writerows(records)
+    return buf.getvalue()
+
+
+def _cursor_after(
+    cursor: str, sort: Literal["read_next", "title", "updated"]
+) -> list[Any]:
+    """Decode a dashboard cursor into typed keyset values; 400 if they are bad."""
+    key, row_id = decode_cursor(cursor, kind=sort, size=2)
+    try:
+        if not isinstance(row_id, str):
+            raise TypeError(row_id)
+        if sort == "read_next":
+            return [float(key), row_id]
+        if sort == "title":
+            if not isinstance(key, str):
+                raise TypeError(key)
+            return [key, row_id]
+        return [datetime.fromisoformat(key), row_id]
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 def _ensure_user_settings(db: Session, user_id: str) -> UserSettings:
     settings = db.execute(
         select(UserSettings).where(UserSettings.user_id == user_id)
@@ -158,12 +278,16 @@ def _build_last_sync(sources: Sequence[ShelfSource]) -> LastSyncOut:
     )
 
 
-def _empty_dashboard(
+def _dashboard(
     settings: UserSettings,
     preferred_formats: list[str],
     last_sync: LastSyncOut,
     limit: int,
     offset: int,
+    total: int,
+    *,
+    items: list[DashboardRowOut] | None = None,
+    next_cursor: str | None = None,
 ) -> DashboardOut:
     return DashboardOut(
         settings={
@@ -172,6 +296,6 @@ def _empty_dashboard(
             "updated_at": settings.updated_at,
         },
         last_sync=last_sync,
-        page=PageOut(limit=limit, offset=offset, total=0),
-        items=[],
+        page=PageOut(limit=limit, offset=offset, total=total, next_cursor=next_cursor),
+        items=items or [],
     )
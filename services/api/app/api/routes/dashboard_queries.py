@@ -1,147 +1,247 @@
-from dataclasses import asdict
-from datetime import datetime, timezone
-from typing import Literal, Sequence
-
-from app.models.availability_snapshot import AvailabilitySnapshot
-from app.models.catalog_item import CatalogItem
-from app.models.catalog_match import CatalogMatch
-from app.models.shelf_item import ShelfItem
+from dataclasses import dataclass
+from typing import Any, Iterator, Literal, Sequence, cast
+
+from app.models.dashboard_row import DashboardRow
+from app.models.dashboard_row_format import DashboardRowFormat
+from app.models.dashboard_tombstone import DashboardTombstone
 from app.schemas.dashboard import (
     AvailabilityOut,
     DashboardRowOut,
     MatchMiniOut,
     ReadNextOut,
 )
-from app.services.read_next_scoring import compute_read_next
-from sqlalchemy import select
+from app.services.read_next_batch import AvailabilityColumns, compute_read_next_batch
+from sqlalchemy import Select, and_, func, or_, select
 from sqlalchemy.orm import Session
 
 
-def load_shelf_items(
-    db: Session, user_id: str, source_ids: Sequence[str]
-) -> Sequence[ShelfItem]:
-    stmt = select(ShelfItem).where(ShelfItem.user_id == user_id)
-    if source_ids:
-        stmt = stmt.where(ShelfItem.shelf_source_id.in_(source_ids))
-    return db.execute(stmt).scalars().all()
+@dataclass(frozen=True)
+class DashboardFilters:
+    """Optional row filters; each maps to an indexed column or side table.
 
+    `format` keeps rows whose library carries that format (available or on
+    hold, see DashboardRowFormat), whatever the row's best format. Combined
+    with tier="available" or "hold" the format itself must have that status,
+    so tier="available" with format="ebook" is "available now in ebook".
+    """
 
-def load_matches(
-    db: Session, user_id: str, shelf_item_ids: Sequence[str]
-) -> dict[str, CatalogMatch]:
-    if not shelf_item_ids:
-        return {}
-    matches = (
-        db.execute(
-            select(CatalogMatch).where(
-                CatalogMatch.user_id == user_id,
-                CatalogMatch.shelf_item_id.in_(shelf_item_ids),
+    tier: str | None = None
+    format: str | None = None
+    shelf: str | None = None
+    needs_fuzzy_match: bool | None = None
+    unmatched: bool = False
+
+    def apply(self, stmt: Select) -> Select:
+        if self.tier is not None:
+            stmt = stmt.where(DashboardRow.read_next_tier == self.tier)
+        if self.format is not None:
+            carried = (
+                select(DashboardRowFormat.shelf_item_id)
+                .where(DashboardRowFormat.shelf_item_id == DashboardRow.shelf_item_id)
+                .where(DashboardRowFormat.format == self.format)
+            )
+            if self.tier in ("available", "hold"):
+                carried = carried.where(DashboardRowFormat.status == self.tier)
+            stmt = stmt.where(carried.exists())
+        if self.shelf is not None:
+            stmt = stmt.where(DashboardRow.shelf == self.shelf)
+        if self.needs_fuzzy_match is not None:
+            stmt = stmt.where(DashboardRow.needs_fuzzy_match == self.needs_fuzzy_match)
+        if self.unmatched:
+            stmt = stmt.where(DashboardRow.matched.is_(False))
+        return stmt
+
+    def cache_part(self) -> str:
+        """Stable text of the active filters, for cache keys."""
+        return "&".join(
+            f"{k}={v}"
+            for k, v in (
+                ("tier", self.tier),
+                ("format", self.format),
+                ("shelf", self.shelf),
+                ("fuzzy", self.needs_fuzzy_match),
+                ("unmatched", self.unmatched or None),
             )
+            if v is not None
         )
-        .scalars()
-        .all()
-    )
-    return {m.shelf_item_id: m for m in matches}
 
 
-def load_catalog_items(
-    db: Session, matches: dict[str, CatalogMatch]
-) -> dict[str, CatalogItem]:
-    catalog_ids = {match.catalog_item_id for match in matches.values()}
-    if not catalog_ids:
-        return {}
-    catalog_items = (
-        db.execute(select(CatalogItem).where(CatalogItem.id.in_(list(catalog_ids))))
-        .scalars()
-        .all()
+def _scope(
+    stmt: Select,
+    user_id: str,
+    source_ids: Sequence[str],
+    filters: DashboardFilters | None = None,
+) -> Select:
+    stmt = stmt.where(DashboardRow.user_id == user_id)
+    if source_ids:
+        stmt = stmt.where(DashboardRow.shelf_source_id.in_(source_ids))
+    if filters is not None:
+        stmt = filters.apply(stmt)
+    return stmt
+
+
+def count_rows(
+    db: Session,
+    user_id: str,
+    source_ids: Sequence[str],
+    filters: DashboardFilters | None = None,
+) -> int:
+    stmt = _scope(
+        select(func.count(DashboardRow.shelf_item_id)), user_id, source_ids, filters
     )
-    return {item.id: item for item in catalog_items}
+    return int(db.execute(stmt).scalar_one())
 
 
-def load_availability(
-    db: Session, user_id: str, catalog_map: dict[str, CatalogItem]
-) -> dict[str, list[AvailabilitySnapshot]]:
-    if not catalog_map:
-        return {}
-    snapshots = (
-        db.execute(
-            select(AvailabilitySnapshot).where(
-                AvailabilitySnapshot.user_id == user_id,
-                AvailabilitySnapshot.catalog_item_id.in_(list(catalog_map.keys())),
+def load_rows_page(
+    db: Session,
+    user_id: str,
+    source_ids: Sequence[str],
+    *,
+    sort: Literal["read_next", "title", "updated"],
+    limit: int,
+    offset: int,
+    after: list[Any] | None,
+    filters: DashboardFilters | None = None,
+) -> tuple[list[DashboardRow], bool]:
+    """One page of the user's dashboard rows, ordered and sliced in SQL.
+
+    Ordered by (score DESC, id), (title_key, id) or (updated DESC, id DESC).
+    `after` is the sort key of the last row of the previous page (see
+    `page_key`, with `updated` decoded back to a datetime); when given it
+    replaces `offset`. Returns the page and whether
+    more rows follow.
+    """
+    stmt = _scope(select(DashboardRow), user_id, source_ids, filters)
+    row_id = DashboardRow.shelf_item_id
+
+    if sort == "read_next":
+        score = DashboardRow.read_next_score
+        stmt = stmt.order_by(score.desc(), row_id)
+        if after is not None:
+            stmt = stmt.where(
+                or_(score < after[0], and_(score == after[0], row_id > after[1]))
+            )
+    elif sort == "title":
+        title_key = DashboardRow.title_key
+        stmt = stmt.order_by(title_key, row_id)
+        if after is not None:
+            stmt = stmt.where(
+                or_(
+                    title_key > after[0],
+                    and_(title_key == after[0], row_id > after[1]),
+                )
+            )
+    else:
+        updated_at = DashboardRow.item_updated_at
+        stmt = stmt.order_by(updated_at.desc(), row_id.desc())
+        if after is not None:
+            stmt = stmt.where(
+                or_(
+                    updated_at < after[0],
+                    and_(updated_at == after[0], row_id < after[1]),
+                )
             )
+
+    if after is None and offset:
+        stmt = stmt.offset(offset)
+    rows: list[DashboardRow] = list(db.execute(stmt.limit(limit + 1)).scalars().all())
+    return rows[:limit], len(rows) > limit
+
+
+def count_groups(
+    db: Session, user_id: str, source_ids: Sequence[str]
+) -> list[tuple[str | None, str, bool, int]]:
+    """Row counts per (shelf, read-next tier, matched), in one GROUP BY."""
+    stmt = _scope(
+        select(
+            DashboardRow.shelf,
+            DashboardRow.read_next_tier,
+            DashboardRow.matched,
+            func.count(DashboardRow.shelf_item_id),
+        ),
+        user_id,
+        source_ids,
+    ).group_by(DashboardRow.shelf, DashboardRow.read_next_tier, DashboardRow.matched)
+    rows = cast(Sequence[tuple[str | None, str, bool, int]], db.execute(stmt).all())
+    return [(shelf, tier, bool(matched), int(n)) for shelf, tier, matched, n in rows]
+
+
+def load_changes(
+    db: Session, user_id: str, source_ids: Sequence[str], *, since: int
+) -> tuple[list[DashboardRow], list[str]]:
+    """Rows changed and shelf item ids deleted after data version `since`."""
+    rows: Sequence[DashboardRow] = (
+        db.execute(
+            _scope(select(DashboardRow), user_id, source_ids)
+            .where(DashboardRow.change_seq > since)
+            .order_by(DashboardRow.change_seq, DashboardRow.shelf_item_id)
         )
         .scalars()
         .all()
     )
-    result: dict[str, list[AvailabilitySnapshot]] = {}
-    for snap in snapshots:
-        result.setdefault(snap.catalog_item_id, []).append(snap)
-    return result
-
-
-def build_rows(
-    shelf_items: Sequence[ShelfItem],
-    matches: dict[str, CatalogMatch],
-    catalog_map: dict[str, CatalogItem],
-    availability_map: dict[str, list[AvailabilitySnapshot]],
-    preferred_formats: Sequence[str],
-) -> list[DashboardRowOut]:
-    rows: list[DashboardRowOut] = []
-    for item in shelf_items:
-        match = matches.get(item.id)
-        match_out = None
-        availability: list[AvailabilityOut] = []
-        if match:
-            catalog = catalog_map.get(match.catalog_item_id)
-            if catalog:
-                match_out = MatchMiniOut(
-                    catalog_item_id=catalog.id,
-                    provider=match.provider,
-                    provider_item_id=catalog.provider_item_id,
-                    method=match.method,
-                    confidence=match.confidence,
-                )
-                for snap in availability_map.get(catalog.id, []):
-                    availability.append(
-                        AvailabilityOut(
-                            format=snap.format,
-                            status=snap.status,
-                            copies_available=snap.copies_available,
-                            copies_total=snap.copies_total,
-                            holds=snap.holds,
-                            deep_link=snap.deep_link,
-                            last_checked_at=snap.last_checked_at,
-                        )
-                    )
-        read_next = compute_read_next(availability, list(preferred_formats))
-        rows.append(
-            DashboardRowOut(
-                shelf_item_id=item.id,
-                title=item.title,
-                author=item.author,
-                shelf=item.shelf,
-                needs_fuzzy_match=item.needs_fuzzy_match,
-                match=match_out,
-                availability=availability,
-                read_next=ReadNextOut(**asdict(read_next)),
-            )
+    deleted = (
+        db.execute(
+            select(DashboardTombstone.shelf_item_id)
+            .where(DashboardTombstone.user_id == user_id)
+            .where(DashboardTombstone.change_seq > since)
+            .order_by(DashboardTombstone.change_seq, DashboardTombstone.shelf_item_id)
         )
-    return rows
+        .scalars()
+        .all()
+    )
+    return list(rows), list(deleted)
 
 
-def sort_rows(
-    rows: list[DashboardRowOut],
-    sort: Literal["read_next", "title", "updated"],
-    shelf_items: Sequence[ShelfItem],
-) -> None:
+def iter_rows_batches(
+    db: Session, user_id: str, source_ids: Sequence[str], *, batch_size: int
+) -> Iterator[Sequence[DashboardRow]]:
+    """Every scoped row in read-next order, `batch_size` rows at a time.
+
+    Uses `yield_per` (a server-side cursor on Postgres), so only one batch of
+    rows is held in memory regardless of shelf size.
+    """
+    stmt = (
+        _scope(select(DashboardRow), user_id, source_ids)
+        .order_by(DashboardRow.read_next_score.desc(), DashboardRow.shelf_item_id)
+        .execution_options(yield_per=batch_size)
+    )
+    yield from db.execute(stmt).scalars().partitions()
+
+
+def page_key(
+    row: DashboardRow, sort: Literal["read_next", "title", "updated"]
+) -> list[Any]:
     if sort == "read_next":
-        rows.sort(key=lambda r: r.read_next.score, reverse=True)
-    elif sort == "title":
-        rows.sort(key=lambda r: (r.title or "").lower())
-    elif sort == "updated":
-        updated_map = {item.id: item.updated_at for item in shelf_items}
-        rows.sort(
-            key=lambda r: updated_map.get(r.shelf_item_id)
-            or datetime.min.replace(tzinfo=timezone.utc),
-            reverse=True,
+        return [row.read_next_score, row.shelf_item_id]
+    if sort == "title":
+        return [row.title_key, row.shelf_item_id]
+    return [row.item_updated_at.isoformat(), row.shelf_item_id]
+
+
+def to_rows_out(
+    rows: Sequence[DashboardRow], preferred_formats: Sequence[str]
+) -> list[DashboardRowOut]:
+    """Render a page of rows; reason strings are built for these rows only."""
+    explain = compute_read_next_batch(
+        AvailabilityColumns.from_rows([r.availability for r in rows]),
+        preferred_formats,
+    )
+    return [
+        DashboardRowOut(
+            shelf_item_id=row.shelf_item_id,
+            title=row.title,
+            author=row.author,
+            shelf=row.shelf,
+            needs_fuzzy_match=row.needs_fuzzy_match,
+            match=MatchMiniOut(**row.match) if row.match else None,
+            availability=[AvailabilityOut(**a) for a in row.availability or []],
+            read_next=ReadNextOut(
+                score=row.read_next_score,
+                tier=row.read_next_tier,
+                best_format=row.best_format,
+                hold_ratio=row.hold_ratio,
+                reasons=explain.reasons(i),
+            ),
         )
+        for i, row in enumerate(rows)
+    ]
@@ -1,3 +1,6 @@
+from app.core.pubsub_hub import get_pubsub_hub
+from app.core.sse import sse_stats
+from app.services.dashboard_cache import cache_stats
 from fastapi import APIRouter
 
 router = APIRouter(tags=["health"])
@@ -6,3 +9,23 @@ router = APIRouter(tags=["health"])
 @router.get("/health")
 def health_check():
     return {"ok": True}
+
+
+@router.get("/health/dashboard-cache")
+def dashboard_cache_stats():
+    stats = cache_stats()
+    return {
+        "hits": stats.hits,
+        "misses": stats.misses,
+        "not_modified": stats.not_modified,
+        "hit_ratio": stats.hit_ratio,
+    }
+
+
+@router.get("/health/sse")
+def sse_connection_stats():
+    # Process-local: one API process's SSE connections.
+    return {
+        **sse_stats().as_dict(),
+        "hub_subscribers": get_pubsub_hub().subscriber_count,
+    }
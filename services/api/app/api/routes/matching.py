@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 from app.api.deps import get_current_user
+from app.crud.availability import load_user_availability
 from app.db.session import get_db
-from app.models.availability_snapshot import AvailabilitySnapshot
 from app.models.catalog_item import CatalogItem
 from app.models.catalog_match import CatalogMatch
 from app.models.shelf_item import ShelfItem
@@ -26,10 +26,13 @@ router = APIRouter(prefix="/v1", tags=["matching"])
 
 
 @router.post("/matching/refresh", response_model=RefreshEnqueuedOut)
-def refresh_matching(user=Depends(get_current_user)):
+def refresh_matching(full: bool = False, user=Depends(get_current_user)):
     q = get_queue()
     job = q.enqueue(
-        refresh_matching_for_user, user.id, retry=Retry(max=2, interval=[5, 15])
+        refresh_matching_for_user,
+        user.id,
+        full=full,
+        retry=Retry(max=2, interval=[5, 15]),
     )
     return {"job_id": job.id}
 
@@ -72,19 +75,9 @@ def list_matches(
         .offset(offset)
     ).all()
 
-    catalog_ids = [ci.id for _, _, ci in rows]
-    av_rows = (
-        db.execute(
-            select(AvailabilitySnapshot)
-            .where(AvailabilitySnapshot.user_id == user.id)
-            .where(AvailabilitySnapshot.catalog_item_id.in_(catalog_ids))
-        )
-        .scalars()
-        .all()
+    avail_by_catalog = load_user_availability(
+        db, user_id=user.id, catalog_item_ids=[ci.id for _, _, ci in rows]
     )
-    avail_by_catalog: dict[str, list[AvailabilitySnapshot]] = {}
-    for a in av_rows:
-        avail_by_catalog.setdefault(a.catalog_item_id, []).append(a)
 
     out: list[MatchOut] = []
     for si, m, ci in rows:
@@ -142,14 +135,8 @@ def get_match(
         raise HTTPException(status_code=404, detail="Match not found")
 
     si, m, ci = row
-    av = (
-        db.execute(
-            select(AvailabilitySnapshot)
-            .where(AvailabilitySnapshot.user_id == user.id)
-            .where(AvailabilitySnapshot.catalog_item_id == ci.id)
-        )
-        .scalars()
-        .all()
+    av = load_user_availability(db, user_id=user.id, catalog_item_ids=[ci.id]).get(
+        ci.id, []
     )
 
     return MatchOut(
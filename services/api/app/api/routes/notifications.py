@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import json
+import logging
+import re
 from datetime import datetime, timezone
 from typing import AsyncGenerator
 
 from app.api.deps import get_current_user
+from app.api.pagination import decode_cursor, encode_cursor
 from app.api.rate_limit import rate_limiter
-from app.core.config import settings
-from app.core.redis import get_redis_async
+from app.core.pubsub_hub import get_pubsub_hub
+from app.core.sse import sse_stream
 from app.crud.notifications import (
     list_notifications,
     mark_all_read,
@@ -21,10 +24,14 @@ from app.schemas.notifications import (
     PageOut,
     UnreadCountOut,
 )
-from fastapi import APIRouter, Depends, HTTPException, Query
+from app.workers.events import notification_stream_key
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from fastapi.responses import StreamingResponse
+from redis.exceptions import RedisError
 from sqlalchemy.orm import Session
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/v1", tags=["notifications"])
 
 
@@ -38,15 +45,35 @@ def get_notifications(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     unread_only: bool = Query(False),
+    cursor: str | None = Query(None),
+    include_total: bool = Query(True),
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    total, rows = list_notifications(
+    after = None
+    if cursor:
+        created_at, event_id = decode_cursor(cursor, kind="notifications", size=2)
+        try:
+            after = (datetime.fromisoformat(created_at), str(event_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    total, rows, has_more = list_notifications(
         db,
         user_id=user.id,
         unread_only=unread_only,
         limit=limit,
         offset=offset,
+        after=after,
+        with_total=include_total,
+    )
+    next_cursor = (
+        encode_cursor(
+            "notifications",
+            [rows[-1].event.created_at.isoformat(), rows[-1].event.id],
+        )
+        if rows and has_more
+        else None
     )
 
     items = [
@@ -66,7 +93,8 @@ def get_notifications(
     ]
 
     return NotificationListOut(
-        page=PageOut(limit=limit, offset=offset, total=total), items=items
+        page=PageOut(limit=limit, offset=offset, total=total, next_cursor=next_cursor),
+        items=items,
     )
 
 
@@ -116,46 +144,80 @@ def mark_all_notifications_read(
     return {"updated": n}
 
 
+# Stream entries fetched per XRANGE while replaying.
+_REPLAY_BATCH = 100
+_STREAM_ID = re.compile(r"^\d+-\d+$")
+# Sent when Last-Event-ID is older than the stream: replay would have gaps.
+_SSE_RESET = "event: reset\ndata: {}\n\n"
+
+
+def _is_after(event_id: str, last: str | None) -> bool:
+    if last is None:
+        return True
+    ms, seq = event_id.split("-")
+    last_ms, last_seq = last.split("-")
+    return (int(ms), int(seq)) > (int(last_ms), int(last_seq))
+
+
+def _sse_event(event_id: str, data_str: str) -> str:
+    payload = json.loads(data_str)
+    payload.setdefault("ts", datetime.now(timezone.utc).isoformat())
+    return f"id: {event_id}\ndata: {json.dumps(payload)}\n\n"
+
+
 @router.get("/notifications/events")
 async def stream_notifications(
     user=Depends(get_current_user),
+    last_event_id: str | None = Header(default=None),
 ) -> StreamingResponse:
-    redis_client = get_redis_async(settings.redis_url)
+    """Live notifications as SSE; events carry their stream id as `id:`.
+
+    On reconnect the browser sends Last-Event-ID and the events since then are
+    replayed from the user's capped Redis stream before live delivery resumes.
+    If that id was already trimmed (or the stream expired), events may have
+    been lost: an `event: reset` is sent instead, telling the client to
+    re-fetch /v1/notifications.
+    """
     channel = f"notify:{user.id}"
+    resume_from = (
+        last_event_id if last_event_id and _STREAM_ID.match(last_event_id) else None
+    )
 
-    async def event_generator() -> AsyncGenerator[str, None]:
-        pubsub = redis_client.pubsub()
-        await pubsub.subscribe(channel)
-
-        # Basic keepalive to help proxies (optional)
-        last_keepalive = datetime.now(timezone.utc)
+    hub = get_pubsub_hub()
+    last_sent = resume_from
 
+    async def replay() -> AsyncGenerator[str, None]:
+        nonlocal last_sent
+        if last_sent is None:
+            return
+        key = notification_stream_key(user.id)
         try:
-            async for message in pubsub.listen():
-                now = datetime.now(timezone.utc)
-
-                # Keepalive comment every ~25s
-                if (now - last_keepalive).total_seconds() > 25:
-                    yield ": keepalive\n\n"
-                    last_keepalive = now
-
-                if message is None:
-                    continue
-                if message.get("type") != "message":
-                    continue
-
-                data_raw = message.get("data")
-                if isinstance(data_raw, (bytes, bytearray)):
-                    data_str = data_raw.decode("utf-8")
-                else:
-                    data_str = str(data_raw)
-
-                payload = json.loads(data_str)
-                payload.setdefault("ts", now.isoformat())
-
-                yield f"data: {json.dumps(payload)}\n\n"
-        finally:
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
-
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+            first = await hub.first_stream_id(key)
+            if first is None or _is_after(first, last_sent):
+                yield _SSE_RESET
+                return
+            while True:
+                entries = await hub.read_stream(
+                    key,
+                    after=last_sent,
+                    count=_REPLAY_BATCH,
+                )
+                for event_id, fields in entries:
+                    yield _sse_event(event_id, fields["data"])
+                    last_sent = event_id
+                if len(entries) < _REPLAY_BATCH:
+                    return
+        except RedisError as exc:
+            logger.warning("notification replay failed: %s", exc)
+
+    def render(data: str) -> str | None:
+        message = json.loads(data)
+        if not _is_after(message["id"], last_sent):
+            return None  # already sent during replay
+        return _sse_event(message["id"], message["data"])
+
+    # Messages come from the process-wide hub; no Redis connection per client.
+    return StreamingResponse(
+        sse_stream(hub.subscribe(channel), render, prelude=replay),
+        media_type="text/event-stream",
+    )
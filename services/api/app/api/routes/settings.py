@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from app.api.deps import get_current_user
+from app.crud.data_version import bump_data_version
 from app.db.session import get_db
 from app.models.user_settings import UserSettings
 from app.schemas.settings import SettingsPatchIn, UserSettingsOut
+from app.services.dashboard_rows import refresh_dashboard_rows
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
@@ -43,6 +45,12 @@ def patch_settings(
         s.notifications_enabled = payload.notifications_enabled
 
     db.add(s)
+    if payload.library_system is not None or payload.preferred_formats is not None:
+        # Scores depend on both; recompute the user's dashboard rows.
+        refresh_dashboard_rows(db, user_id=user.id)
+    else:
+        # Settings are part of the dashboard/book payloads.
+        bump_data_version(db, [user.id])
     db.commit()
     db.refresh(s)
     return s
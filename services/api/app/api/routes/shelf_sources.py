@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from app.api.deps import get_current_user
+from app.crud.data_version import bump_data_version
 from app.db.session import get_db
 from app.models.shelf_source import ShelfSource
 from app.schemas.shelf import (
@@ -10,6 +11,7 @@ from app.schemas.shelf import (
     ShelfSourceOut,
     SyncEnqueuedOut,
 )
+from app.services.dashboard_rows import remove_source_rows
 from app.services.goodreads_csv import parse_goodreads_csv
 from app.services.shelf_import import upsert_shelf_items
 from app.workers.jobs import sync_goodreads_rss
@@ -53,6 +55,8 @@ def connect_rss(
             is_active=True,
         )
         db.add(source)
+        # The dashboard is scoped to the user's sources.
+        bump_data_version(db, [user.id])
         db.commit()
         db.refresh(source)
     else:
@@ -99,6 +103,8 @@ def import_csv(
             is_active=True,
         )
         db.add(source)
+        # The dashboard is scoped to the user's sources.
+        bump_data_version(db, [user.id])
         db.commit()
         db.refresh(source)
 
@@ -141,6 +147,8 @@ def delete_source(
     source = db.get(ShelfSource, source_id)
     if source is None or source.user_id != user.id:
         raise HTTPException(status_code=404, detail="Source not found")
+    # Its items go with it; drop (and tombstone) their dashboard rows too.
+    remove_source_rows(db, user_id=user.id, shelf_source_id=source.id)
     db.delete(source)
     db.commit()
     return None
@@ -2,12 +2,12 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timezone
-from typing import AsyncGenerator
 
 from app.api.deps import get_current_user
 from app.core.config import settings
-from app.core.redis import get_redis_async
+from app.core.pubsub_hub import get_pubsub_hub
 from app.core.security import hash_password
+from app.core.sse import sse_stream
 from app.crud.sync_runs import create_sync_run, get_sync_run
 from app.db.session import get_db
 from app.models.user import User
@@ -84,37 +84,22 @@ async def stream_sync_events(
     run_id: str,
     user=Depends(get_current_user),
 ) -> StreamingResponse:
-    redis_client = get_redis_async(settings.redis_url)
-
     channel = f"sync:{user.id}:{run_id}"
 
-    async def event_generator() -> AsyncGenerator[str, None]:
-        pubsub = redis_client.pubsub()
-        await pubsub.subscribe(channel)
-
-        try:
-            async for message in pubsub.listen():
-                if message is None:
-                    continue
-                if message.get("type") != "message":
-                    continue
-
-                data_raw = message.get("data")
-                if data_raw is None:
-                    continue
-
-                if isinstance(data_raw, (bytes, bytearray)):
-                    data_str = data_raw.decode("utf-8")
-                else:
-                    data_str = str(data_raw)
+    def render(data: str) -> str:
+        payload = json.loads(data)
+        payload.setdefault("ts", datetime.now(timezone.utc).isoformat())
+        payload["run_id"] = run_id
+        return f"data: {json.dumps(payload)}\n\n"
 
-                payload = json.loads(data_str)
-                payload.setdefault("ts", datetime.now(timezone.utc).isoformat())
-                payload["run_id"] = run_id
+    # Messages come from the process-wide hub; no Redis connection per client.
+    subscription = get_pubsub_hub().subscribe(channel, coalesce=_progress_key)
+    return StreamingResponse(
+        sse_stream(subscription, render), media_type="text/event-stream"
+    )
 
-                yield f"data: {json.dumps(payload)}\n\n"
-        finally:
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+def _progress_key(data: str) -> str | None:
+    """Progress events supersede each other, so a full buffer keeps the latest."""
+    type_ = json.loads(data).get("type")
+    return type_ if type_ and type_.endswith("_progress") else None
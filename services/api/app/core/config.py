@@ -43,6 +43,36 @@ class Settings(BaseSettings):
     availability_cache_ttl_secs: int = Field(
         default=300, validation_alias="AVAILABILITY_CACHE_TTL_SECS"
     )
+    # Serialized dashboard pages, keyed by the user's data version.
+    dashboard_cache_ttl_secs: int = Field(
+        default=600, validation_alias="DASHBOARD_CACHE_TTL_SECS"
+    )
+    # Dashboard delta-sync tombstones older than this are pruned; clients
+    # asking for changes from before the pruned range must refetch.
+    dashboard_tombstone_retention_secs: int = Field(
+        default=7 * 24 * 3600, validation_alias="DASHBOARD_TOMBSTONE_RETENTION_SECS"
+    )
+    # SSE connections: heartbeat interval, per-client buffer (messages), and
+    # idle / lifetime limits after which the client is made to reconnect.
+    sse_heartbeat_secs: float = Field(
+        default=15.0, validation_alias="SSE_HEARTBEAT_SECS"
+    )
+    sse_buffer_size: int = Field(default=100, validation_alias="SSE_BUFFER_SIZE")
+    sse_idle_timeout_secs: float = Field(
+        default=1800.0, validation_alias="SSE_IDLE_TIMEOUT_SECS"
+    )
+    sse_max_lifetime_secs: float = Field(
+        default=3600.0, validation_alias="SSE_MAX_LIFETIME_SECS"
+    )
+    # Redis unread-notification counters are rebuilt from the database at
+    # least this often, bounding any drift.
+    unread_counter_ttl_secs: int = Field(
+        default=3600, validation_alias="UNREAD_COUNTER_TTL_SECS"
+    )
+    # Per-user notification stream kept for SSE Last-Event-ID replay.
+    notification_stream_maxlen: int = Field(
+        default=500, validation_alias="NOTIFICATION_STREAM_MAXLEN"
+    )
 
     # Goodreads / ingestion
     goodreads_base_url: str | None = Field(
@@ -152,6 +182,18 @@ class Settings(BaseSettings):
         default=None, validation_alias="GOOGLE_BOOKS_API_KEY"
     )
 
+    # Matching
+    matching_concurrency: int = Field(
+        default=8, validation_alias="MATCHING_CONCURRENCY"
+    )
+    matching_batch_size: int = Field(
+        default=100, validation_alias="MATCHING_BATCH_SIZE"
+    )
+    # Shared (provider, normalized_key) -> match results; also bounds DB entries.
+    match_cache_ttl_secs: int = Field(
+        default=7 * 24 * 3600, validation_alias="MATCH_CACHE_TTL_SECS"
+    )
+
     # Rate limiting
     rate_limit_window_seconds: int = Field(
         default=60, validation_alias="RATE_LIMIT_WINDOW_SECONDS"
@@ -168,6 +210,14 @@ class Settings(BaseSettings):
     def rate_limit_window_secs(self) -> int:
         return self.rate_limit_window_seconds
 
+    # Library-wide availability refresh (app.workers.scheduler)
+    library_refresh_interval_secs: int = Field(
+        default=900, validation_alias="LIBRARY_REFRESH_INTERVAL_SECS"
+    )
+    library_refresh_batch_size: int = Field(
+        default=200, validation_alias="LIBRARY_REFRESH_BATCH_SIZE"
+    )
+
     # Workers
     worker_job_timeout_secs: int = Field(
         default=30, validation_alias="WORKER_JOB_TIMEOUT_SECS"
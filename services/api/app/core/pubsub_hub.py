@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Sequence, cast
+
+import redis.asyncio as redis_async
+from app.core.config import settings
+from app.core.sse import ClientBuffer, CoalesceKey
+
+logger = logging.getLogger(__name__)
+
+# Channels the SSE endpoints listen on (see app.workers.events).
+HUB_PATTERNS = ("notify:*", "sync:*")
+
+
+class PubSubHub:
+    """One Redis pub/sub connection per process, fanned out to SSE clients.
+
+    The hub pattern-subscribes to `patterns` once and dispatches each message
+    to the bounded buffers of the clients subscribed to its channel, so Redis
+    connections scale with API processes rather than open browser tabs.
+
+    The reader task starts lazily on the first subscription, reconnects after
+    Redis errors and is restarted if the event loop changed (e.g. between test
+    clients). A slow client's buffer drops or coalesces messages instead of
+    blocking the others (see app.core.sse.ClientBuffer). Non-blocking
+    commands SSE clients need (stream replay) share one pooled client.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        patterns: Sequence[str] = HUB_PATTERNS,
+        *,
+        buffer_size: int | None = None,
+        retry_seconds: float = 1.0,
+    ) -> None:
+        self._url = url
+        self._patterns = tuple(patterns)
+        self._buffer_size = buffer_size
+        self._retry_seconds = retry_seconds
+        self._buffers: dict[str, set[ClientBuffer]] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: redis_async.Redis | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(qs) for qs in self._buffers.values())
+
+    @asynccontextmanager
+    async def subscribe(
+        self, channel: str, *, coalesce: CoalesceKey | None = None
+    ) -> AsyncIterator[ClientBuffer]:
+        """Buffer receiving the raw (decoded) payloads published to `channel`."""
+        self._ensure_running()
+        buffer = ClientBuffer(
+            self._buffer_size or settings.sse_buffer_size, coalesce=coalesce
+        )
+        self._buffers.setdefault(channel, set()).add(buffer)
+        try:
+            yield buffer
+        finally:
+            buffers = self._buffers.get(channel)
+            if buffers is not None:
+                buffers.discard(buffer)
+                if not buffers:
+                    del self._buffers[channel]
+
+    def dispatch(self, channel: str, data: str) -> int:
+        """Deliver `data` to every buffer on `channel`; returns the number reached."""
+        buffers = self._buffers.get(channel, ())
+        for buffer in buffers:
+            buffer.offer(data)
+        return len(buffers)
+
+    async def read_stream(
+        self, key: str, *, after: str, count: int
+    ) -> list[tuple[str, dict[str, str]]]:
+        """Up to `count` entries of stream `key` with ids after `after` (XRANGE)."""
+        entries = await self._stream_client().xrange(
+            key, min=f"({after}", max="+", count=count
+        )
+        # decode_responses=True: ids and fields are str
+        return cast(list[tuple[str, dict[str, str]]], entries)
+
+    async def first_stream_id(self, key: str) -> str | None:
+        """Id of the oldest entry left in stream `key`; None if it is empty or gone."""
+        entries = await self._stream_client().xrange(key, min="-", max="+", count=1)
+        return cast(str, entries[0][0]) if entries else None
+
+    async def close(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+        task, self._task, self._loop = self._task, None, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def _stream_client(self) -> redis_async.Redis:
+        self._ensure_running()
+        if self._client is None:
+            self._client = redis_async.Redis.from_url(self._url, decode_responses=True)
+        return self._client
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        if self._loop is not loop:
+            # Buffers and connections from a previous loop are unusable.
+            self._buffers.clear()
+            self._client = None
+        self._loop = loop
+        self._task = loop.create_task(self._run(), name="pubsub-hub")
+
+    async def _run(self) -> None:
+        while True:
+            client = redis_async.Redis.from_url(self._url, decode_responses=True)
+            pubsub = client.pubsub()
+            try:
+                await pubsub.psubscribe(*self._patterns)
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    self.dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("pub/sub hub disconnected; retrying: %s", exc)
+            finally:
+                await pubsub.aclose()
+                await client.aclose()
+            await asyncio.sleep(self._retry_seconds)
+
+
+_hub = PubSubHub(settings.redis_url)
+
+
+def get_pubsub_hub() -> PubSubHub:
+    """Process-wide hub shared by the SSE endpoints."""
+    return _hub
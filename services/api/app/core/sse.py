@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import AbstractAsyncContextManager, aclosing
+from dataclasses import asdict, dataclass
+from typing import AsyncGenerator, Callable
+
+from app.core.config import settings
+
+# Maps a raw message to a coalescing key; messages with equal keys may replace
+# each other in a full buffer. None means "never coalesce this one".
+CoalesceKey = Callable[[str], str | None]
+
+
+@dataclass
+class SSEStats:
+    """Process-local SSE gauges (active) and counters (the rest)."""
+
+    active_connections: int = 0
+    dropped_messages: int = 0
+    coalesced_messages: int = 0
+    evicted_connections: int = 0
+    expired_connections: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+_stats = SSEStats()
+
+
+def sse_stats() -> SSEStats:
+    return _stats
+
+
+class ClientBuffer:
+    """Bounded per-connection message buffer.
+
+    When full, a new message overwrites the newest queued one with the same
+    coalescing key, else the oldest message is dropped. A client that loses a
+    whole buffer's worth of messages between reads is marked `evicted`: it is
+    too slow to follow and should reconnect (and replay) instead.
+    """
+
+    def __init__(self, maxsize: int, coalesce: CoalesceKey | None = None) -> None:
+        self._items: deque[str] = deque()
+        self._maxsize = maxsize
+        self._coalesce = coalesce
+        self._ready = asyncio.Event()
+        self._dropped_since_read = 0
+        self.evicted = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def offer(self, data: str) -> None:
+        if self.evicted:
+            return
+        if len(self._items) >= self._maxsize:
+            if self._replace(data):
+                _stats.coalesced_messages += 1
+                return
+            self._items.popleft()
+            _stats.dropped_messages += 1
+            self._dropped_since_read += 1
+            if self._dropped_since_read >= self._maxsize:
+                self.evicted = True
+        self._items.append(data)
+        self._ready.set()
+
+    async def get(self, timeout: float) -> str | None:
+        """Next message, or None if none arrived within `timeout` seconds."""
+        if not self._items:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        self._dropped_since_read = 0
+        return self._items.popleft()
+
+    def _replace(self, data: str) -> bool:
+        if self._coalesce is None:
+            return False
+        key = self._coalesce(data)
+        if key is None:
+            return False
+        # Overwrite the newest message with the same key, in place.
+        for i in range(len(self._items) - 1, -1, -1):
+            if self._coalesce(self._items[i]) == key:
+                self._items[i] = data
+                return True
+        return False
+
+
+async def sse_stream(
+    subscription: AbstractAsyncContextManager[ClientBuffer],
+    render: Callable[[str], str | None],
+    *,
+    prelude: Callable[[], AsyncGenerator[str, None]] | None = None,
+) -> AsyncGenerator[str, None]:
+    """Serve one SSE connection from a hub subscription.
+
+    Yields `prelude()` chunks first (e.g. a replay; the subscription is already
+    live so nothing published meanwhile is lost), then each buffered message
+    through `render` (None skips it). A heartbeat comment goes out whenever
+    the connection has been quiet for SSE_HEARTBEAT_SECS. The stream ends when
+    the client is evicted as a slow consumer, has had no events for
+    SSE_IDLE_TIMEOUT_SECS, or reaches SSE_MAX_LIFETIME_SECS; EventSource then
+    reconnects on its own.
+    """
+    heartbeat = settings.sse_heartbeat_secs
+    started = last_event = time.monotonic()
+    _stats.active_connections += 1
+    try:
+        async with subscription as buffer:
+            if prelude is not None:
+                # Close the replay here, not at garbage collection, if the
+                # client disconnects mid-replay.
+                async with aclosing(prelude()) as replay:
+                    async for chunk in replay:
+                        yield chunk
+
+            while True:
+                now = time.monotonic()
+                remaining = min(
+                    started + settings.sse_max_lifetime_secs - now,
+                    last_event + settings.sse_idle_timeout_secs - now,
+                )
+                if remaining <= 0:
+                    _stats.expired_connections += 1
+                    return
+
+                data = await buffer.get(min(heartbeat, remaining))
+                if buffer.evicted:
+                    _stats.evicted_connections += 1
+                    return
+                if data is None:
+                    yield ": keepalive\n\n"
+                    continue
+
+                last_event = time.monotonic()
+                rendered = render(data)
+                if rendered is not None:
+                    yield rendered
+    finally:
+        _stats.active_connections -= 1
@@ -2,15 +2,21 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable
+from typing import Iterable, Sequence
 from uuid import uuid4
 
+from app.crud.library_system import library_system_expr, library_system_for_user
 from app.models.availability_snapshot import AvailabilitySnapshot
 from app.models.catalog_match import CatalogMatch
+from app.models.library_availability import LibraryAvailability
 from app.models.notification_event import NotificationEvent
+from app.models.user import User
 from app.models.user_settings import UserSettings
 from app.providers.types import AvailabilityResult
-from sqlalchemy import select
+from app.services import unread_counter
+from app.services.dashboard_rows import refresh_dashboard_rows_for_catalog
+from app.services.matching.persist import bulk_upsert_library_availability
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 
@@ -21,116 +27,177 @@ def utcnow() -> datetime:
 @dataclass(frozen=True)
 class NotificationCreated:
     id: str
+    user_id: str
     shelf_item_id: str
     title: str
     format: str
 
 
-def upsert_snapshots(
-    db: Session, *, user_id: str, results: Iterable[AvailabilityResult]
+def load_user_availability(
+    db: Session, *, user_id: str, catalog_item_ids: Sequence[str]
+) -> dict[str, list[LibraryAvailability]]:
+    """Per-user view of shared availability: rows for the user's library system."""
+    if not catalog_item_ids:
+        return {}
+    library_system = library_system_for_user(db, user_id)
+    rows = (
+        db.execute(
+            select(LibraryAvailability).where(
+                LibraryAvailability.library_system == library_system,
+                LibraryAvailability.catalog_item_id.in_(list(set(catalog_item_ids))),
+            )
+        )
+        .scalars()
+        .all()
+    )
+    result: dict[str, list[LibraryAvailability]] = {}
+    for row in rows:
+        result.setdefault(row.catalog_item_id, []).append(row)
+    return result
+
+
+def upsert_library_availability(
+    db: Session,
+    *,
+    library_system: str,
+    results: Iterable[AvailabilityResult],
+    legacy_user_id: str | None = None,
 ) -> list[NotificationCreated]:
-    """Persist availability snapshots and create notifications when items become available.
-
-    Notes:
-    - Notification creation is durable (DB insert).
-    - Real-time delivery (Redis/SSE) is best-effort and happens after commit.
-    """
+    """Persist shared availability for one library system and notify its users.
 
-    # Read settings once per chunk
-    s = db.get(UserSettings, user_id)
-    notifications_on = bool(getattr(s, "notifications_enabled", True)) if s else True
+    Each (catalog item, format) is written once regardless of how many users
+    shelved it, and the dashboard rows of those users are refreshed. A
+    transition to available notifies every active user in the library whose
+    shelf matches the item (and has notifications enabled).
 
+    The previous status comes from the shared row; if there is none yet, the
+    per-user snapshot of `legacy_user_id` is consulted, so pre-migration state
+    still produces notifications.
+    """
     results_list = list(results)
     if not results_list:
         return []
 
-    # Map catalog_item_id -> shelf_item_id for this user
-    catalog_ids = {r.catalog_item_id for r in results_list}
-    match_rows = db.execute(
-        select(CatalogMatch.catalog_item_id, CatalogMatch.shelf_item_id).where(
-            CatalogMatch.user_id == user_id,
-            CatalogMatch.catalog_item_id.in_(list(catalog_ids)),
-        )
-    ).all()
-    catalog_to_shelf = {cid: sid for cid, sid in match_rows}
-
-    # Preload existing snapshots for quick compare
-    existing_rows = (
-        db.execute(
-            select(AvailabilitySnapshot).where(
-                AvailabilitySnapshot.user_id == user_id,
-                AvailabilitySnapshot.catalog_item_id.in_(list(catalog_ids)),
+    catalog_ids = list({r.catalog_item_id for r in results_list})
+    previous: dict[tuple[str, str], str] = {
+        (cid, fmt): status
+        for cid, fmt, status in db.execute(
+            select(
+                LibraryAvailability.catalog_item_id,
+                LibraryAvailability.format,
+                LibraryAvailability.status,
+            ).where(
+                LibraryAvailability.library_system == library_system,
+                LibraryAvailability.catalog_item_id.in_(catalog_ids),
             )
         )
-        .scalars()
-        .all()
-    )
-    existing_by_key: dict[tuple[str, str], AvailabilitySnapshot] = {
-        (row.catalog_item_id, row.format): row for row in existing_rows
     }
 
-    created: list[NotificationCreated] = []
+    legacy_status: dict[tuple[str, str], str] = {}
+    if legacy_user_id is not None:
+        legacy_rows = db.execute(
+            select(
+                AvailabilitySnapshot.catalog_item_id,
+                AvailabilitySnapshot.format,
+                AvailabilitySnapshot.status,
+            ).where(
+                AvailabilitySnapshot.user_id == legacy_user_id,
+                AvailabilitySnapshot.catalog_item_id.in_(catalog_ids),
+            )
+        ).all()
+        legacy_status = {(cid, fmt): status for cid, fmt, status in legacy_rows}
+
     now = utcnow()
+    became_available: list[tuple[str, str, str, str | None]] = []
 
     for r in results_list:
         a = r.availability
         key = (r.catalog_item_id, a.format.value)
-
-        prev = existing_by_key.get(key)
-        old_status = prev.status if prev is not None else "unknown"
+        old_status = previous.get(key) or legacy_status.get(key, "unknown")
         new_status = a.status.value
+        # A later result for the same key sees this one as its previous state.
+        previous[key] = new_status
+
+        if old_status in {"hold", "not_owned"} and new_status == "available":
+            became_available.append(
+                (r.catalog_item_id, a.format.value, old_status, a.deep_link)
+            )
 
-        # Upsert snapshot
-        if prev is not None:
-            prev.status = new_status
-            prev.copies_available = a.copies_available
-            prev.copies_total = a.copies_total
-            prev.holds = a.holds
-            prev.deep_link = a.deep_link
-            prev.last_checked_at = now
-        else:
-            row = AvailabilitySnapshot(
+    bulk_upsert_library_availability(
+        db, library_system=library_system, results=results_list, checked_at=now
+    )
+
+    refresh_dashboard_rows_for_catalog(
+        db, library_system=library_system, catalog_item_ids=catalog_ids
+    )
+
+    if not became_available:
+        return []
+
+    # Emit notifications on transition -> available, for every subscriber
+    subscribers = db.execute(
+        select(
+            CatalogMatch.catalog_item_id,
+            CatalogMatch.user_id,
+            CatalogMatch.shelf_item_id,
+        )
+        .join(User, User.id == CatalogMatch.user_id)
+        .outerjoin(UserSettings, UserSettings.user_id == CatalogMatch.user_id)
+        .where(User.is_active.is_(True))
+        .where(library_system_expr() == library_system)
+        .where(func.coalesce(UserSettings.notifications_enabled, True).is_(True))
+        .where(
+            CatalogMatch.catalog_item_id.in_(
+                list({cid for cid, *_ in became_available})
+            )
+        )
+    ).all()
+    by_catalog: dict[str, list[tuple[str, str]]] = {}
+    for catalog_item_id, user_id, shelf_item_id in subscribers:
+        by_catalog.setdefault(catalog_item_id, []).append((user_id, shelf_item_id))
+
+    created: list[NotificationCreated] = []
+    for catalog_item_id, fmt, old_status, deep_link in became_available:
+        for user_id, shelf_item_id in by_catalog.get(catalog_item_id, []):
+            ev = NotificationEvent(
                 id=str(uuid4()),
                 user_id=user_id,
-                catalog_item_id=r.catalog_item_id,
-                format=a.format.value,
-                status=new_status,
-                copies_available=a.copies_available,
-                copies_total=a.copies_total,
-                holds=a.holds,
-                deep_link=a.deep_link,
-                last_checked_at=now,
+                shelf_item_id=shelf_item_id,
+                format=fmt,
+                old_status=old_status,
+                new_status="available",
+                deep_link=deep_link,
+                created_at=now,
             )
-            db.add(row)
-            existing_by_key[key] = row
-
-        # Emit notification on transition -> available
-        if (
-            notifications_on
-            and old_status in {"hold", "not_owned"}
-            and new_status == "available"
-        ):
-            shelf_item_id = catalog_to_shelf.get(r.catalog_item_id)
-            if shelf_item_id:
-                ev = NotificationEvent(
-                    id=str(uuid4()),
+            db.add(ev)
+
+            created.append(
+                NotificationCreated(
+                    id=ev.id,
                     user_id=user_id,
                     shelf_item_id=shelf_item_id,
-                    format=a.format.value,
-                    old_status=old_status,
-                    new_status=new_status,
-                    deep_link=a.deep_link,
-                    created_at=now,
-                )
-                db.add(ev)
-
-                created.append(
-                    NotificationCreated(
-                        id=ev.id,
-                        shelf_item_id=shelf_item_id,
-                        title="",  # hydrated later (optional)
-                        format=a.format.value,
-                    )
+                    title="",  # hydrated later (optional)
+                    format=fmt,
                 )
+            )
 
+    unread_counter.note_created(db, (c.user_id for c in created))
     return created
+
+
+def upsert_snapshots(
+    db: Session, *, user_id: str, results: Iterable[AvailabilityResult]
+) -> list[NotificationCreated]:
+    """Persist availability seen by one user's sync into their library's shared rows.
+
+    Notes:
+    - Notification creation is durable (DB insert) and covers every user of
+      the same library who shelved the item, not only `user_id`.
+    - Real-time delivery (Redis/SSE) is best-effort and happens after commit.
+    """
+    return upsert_library_availability(
+        db,
+        library_system=library_system_for_user(db, user_id),
+        results=results,
+        legacy_user_id=user_id,
+    )
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from app.models.user import User
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+
+def bump_data_version(db: Session, user_ids: Iterable[str]) -> None:
+    """Invalidate cached dashboard/book responses of these users.
+
+    Runs in the caller's transaction, so the new version becomes visible
+    together with the data it describes.
+    """
+    ids = list(set(user_ids))
+    if not ids:
+        return
+    db.execute(
+        update(User)
+        .where(User.id.in_(ids))
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+def next_data_version(db: Session, user_id: str) -> int:
+    """Bump one user's data version and return the new value.
+
+    Also the user's dashboard change sequence: rows written in this
+    transaction are stamped with it.
+    """
+    version = db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .returning(User.data_version)
+        .execution_options(synchronize_session="fetch")
+    ).scalar_one_or_none()
+    # No user row (SQLite does not enforce the FK): nothing to version.
+    return int(version or 0)
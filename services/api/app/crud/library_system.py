@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from app.models.user_settings import UserSettings
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+# Library system for users who have not picked one.
+DEFAULT_LIBRARY_SYSTEM = "default"
+
+
+def library_system_expr():
+    """SQL expression for a user's effective library system (needs UserSettings)."""
+    return func.coalesce(UserSettings.library_system, DEFAULT_LIBRARY_SYSTEM)
+
+
+def library_system_for_user(db: Session, user_id: str) -> str:
+    s = db.get(UserSettings, user_id)
+    return (s.library_system if s is not None else None) or DEFAULT_LIBRARY_SYSTEM
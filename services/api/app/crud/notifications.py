@@ -6,7 +6,8 @@ from typing import Any, cast
 
 from app.models.notification_event import NotificationEvent
 from app.models.shelf_item import ShelfItem
-from sqlalchemy import func, select, update
+from app.services import unread_counter
+from sqlalchemy import and_, func, or_, select, update
 from sqlalchemy.engine import CursorResult
 from sqlalchemy.orm import Session
 
@@ -25,8 +26,18 @@ class NotificationRow:
 def unread_count(db: Session, *, user_id: str) -> int:
     """Count unread notifications for a user.
 
-    Kept for compatibility with app.api.routes.notifications imports.
+    Answered from the user's Redis counter when it is sound; otherwise counted
+    in the database and the counter rebuilt.
     """
+    cached = unread_counter.get_cached(user_id)
+    if cached is not None:
+        return cached
+    count = _count_unread(db, user_id=user_id)
+    unread_counter.store(user_id, count)
+    return count
+
+
+def _count_unread(db: Session, *, user_id: str) -> int:
     return int(
         db.execute(
             select(func.count())
@@ -50,7 +61,16 @@ def list_notifications(
     unread_only: bool,
     limit: int,
     offset: int,
-) -> tuple[int, list[NotificationRow]]:
+    after: tuple[datetime, str] | None = None,
+    with_total: bool = True,
+) -> tuple[int | None, list[NotificationRow], bool]:
+    """One page of a user's notifications, newest first by (created_at, id).
+
+    `after` is the (created_at, id) of the previous page's last row and
+    replaces `offset`, so deep pages cost the same as the first. With
+    `with_total` the total is counted too (unread_only totals come from the
+    unread counter); otherwise it is None. Returns (total, rows, has_more).
+    """
     base = (
         select(NotificationEvent, ShelfItem.title, ShelfItem.author)
         .join(ShelfItem, ShelfItem.id == NotificationEvent.shelf_item_id)
@@ -59,35 +79,71 @@ def list_notifications(
     if unread_only:
         base = base.where(NotificationEvent.read_at.is_(None))
 
-    total = int(
-        db.execute(select(func.count()).select_from(base.subquery())).scalar_one()
-    )
+    total: int | None = None
+    if with_total:
+        total = (
+            unread_count(db, user_id=user_id)
+            if unread_only
+            else int(
+                db.execute(
+                    select(func.count()).select_from(base.subquery())
+                ).scalar_one()
+            )
+        )
 
-    stmt = (
-        base.order_by(NotificationEvent.created_at.desc()).limit(limit).offset(offset)
-    )
+    created_at, event_id = NotificationEvent.created_at, NotificationEvent.id
+    stmt = base.order_by(created_at.desc(), event_id.desc())
+    if after is not None:
+        stmt = stmt.where(
+            or_(
+                created_at < after[0],
+                and_(created_at == after[0], event_id < after[1]),
+            )
+        )
+    elif offset:
+        stmt = stmt.offset(offset)
 
     # .tuples() gives mypy a predictable tuple type for unpacking
-    rows_raw = db.execute(stmt).tuples().all()
+    rows_raw = db.execute(stmt.limit(limit + 1)).tuples().all()
 
     rows: list[NotificationRow] = []
-    for ev, title, author in rows_raw:
+    for ev, title, author in rows_raw[:limit]:
         rows.append(NotificationRow(event=ev, title=title, author=author))
 
-    return total, rows
+    return total, rows, len(rows_raw) > limit
 
 
 def mark_read(db: Session, *, user_id: str, notification_id: str) -> bool:
-    """Mark a single notification as read (idempotent)."""
-    ev = db.get(NotificationEvent, notification_id)
-    if ev is None or ev.user_id != user_id:
-        return False
+    """Mark a single notification as read (idempotent).
 
-    if ev.read_at is None:
-        ev.read_at = utcnow()
-        db.add(ev)
-        db.commit()
+    A conditional UPDATE, so of concurrent calls only the one that flips
+    `read_at` decrements the unread counter. False if the user has no such
+    notification.
+    """
+    stmt = (
+        update(NotificationEvent)
+        .where(
+            NotificationEvent.id == notification_id,
+            NotificationEvent.user_id == user_id,
+            NotificationEvent.read_at.is_(None),
+        )
+        .values(read_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    updated = int(cast(CursorResult[Any], db.execute(stmt)).rowcount or 0)
+    if updated == 0:
+        return (
+            db.execute(
+                select(NotificationEvent.id).where(
+                    NotificationEvent.id == notification_id,
+                    NotificationEvent.user_id == user_id,
+                )
+            ).first()
+            is not None
+        )
 
+    db.commit()
+    unread_counter.note_read(user_id, updated)
     return True
 
 
@@ -102,4 +158,9 @@ def mark_all_read(db: Session, *, user_id: str) -> int:
     )
     res = cast(CursorResult[Any], db.execute(stmt))
     db.commit()
-    return int(res.rowcount or 0)
+    # Decrement rather than reset: notifications created after the UPDATE
+    # have already been counted and must stay.
+    updated = int(res.rowcount or 0)
+    if updated:
+        unread_counter.note_read(user_id, updated)
+    return updated
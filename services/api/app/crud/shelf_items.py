@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from app.models.shelf_item import ShelfItem
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
 
@@ -13,3 +13,30 @@ def list_shelf_items_for_user(db: Session, *, user_id: str) -> list[ShelfItem]:
         .order_by(ShelfItem.updated_at.desc())
     )
     return list(db.execute(stmt).scalars().all())
+
+
+def list_shelf_items_needing_match(
+    db: Session, *, user_id: str, full: bool = False
+) -> list[ShelfItem]:
+    """Return shelf items that are new or changed since they were last matched.
+
+    An item needs (re-)matching when it was never attempted, or its content
+    fingerprint differs from the one recorded at the last attempt; misses are
+    recorded too, so unmatched items aren't retried until they change.
+    `full=True` returns every item.
+    """
+    if full:
+        return list_shelf_items_for_user(db, user_id=user_id)
+
+    stmt = (
+        select(ShelfItem)
+        .where(ShelfItem.user_id == user_id)
+        .where(
+            or_(
+                ShelfItem.match_attempt_fingerprint.is_(None),
+                ShelfItem.content_fingerprint != ShelfItem.match_attempt_fingerprint,
+            )
+        )
+        .order_by(ShelfItem.updated_at.desc())
+    )
+    return list(db.execute(stmt).scalars().all())
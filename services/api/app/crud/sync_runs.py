@@ -36,11 +36,21 @@ def set_sync_run_running(db: Session, *, run: SyncRun, total: int) -> SyncRun:
 
 
 def update_progress(
-    db: Session, *, run: SyncRun, current: int, total: Optional[int] = None
+    db: Session,
+    *,
+    run: SyncRun,
+    current: int,
+    total: Optional[int] = None,
+    cache_hits: Optional[int] = None,
+    cache_misses: Optional[int] = None,
 ) -> SyncRun:
     run.progress_current = current
     if total is not None:
         run.progress_total = total
+    if cache_hits is not None:
+        run.cache_hits = cache_hits
+    if cache_misses is not None:
+        run.cache_misses = cache_misses
     db.commit()
     db.refresh(run)
     return run
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import re
 from dataclasses import dataclass
 
@@ -27,6 +28,19 @@ def normalize_isbn(raw: str) -> str:
     return cleaned
 
 
+def content_fingerprint(
+    *,
+    title: str,
+    author: str,
+    isbn13: str | None = None,
+    isbn10: str | None = None,
+    asin: str | None = None,
+) -> str:
+    """Stable hash of the fields matching reads; changes iff a re-match is needed."""
+    parts = (title, author, isbn13 or "", isbn10 or "", asin or "")
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
 @dataclass(frozen=True)
 class NormalizedIdentifiers:
     isbn13: str | None
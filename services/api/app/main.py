@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from app.api.router import api_router
 from app.api.routes.notifications import router as notifications_router
 from app.core.config import settings
 from app.core.otel import init_otel
+from app.core.pubsub_hub import get_pubsub_hub
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title=settings.api_name)
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    yield
+    # The SSE hub starts on first use; stop its Redis reader on shutdown.
+    await get_pubsub_hub().close()
+
+
+app = FastAPI(title=settings.api_name, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
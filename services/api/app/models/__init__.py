@@ -2,7 +2,12 @@ from app.models.availability_snapshot import AvailabilitySnapshot
 from app.models.base import Base
 from app.models.catalog_item import CatalogItem
 from app.models.catalog_match import CatalogMatch
+from app.models.dashboard_row import DashboardRow
+from app.models.dashboard_row_format import DashboardRowFormat
+from app.models.dashboard_tombstone import DashboardTombstone
 from app.models.library import Library
+from app.models.library_availability import LibraryAvailability
+from app.models.match_cache import MatchCacheEntry
 from app.models.notification_event import NotificationEvent
 from app.models.shelf_item import ShelfItem
 from app.models.shelf_source import ShelfSource
@@ -19,7 +24,12 @@ __all__ = [
     "Library",
     "CatalogItem",
     "CatalogMatch",
+    "MatchCacheEntry",
     "AvailabilitySnapshot",
+    "LibraryAvailability",
+    "DashboardRow",
+    "DashboardRowFormat",
+    "DashboardTombstone",
     "SyncRun",
     "NotificationEvent",
 ]
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from app.models.base import Base
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    false,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class DashboardRow(Base):
+    """Denormalized dashboard row, one per shelf item.
+
+    Maintained by services.dashboard_rows whenever the shelf item, its match,
+    its library's availability or the user's preferred formats change, so the
+    dashboard reads a single table.
+    """
+
+    __tablename__ = "dashboard_rows"
+
+    shelf_item_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("shelf_items.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    shelf_source_id: Mapped[str | None] = mapped_column(
+        String(36),
+        ForeignKey("shelf_sources.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    title: Mapped[str] = mapped_column(String(600), nullable=False)
+    # lower(title), for case-insensitive ordering
+    title_key: Mapped[str] = mapped_column(String(600), nullable=False)
+    author: Mapped[str | None] = mapped_column(String(400), nullable=True)
+    shelf: Mapped[str | None] = mapped_column(String(80), nullable=True)
+    needs_fuzzy_match: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False
+    )
+
+    # schemas.dashboard.MatchMiniOut / list[AvailabilityOut], JSON-encoded
+    match: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # match is not None, as a filterable column
+    matched: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=false(), nullable=False
+    )
+    availability: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+
+    # services.read_next_scoring.compute_read_next output; reasons are built
+    # per page on read (services.read_next_batch).
+    read_next_score: Mapped[float] = mapped_column(Float, nullable=False)
+    read_next_tier: Mapped[str] = mapped_column(String(20), nullable=False)
+    best_format: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    hold_ratio: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    # ShelfItem.updated_at, for sort=updated
+    item_updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    # User data version of the last change to this row's content
+    change_seq: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, onupdate=utcnow, nullable=False
+    )
+
+
+# sort=read_next: top-N is an index-ordered LIMIT
+Index(
+    "ix_dashboard_rows_user_score",
+    DashboardRow.user_id,
+    DashboardRow.read_next_score.desc(),
+    DashboardRow.shelf_item_id,
+)
+Index(
+    "ix_dashboard_rows_user_title",
+    DashboardRow.user_id,
+    DashboardRow.title_key,
+    DashboardRow.shelf_item_id,
+)
+Index(
+    "ix_dashboard_rows_user_updated",
+    DashboardRow.user_id,
+    DashboardRow.item_updated_at,
+    DashboardRow.shelf_item_id,
+)
+# Filtered views (tier, shelf, match state) in read-next order; the format
+# filter probes dashboard_row_formats by primary key.
+Index(
+    "ix_dashboard_rows_user_tier_score",
+    DashboardRow.user_id,
+    DashboardRow.read_next_tier,
+    DashboardRow.read_next_score.desc(),
+    DashboardRow.shelf_item_id,
+)
+Index(
+    "ix_dashboard_rows_user_shelf_score",
+    DashboardRow.user_id,
+    DashboardRow.shelf,
+    DashboardRow.read_next_score.desc(),
+    DashboardRow.shelf_item_id,
+)
+Index(
+    "ix_dashboard_rows_user_matched_score",
+    DashboardRow.user_id,
+    DashboardRow.matched,
+    DashboardRow.needs_fuzzy_match,
+    DashboardRow.read_next_score.desc(),
+    DashboardRow.shelf_item_id,
+)
+Index(
+    "ix_dashboard_rows_user_change_seq",
+    DashboardRow.user_id,
+    DashboardRow.change_seq,
+)
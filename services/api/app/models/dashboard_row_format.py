@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from app.models.base import Base
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class DashboardRowFormat(Base):
+    """A format a dashboard row's library carries (available or on hold).
+
+    Side table of dashboard_rows for the `format` filter, kept in step with
+    the row's availability by services.dashboard_rows.
+    """
+
+    __tablename__ = "dashboard_row_formats"
+
+    shelf_item_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("shelf_items.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    format: Mapped[str] = mapped_column(String(20), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)  # available | hold
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from app.models.base import Base
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class DashboardTombstone(Base):
+    """A deleted dashboard row, so delta clients can drop it.
+
+    No FK to shelf_items: the item is gone by the time this is read.
+    """
+
+    __tablename__ = "dashboard_tombstones"
+
+    user_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    shelf_item_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+
+    # User data version (change sequence) of the deletion
+    change_seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utcnow, nullable=False
+    )
+
+
+Index(
+    "ix_dashboard_tombstones_user_seq",
+    DashboardTombstone.user_id,
+    DashboardTombstone.change_seq,
+)
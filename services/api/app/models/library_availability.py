@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import uuid4
+
+from app.models.base import Base
+from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class LibraryAvailability(Base):
+    """Availability of a catalog item at one library system, shared by its users.
+
+    Users see these rows through crud.availability.load_user_availability,
+    resolved via their UserSettings.library_system ("default" when unset).
+    """
+
+    __tablename__ = "library_availability"
+
+    id: Mapped[str] = mapped_column(
+        String(36), primary_key=True, default=lambda: str(uuid4())
+    )
+
+    library_system: Mapped[str] = mapped_column(String(200), nullable=False)
+    catalog_item_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("catalog_items.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    format: Mapped[str] = mapped_column(String(20), nullable=False)  # ebook | audiobook
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False
+    )  # available | hold | not_owned
+
+    copies_available: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    copies_total: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    holds: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    deep_link: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
+    last_checked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "library_system",
+            "catalog_item_id",
+            "format",
+            name="uq_library_avail_library_item_format",
+        ),
+    )
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.models.base import Base
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class MatchCacheEntry(Base):
+    """Winning catalog match for a normalized book identity, shared across users."""
+
+    __tablename__ = "match_cache"
+
+    id: Mapped[str] = mapped_column(
+        String(36), primary_key=True, default=lambda: str(uuid4())
+    )
+
+    provider: Mapped[str] = mapped_column(String(40), nullable=False)
+    # NormalizedIdentifiers.normalized_key (isbn13:/isbn10:/asin:/title_author:)
+    normalized_key: Mapped[str] = mapped_column(String(1024), nullable=False)
+
+    catalog_item_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("catalog_items.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    method: Mapped[str] = mapped_column(String(40), nullable=False)  # isbn | fuzzy
+    confidence: Mapped[float] = mapped_column(Float, nullable=False)
+    evidence: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "provider", "normalized_key", name="uq_match_cache_provider_key"
+        ),
+    )
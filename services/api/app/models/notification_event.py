@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from uuid import uuid4
 
 from app.models.base import Base
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 
@@ -45,3 +45,20 @@ class NotificationEvent(Base):
     read_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+
+
+# Listing pages, newest first: the default view and unread_only (read_at IS
+# NULL) are each an ordered range scan.
+Index(
+    "ix_notification_events_user_created",
+    NotificationEvent.user_id,
+    NotificationEvent.created_at.desc(),
+    NotificationEvent.id.desc(),
+)
+Index(
+    "ix_notification_events_user_read_created",
+    NotificationEvent.user_id,
+    NotificationEvent.read_at,
+    NotificationEvent.created_at.desc(),
+    NotificationEvent.id.desc(),
+)
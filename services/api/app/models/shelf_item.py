@@ -53,6 +53,13 @@ class ShelfItem(Base):
         Boolean, nullable=False, default=False
     )
 
+    # domain.normalize.content_fingerprint of the fields matching reads
+    content_fingerprint: Mapped[str | None] = mapped_column(String(40), nullable=True)
+    # content_fingerprint as of the last match attempt, matched or not
+    match_attempt_fingerprint: Mapped[str | None] = mapped_column(
+        String(40), nullable=True
+    )
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=utcnow, nullable=False
     )
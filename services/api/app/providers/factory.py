@@ -2,23 +2,33 @@ from __future__ import annotations
 
 from typing import Iterable
 
+from app.crud.library_system import DEFAULT_LIBRARY_SYSTEM, library_system_for_user
 from app.models.catalog_item import CatalogItem
 from app.models.catalog_match import CatalogMatch
 from app.models.shelf_item import ShelfItem
 from app.providers.types import AvailabilityResult
+from app.services.availability_cache import CacheStats, get_availability_cached
 from app.services.catalog.factory import get_provider as get_catalog_provider
-from app.workers.async_utils import run_async
+from app.services.catalog.types import Format
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 
 class AvailabilityProvider:
-    """Adapter that fetches provider availability for matched catalog items."""
+    """Adapter that fetches provider availability for matched catalog items.
 
-    def __init__(self, db: Session, user_id: str):
+    Reads go through the shared Redis availability cache keyed by the user's
+    library system, so users of the same library share provider calls within
+    AVAILABILITY_CACHE_TTL_SECS. `cache_stats` accumulates over the adapter's
+    lifetime.
+    """
+
+    def __init__(self, db: Session, user_id: str, library_system: str | None = None):
         self._db = db
         self._user_id = user_id
         self._catalog_provider = get_catalog_provider()
+        self.library_system = library_system or DEFAULT_LIBRARY_SYSTEM
+        self.cache_stats = CacheStats()
 
     @property
     def name(self) -> str:
@@ -49,23 +59,27 @@ class AvailabilityProvider:
             provider_to_catalog[pid] = catalog_item.id
             provider_item_ids.append(pid)
 
-        # Ask the catalog provider for availability on its own IDs.
-        availability_list = run_async(
-            self._catalog_provider.availability_bulk(
-                provider_item_ids=provider_item_ids
-            )
+        # Ask the catalog provider (via the cache) for availability on its own IDs.
+        cached = get_availability_cached(
+            library_system=self.library_system,
+            provider_item_ids=provider_item_ids,
+            formats=[f.value for f in Format],
+            provider=self._catalog_provider,
+            stats=self.cache_stats,
         )
 
         out: list[AvailabilityResult] = []
-        for availability in availability_list:
-            catalog_id = provider_to_catalog.get(availability.provider_item_id)
-            if not catalog_id:
-                continue
-            out.append(
-                AvailabilityResult(
-                    catalog_item_id=catalog_id, availability=availability
+        for pid in provider_item_ids:
+            for fmt in Format:
+                entry = cached.get((pid, fmt.value))
+                if entry is None:
+                    continue
+                out.append(
+                    AvailabilityResult(
+                        catalog_item_id=provider_to_catalog[pid],
+                        availability=entry.availability,
+                    )
                 )
-            )
 
         return out
 
@@ -75,6 +89,8 @@ def get_provider(db: Session, user_id: str) -> AvailabilityProvider:
     Return a provider configured for the given user.
 
     The provider looks up existing catalog matches and delegates availability
-    lookups to the configured catalog provider.
+    lookups to the configured catalog provider through the availability cache.
     """
-    return AvailabilityProvider(db=db, user_id=user_id)
+    return AvailabilityProvider(
+        db=db, user_id=user_id, library_system=library_system_for_user(db, user_id)
+    )
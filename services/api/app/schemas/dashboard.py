@@ -55,6 +55,8 @@ class PageOut(BaseModel):
     limit: int
     offset: int
     total: int
+    # Opaque keyset cursor for the next page; pass back as `cursor`.
+    next_cursor: str | None = None
 
 
 class DashboardOut(BaseModel):
@@ -62,3 +64,29 @@ class DashboardOut(BaseModel):
     last_sync: LastSyncOut
     page: PageOut
     items: list[DashboardRowOut]
+
+
+class DashboardChangesOut(BaseModel):
+    # The user's data version now; pass it back as `since` next time.
+    version: int
+    items: list[DashboardRowOut]
+    # Shelf item ids removed since `since`.
+    deleted: list[str]
+
+
+class TierCountsOut(BaseModel):
+    total: int = 0
+    available: int = 0
+    hold: int = 0
+    not_owned: int = 0
+    unmatched: int = 0
+
+
+class ShelfSummaryOut(TierCountsOut):
+    shelf: str | None
+
+
+class DashboardSummaryOut(BaseModel):
+    version: int
+    counts: TierCountsOut
+    shelves: list[ShelfSummaryOut]
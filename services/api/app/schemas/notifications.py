@@ -23,7 +23,10 @@ class NotificationOut(BaseModel):
 class PageOut(BaseModel):
     limit: int
     offset: int
-    total: int
+    # None when the request passed include_total=false
+    total: int | None
+    # Opaque keyset cursor for the next page; pass back as `cursor`.
+    next_cursor: str | None = None
 
 
 class NotificationListOut(BaseModel):
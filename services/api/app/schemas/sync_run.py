@@ -15,6 +15,8 @@ class SyncRunOut(BaseModel):
     status: str
     progress_current: int
     progress_total: int
+    cache_hits: int = 0
+    cache_misses: int = 0
     error_message: str | None = None
     started_at: datetime | None = None
     finished_at: datetime | None = None
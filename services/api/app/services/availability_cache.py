@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import json
+import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
 from app.core.config import settings
 from app.core.redis_client import get_redis
 from app.services.catalog.factory import get_provider
+from app.services.catalog.provider import CatalogProvider
 from app.services.catalog.types import AvailabilityStatus, Format, ProviderAvailability
 from app.workers.async_utils import run_async
+from redis import Redis
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -17,6 +22,15 @@ class CachedAvailability:
     last_checked_at: datetime
 
 
+@dataclass
+class CacheStats:
+    """Running hit/miss counts, per provider item id."""
+
+    hits: int = 0
+    misses: int = 0
+    provider_calls: int = 0
+
+
 def _availability_key(
     *, provider: str, library_system: str, provider_item_id: str, fmt: str
 ) -> str:
@@ -32,6 +46,8 @@ def get_availability_cached(
     library_system: str,
     provider_item_ids: list[str],
     formats: list[str],
+    provider: CatalogProvider | None = None,
+    stats: CacheStats | None = None,
 ) -> dict[tuple[str, str], CachedAvailability]:
     """Return availability per (provider_item_id, format).
 
@@ -40,14 +56,15 @@ def get_availability_cached(
     - Only calls provider for cache misses.
     - Writes misses back to Redis with TTL.
 
-    Returns a map keyed by (provider_item_id, format).
+    Returns a map keyed by (provider_item_id, format). `provider` defaults to
+    the configured catalog provider; `stats` is updated in place when given.
     """
 
-    provider = get_provider()
+    if provider is None:
+        provider = get_provider()
     provider_name = getattr(provider, "name", "unknown")
 
     r = get_redis()
-    ttl = int(settings.availability_cache_ttl_secs)
     wanted = [(pid, fmt) for pid in provider_item_ids for fmt in formats]
 
     out: dict[tuple[str, str], CachedAvailability] = {}
@@ -67,7 +84,12 @@ def get_availability_cached(
         ]
         for k in keys:
             pipe.get(k)
-        values = pipe.execute()
+        try:
+            values = pipe.execute()
+        except Exception:
+            # Fail open: every key counts as a miss and goes to the provider.
+            logger.warning("availability cache read failed; fetching from provider")
+            values = [None] * len(wanted)
 
         for (pid, fmt), raw in zip(wanted, values):
             if not raw:
@@ -86,56 +108,116 @@ def get_availability_cached(
     else:
         missing_provider_ids = set(provider_item_ids)
 
+    if stats is not None:
+        unique_ids = set(provider_item_ids)
+        stats.hits += len(unique_ids - missing_provider_ids)
+        stats.misses += len(missing_provider_ids)
+
     # 2) Fetch misses
     if missing_provider_ids:
-        fetched = run_async(
-            provider.availability_bulk(provider_item_ids=sorted(missing_provider_ids))
+        if stats is not None:
+            stats.provider_calls += 1
+        out.update(
+            _fetch_and_store(
+                provider,
+                r=r,
+                library_system=library_system,
+                provider_item_ids=sorted(missing_provider_ids),
+                formats=formats,
+            )
         )
 
-        checked_at = _now_utc()
+    return out
 
-        # Store provider results
-        for item in fetched:
-            fmt = str(item.format)
-            key = (item.provider_item_id, fmt)
-            out[key] = CachedAvailability(availability=item, last_checked_at=checked_at)
 
-        # Fill any requested (pid, fmt) that provider didn't return
-        for pid in missing_provider_ids:
-            for fmt in formats:
-                if (pid, fmt) in out:
-                    continue
-                out[(pid, fmt)] = CachedAvailability(
-                    availability=ProviderAvailability(
-                        provider=provider_name,
-                        provider_item_id=pid,
-                        format=Format(fmt),
-                        status=AvailabilityStatus.not_owned,
-                        copies_available=None,
-                        copies_total=None,
-                        holds=None,
-                        deep_link=None,
-                    ),
-                    last_checked_at=checked_at,
-                )
+def refresh_availability(
+    *,
+    library_system: str,
+    provider_item_ids: list[str],
+    formats: list[str],
+    provider: CatalogProvider | None = None,
+    stats: CacheStats | None = None,
+) -> dict[tuple[str, str], CachedAvailability]:
+    """Fetch availability from the provider unconditionally and write it through.
+
+    Same return shape as `get_availability_cached`; used by scheduled refreshes
+    so later per-user reads within the TTL are served from Redis.
+    """
+    if provider is None:
+        provider = get_provider()
+    if not provider_item_ids:
+        return {}
+    if stats is not None:
+        stats.misses += len(set(provider_item_ids))
+        stats.provider_calls += 1
+    return _fetch_and_store(
+        provider,
+        r=get_redis(),
+        library_system=library_system,
+        provider_item_ids=sorted(set(provider_item_ids)),
+        formats=formats,
+    )
+
+
+def _fetch_and_store(
+    provider: CatalogProvider,
+    *,
+    r: Redis | None,
+    library_system: str,
+    provider_item_ids: list[str],
+    formats: list[str],
+) -> dict[tuple[str, str], CachedAvailability]:
+    provider_name = getattr(provider, "name", "unknown")
+    ttl = int(settings.availability_cache_ttl_secs)
 
-        # Write to Redis
-        if r is not None:
-            pipe = r.pipeline()
-            for (pid, fmt), entry in out.items():
-                if pid not in missing_provider_ids:
-                    continue
-                k = _availability_key(
+    fetched = run_async(provider.availability_bulk(provider_item_ids=provider_item_ids))
+    checked_at = _now_utc()
+
+    out: dict[tuple[str, str], CachedAvailability] = {}
+
+    # Store provider results
+    for item in fetched:
+        fmt = item.format.value
+        key = (item.provider_item_id, fmt)
+        out[key] = CachedAvailability(availability=item, last_checked_at=checked_at)
+
+    # Fill any requested (pid, fmt) that provider didn't return
+    for pid in provider_item_ids:
+        for fmt in formats:
+            if (pid, fmt) in out:
+                continue
+            out[(pid, fmt)] = CachedAvailability(
+                availability=ProviderAvailability(
                     provider=provider_name,
-                    library_system=library_system,
                     provider_item_id=pid,
-                    fmt=fmt,
-                )
-                payload = {
-                    "availability": entry.availability.model_dump(mode="json"),
-                    "last_checked_at": entry.last_checked_at.isoformat(),
-                }
-                pipe.setex(k, ttl, json.dumps(payload))
+                    format=Format(fmt),
+                    status=AvailabilityStatus.not_owned,
+                    copies_available=None,
+                    copies_total=None,
+                    holds=None,
+                    deep_link=None,
+                ),
+                last_checked_at=checked_at,
+            )
+
+    # Write to Redis
+    if r is not None:
+        pipe = r.pipeline()
+        for (pid, fmt), entry in out.items():
+            k = _availability_key(
+                provider=provider_name,
+                library_system=library_system,
+                provider_item_id=pid,
+                fmt=fmt,
+            )
+            payload = {
+                "availability": entry.availability.model_dump(mode="json"),
+                "last_checked_at": entry.last_checked_at.isoformat(),
+            }
+            pipe.setex(k, ttl, json.dumps(payload))
+        try:
             pipe.execute()
+        except Exception:
+            logger.warning("availability cache write failed; skipping write-back")
 
     return out
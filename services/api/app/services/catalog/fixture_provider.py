@@ -26,12 +26,103 @@ def _norm_isbn(s: str | None) -> str | None:
     return digits.upper() if digits else None
 
 
+def _trigrams(s: str) -> set[str]:
+    return {s[i : i + 3] for i in range(len(s) - 2)}
+
+
+class _FixtureIndex:
+    """Lookup structures built once per fixture load.
+
+    ISBNs and provider ids go into hash maps. Normalized titles and authors get a
+    trigram inverted index, so a substring query only has to verify the items in
+    its rarest trigram's posting list instead of the whole catalog.
+    """
+
+    def __init__(self, items: list[dict]):
+        self.titles: list[str] = []
+        self.authors: list[str] = []
+        self.by_isbn13: dict[str, list[int]] = {}
+        self.by_isbn10: dict[str, list[int]] = {}
+        self.by_provider_item_id: dict[str, list[int]] = {}
+        self.title_grams: dict[str, list[int]] = {}
+        self.author_grams: dict[str, list[int]] = {}
+
+        for pos, it in enumerate(items):
+            t = _norm(it.get("title", ""))
+            a = _norm(it.get("author", ""))
+            self.titles.append(t)
+            self.authors.append(a)
+
+            isbn13 = _norm_isbn(it.get("isbn13"))
+            if isbn13:
+                self.by_isbn13.setdefault(isbn13, []).append(pos)
+            isbn10 = _norm_isbn(it.get("isbn10"))
+            if isbn10:
+                self.by_isbn10.setdefault(isbn10, []).append(pos)
+            pid = it.get("provider_item_id")
+            if pid is not None:
+                self.by_provider_item_id.setdefault(pid, []).append(pos)
+
+            for g in _trigrams(t):
+                self.title_grams.setdefault(g, []).append(pos)
+            for g in _trigrams(a):
+                self.author_grams.setdefault(g, []).append(pos)
+
+    def text_hits(self, *, q_title: str, q_author: str, limit: int) -> list[int]:
+        """Positions passing the substring filter, in catalog order.
+
+        Mirrors the linear scan: a title query wins over an author query, and an
+        empty query matches everything. Stops after `limit` hits.
+        """
+        if q_title:
+            return self._substring_hits(self.titles, self.title_grams, q_title, limit)
+        if q_author:
+            return self._substring_hits(
+                self.authors, self.author_grams, q_author, limit
+            )
+        return list(range(min(limit, len(self.titles))))
+
+    @staticmethod
+    def _substring_hits(
+        values: list[str], grams: dict[str, list[int]], q: str, limit: int
+    ) -> list[int]:
+        if len(q) < 3:
+            # Too short for trigrams; scan the pre-normalized values.
+            out: list[int] = []
+            for pos, v in enumerate(values):
+                if q in v:
+                    out.append(pos)
+                    if len(out) >= limit:
+                        break
+            return out
+
+        postings: list[int] | None = None
+        for g in _trigrams(q):
+            p = grams.get(g)
+            if not p:
+                return []
+            if postings is None or len(p) < len(postings):
+                postings = p
+
+        # Every substring match contains all query trigrams, so the rarest posting
+        # list is a superset of the answer; verify each candidate exactly.
+        out = []
+        for pos in postings or []:
+            if q in values[pos]:
+                out.append(pos)
+                if len(out) >= limit:
+                    break
+        return out
+
+
 class FixtureProvider:
     name = "fixture"
 
     def __init__(self, fixture_path: str):
         self.fixture_path = fixture_path
         self._data = self._load()
+        self._items: list[dict] = self._data.get("items", [])
+        self._index = _FixtureIndex(self._items)
 
     def _load(self) -> dict:
         p = Path(self.fixture_path)
@@ -49,14 +140,40 @@ class FixtureProvider:
         isbn13: str | None,
         limit: int = 10,
     ) -> list[ProviderBook]:
-        items: list[dict] = self._data.get("items", [])
+        q_title = _norm(title or "")
+        q_author = _norm(author or "")
+        q_isbn10 = _norm_isbn(isbn10)
+        q_isbn13 = _norm_isbn(isbn13)
+
+        # ISBN hits bypass the text filter; merge both in catalog order.
+        hits: set[int] = set()
+        if q_isbn13:
+            hits.update(self._index.by_isbn13.get(q_isbn13, []))
+        if q_isbn10:
+            hits.update(self._index.by_isbn10.get(q_isbn10, []))
+        hits.update(
+            self._index.text_hits(q_title=q_title, q_author=q_author, limit=limit)
+        )
+
+        return [self._to_book(self._items[pos]) for pos in sorted(hits)[:limit]]
+
+    def _search_scan(
+        self,
+        *,
+        title: str | None,
+        author: str | None,
+        isbn10: str | None,
+        isbn13: str | None,
+        limit: int = 10,
+    ) -> list[ProviderBook]:
+        """Unindexed reference implementation, kept for parity tests and benchmarks."""
         q_title = _norm(title or "")
         q_author = _norm(author or "")
         q_isbn10 = _norm_isbn(isbn10)
         q_isbn13 = _norm_isbn(isbn13)
 
         out: list[ProviderBook] = []
-        for it in items:
+        for it in self._items:
             it_isbn13 = _norm_isbn(it.get("isbn13"))
             it_isbn10 = _norm_isbn(it.get("isbn10"))
 
@@ -88,12 +205,13 @@ class FixtureProvider:
     async def availability_bulk(
         self, *, provider_item_ids: list[str]
     ) -> list[ProviderAvailability]:
-        wanted = set(provider_item_ids)
-        out: list[ProviderAvailability] = []
+        positions: set[int] = set()
+        for pid in set(provider_item_ids):
+            positions.update(self._index.by_provider_item_id.get(pid, []))
 
-        for it in self._data.get("items", []):
-            if it.get("provider_item_id") not in wanted:
-                continue
+        out: list[ProviderAvailability] = []
+        for pos in sorted(positions):
+            it = self._items[pos]
             formats: dict = it.get("formats", {})
             for fmt_key, payload in formats.items():
                 out.append(
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import cast
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+_STATS_KEY = "dashcache:stats"
+
+
+@dataclass(frozen=True)
+class DashboardCacheStats:
+    hits: int
+    misses: int
+    not_modified: int
+
+    @property
+    def hit_ratio(self) -> float | None:
+        """Share of requests answered without rebuilding the page (304s included)."""
+        total = self.hits + self.misses + self.not_modified
+        if total == 0:
+            return None
+        return (self.hits + self.not_modified) / total
+
+
+def page_cache_key(
+    *,
+    user_id: str,
+    version: int,
+    sort: str,
+    cursor: str | None,
+    limit: int,
+    offset: int,
+    filters: str = "",
+) -> str:
+    return f"dash:{user_id}:{version}:{sort}:{limit}:{offset}:{cursor or ''}:{filters}"
+
+
+def summary_cache_key(*, user_id: str, version: int) -> str:
+    return f"dash:{user_id}:{version}:summary"
+
+
+def etag_for(key: str) -> str:
+    """Strong ETag: a page is immutable for a given (user, version, params)."""
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest() + '"'
+
+
+def get_cached_page(key: str) -> str | None:
+    r = get_redis()
+    if r is None:
+        return None
+    try:
+        body = cast(str | None, r.get(key))
+    except Exception:
+        return None
+    record("hits" if body is not None else "misses")
+    return body
+
+
+def store_page(key: str, body: str) -> None:
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        r.setex(key, settings.dashboard_cache_ttl_secs, body)
+    except Exception:
+        return
+
+
+def record(outcome: str) -> None:
+    """Count a cache outcome: hits | misses | not_modified (best effort)."""
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        r.hincrby(_STATS_KEY, outcome, 1)
+    except Exception:
+        return
+
+
+def cache_stats() -> DashboardCacheStats:
+    r = get_redis()
+    raw: dict = {}
+    if r is not None:
+        try:
+            raw = r.hgetall(_STATS_KEY) or {}
+        except Exception:
+            raw = {}
+    return DashboardCacheStats(
+        hits=int(raw.get("hits", 0)),
+        misses=int(raw.get("misses", 0)),
+        not_modified=int(raw.get("not_modified", 0)),
+    )
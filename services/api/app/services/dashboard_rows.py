@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Sequence, cast
+
+from app.core.config import settings
+from app.crud.data_version import next_data_version
+from app.crud.library_system import library_system_expr, library_system_for_user
+from app.models.catalog_item import CatalogItem
+from app.models.catalog_match import CatalogMatch
+from app.models.dashboard_row import DashboardRow
+from app.models.dashboard_row_format import DashboardRowFormat
+from app.models.dashboard_tombstone import DashboardTombstone
+from app.models.library_availability import LibraryAvailability
+from app.models.shelf_item import ShelfItem
+from app.models.user import User
+from app.models.user_settings import UserSettings
+from app.services.read_next_batch import AvailabilityColumns, compute_read_next_batch
+from sqlalchemy import and_, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# Shelf items written per round (bounds the IN lists).
+_CHUNK = 500
+
+# Availability statuses under which a row counts as carried in that format.
+_CARRIED = ("available", "hold")
+
+
+def refresh_dashboard_rows(
+    db: Session, *, user_id: str, shelf_item_ids: Iterable[str] | None = None
+) -> int:
+    """Recompute the dashboard read model for some or all of a user's items.
+
+    With `shelf_item_ids=None` every item is rebuilt and rows for items no longer
+    on the shelf are dropped. Flushes pending changes first so the rows reflect
+    them and bumps the user's data version; rows whose content changed (and
+    tombstones of dropped ones) are stamped with the new version as their
+    change_seq. The caller commits. Returns the number of rows written.
+    """
+    db.flush()
+    user_settings = db.get(UserSettings, user_id)
+    preferred = list(user_settings.preferred_formats or []) if user_settings else []
+    library_system = library_system_for_user(db, user_id)
+
+    if shelf_item_ids is None:
+        seq = next_data_version(db, user_id)
+        orphans = (
+            db.execute(
+                select(DashboardRow.shelf_item_id)
+                .where(DashboardRow.user_id == user_id)
+                .where(
+                    DashboardRow.shelf_item_id.not_in(
+                        select(ShelfItem.id).where(ShelfItem.user_id == user_id)
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+        _remove_rows(db, user_id=user_id, shelf_item_ids=orphans, change_seq=seq)
+        items = load_dashboard_items(db, user_id=user_id, library_system=library_system)
+        ids = list(items)
+        for i in range(0, len(ids), _CHUNK):
+            _write_rows(db, user_id, items, ids[i : i + _CHUNK], preferred, seq)
+        db.flush()
+        return len(ids)
+
+    ids = list(dict.fromkeys(shelf_item_ids))
+    if not ids:
+        return 0
+    seq = next_data_version(db, user_id)
+    written = 0
+    for i in range(0, len(ids), _CHUNK):
+        chunk = ids[i : i + _CHUNK]
+        items = load_dashboard_items(
+            db, user_id=user_id, library_system=library_system, shelf_item_ids=chunk
+        )
+        written += _write_rows(db, user_id, items, chunk, preferred, seq)
+    db.flush()
+    return written
+
+
+def remove_source_rows(db: Session, *, user_id: str, shelf_source_id: str) -> None:
+    """Drop (and tombstone) the rows of a source's items; bumps the data version.
+
+    Call before deleting the source: its items go with it, and SQLite does not
+    enforce the rows' FK cascade.
+    """
+    seq = next_data_version(db, user_id)
+    ids = (
+        db.execute(
+            select(DashboardRow.shelf_item_id).where(
+                DashboardRow.user_id == user_id,
+                DashboardRow.shelf_source_id == shelf_source_id,
+            )
+        )
+        .scalars()
+        .all()
+    )
+    _remove_rows(db, user_id=user_id, shelf_item_ids=ids, change_seq=seq)
+
+
+def refresh_dashboard_rows_for_catalog(
+    db: Session, *, library_system: str, catalog_item_ids: Sequence[str]
+) -> int:
+    """Recompute rows of every user in `library_system` matched to these items."""
+    if not catalog_item_ids:
+        return 0
+    db.flush()
+    pairs = db.execute(
+        select(CatalogMatch.user_id, CatalogMatch.shelf_item_id)
+        .outerjoin(UserSettings, UserSettings.user_id == CatalogMatch.user_id)
+        .where(library_system_expr() == library_system)
+        .where(CatalogMatch.catalog_item_id.in_(list(set(catalog_item_ids))))
+    ).all()
+
+    by_user: dict[str, list[str]] = {}
+    for user_id, shelf_item_id in pairs:
+        by_user.setdefault(user_id, []).append(shelf_item_id)
+
+    return sum(
+        refresh_dashboard_rows(db, user_id=user_id, shelf_item_ids=ids)
+        for user_id, ids in by_user.items()
+    )
+
+
+def ensure_dashboard_rows(db: Session, *, user_id: str) -> bool:
+    """Build the read model for a user who has shelf items but no rows yet.
+
+    Covers users whose shelves predate the read model. Returns True (and
+    commits) when rows were built.
+    """
+    has_rows = db.execute(
+        select(DashboardRow.shelf_item_id)
+        .where(DashboardRow.user_id == user_id)
+        .limit(1)
+    ).first()
+    if has_rows is not None:
+        return False
+    has_items = db.execute(
+        select(ShelfItem.id).where(ShelfItem.user_id == user_id).limit(1)
+    ).first()
+    if has_items is None:
+        return False
+    refresh_dashboard_rows(db, user_id=user_id)
+    db.commit()
+    return True
+
+
+def load_dashboard_items(
+    db: Session,
+    *,
+    user_id: str,
+    library_system: str,
+    shelf_item_ids: Sequence[str] | None = None,
+) -> dict[str, dict]:
+    """Row values (all but the read-next fields) per shelf item id.
+
+    One LEFT JOIN over shelf item -> match -> catalog item -> the library's
+    availability, projecting only the rendered columns (never CatalogItem.raw)
+    and reading plain tuples rather than ORM entities.
+    """
+    stmt = (
+        select(
+            ShelfItem.id,
+            ShelfItem.shelf_source_id,
+            ShelfItem.title,
+            ShelfItem.author,
+            ShelfItem.shelf,
+            ShelfItem.needs_fuzzy_match,
+            ShelfItem.updated_at,
+            CatalogMatch.provider,
+            CatalogMatch.method,
+            CatalogMatch.confidence,
+            CatalogItem.id,
+            CatalogItem.provider_item_id,
+            LibraryAvailability.format,
+            LibraryAvailability.status,
+            LibraryAvailability.copies_available,
+            LibraryAvailability.copies_total,
+            LibraryAvailability.holds,
+            LibraryAvailability.deep_link,
+            LibraryAvailability.last_checked_at,
+        )
+        .select_from(ShelfItem)
+        .outerjoin(
+            CatalogMatch,
+            and_(
+                CatalogMatch.shelf_item_id == ShelfItem.id,
+                CatalogMatch.user_id == user_id,
+            ),
+        )
+        .outerjoin(CatalogItem, CatalogItem.id == CatalogMatch.catalog_item_id)
+        .outerjoin(
+            LibraryAvailability,
+            and_(
+                LibraryAvailability.catalog_item_id == CatalogItem.id,
+                LibraryAvailability.library_system == library_system,
+            ),
+        )
+        .where(ShelfItem.user_id == user_id)
+        .order_by(ShelfItem.id, LibraryAvailability.format)
+    )
+    if shelf_item_ids is not None:
+        stmt = stmt.where(ShelfItem.id.in_(list(shelf_item_ids)))
+
+    items: dict[str, dict] = {}
+    for (
+        shelf_item_id,
+        shelf_source_id,
+        title,
+        author,
+        shelf,
+        needs_fuzzy_match,
+        updated_at,
+        provider,
+        method,
+        confidence,
+        catalog_item_id,
+        provider_item_id,
+        fmt,
+        status,
+        copies_available,
+        copies_total,
+        holds,
+        deep_link,
+        last_checked_at,
+    ) in cast(Sequence[tuple[Any, ...]], db.execute(stmt).all()):
+        values = items.get(shelf_item_id)
+        if values is None:
+            values = items[shelf_item_id] = {
+                "shelf_source_id": shelf_source_id,
+                "title": title,
+                "title_key": (title or "").lower(),
+                "author": author,
+                "shelf": shelf,
+                "needs_fuzzy_match": needs_fuzzy_match,
+                "match": (
+                    {
+                        "catalog_item_id": catalog_item_id,
+                        "provider": provider,
+                        "provider_item_id": provider_item_id,
+                        "method": method,
+                        "confidence": confidence,
+                    }
+                    if catalog_item_id is not None
+                    else None
+                ),
+                "matched": catalog_item_id is not None,
+                "availability": [],
+                "item_updated_at": updated_at,
+            }
+        if fmt is not None:
+            values["availability"].append(
+                {
+                    "format": fmt,
+                    "status": status,
+                    "copies_available": copies_available,
+                    "copies_total": copies_total,
+                    "holds": holds,
+                    "deep_link": deep_link,
+                    "last_checked_at": last_checked_at.isoformat(),
+                }
+            )
+    return items
+
+
+def _write_rows(
+    db: Session,
+    user_id: str,
+    items: dict[str, dict],
+    shelf_item_ids: list[str],
+    preferred_formats: list[str],
+    change_seq: int,
+) -> int:
+    """Upsert rows for `shelf_item_ids` from `items`; ids missing there are deleted.
+
+    Only rows whose values changed get `change_seq`.
+    """
+    existing = {
+        r.shelf_item_id: r
+        for r in db.execute(
+            select(DashboardRow).where(DashboardRow.shelf_item_id.in_(shelf_item_ids))
+        ).scalars()
+    }
+    present = [sid for sid in shelf_item_ids if sid in items]
+    scores = compute_read_next_batch(
+        AvailabilityColumns.from_rows([items[sid]["availability"] for sid in present]),
+        preferred_formats,
+    )
+
+    changed: dict[str, list[dict]] = {}
+    for i, sid in enumerate(present):
+        values = {
+            **items[sid],
+            "read_next_score": float(scores.score[i]),
+            "read_next_tier": scores.tier(i),
+            "best_format": scores.best_format(i),
+            "hold_ratio": scores.hold_ratio_at(i),
+        }
+        row = existing.pop(sid, None)
+        if row is None:
+            db.add(
+                DashboardRow(
+                    shelf_item_id=sid, user_id=user_id, change_seq=change_seq, **values
+                )
+            )
+        elif any(getattr(row, k) != v for k, v in values.items()):
+            for key, value in values.items():
+                setattr(row, key, value)
+            row.change_seq = change_seq
+        else:
+            continue
+        changed[sid] = values["availability"]
+    _write_formats(db, changed)
+
+    # Rows whose shelf item is gone
+    _remove_rows(
+        db, user_id=user_id, shelf_item_ids=list(existing), change_seq=change_seq
+    )
+
+    return len(present)
+
+
+def _write_formats(db: Session, availability: dict[str, list[dict]]) -> None:
+    """Replace the DashboardRowFormat rows of these shelf items."""
+    if not availability:
+        return
+    db.execute(
+        delete(DashboardRowFormat).where(
+            DashboardRowFormat.shelf_item_id.in_(list(availability))
+        )
+    )
+    rows = [
+        {"shelf_item_id": sid, "format": a["format"], "status": a["status"]}
+        for sid, entries in availability.items()
+        for a in entries
+        if a["status"] in _CARRIED
+    ]
+    if rows:
+        db.execute(insert(DashboardRowFormat), rows)
+
+
+def _remove_rows(
+    db: Session, *, user_id: str, shelf_item_ids: Sequence[str], change_seq: int
+) -> None:
+    if not shelf_item_ids:
+        return
+    now = datetime.now(timezone.utc)
+    for i in range(0, len(shelf_item_ids), _CHUNK):
+        chunk = list(shelf_item_ids[i : i + _CHUNK])
+        db.execute(delete(DashboardRow).where(DashboardRow.shelf_item_id.in_(chunk)))
+        db.execute(
+            delete(DashboardRowFormat).where(
+                DashboardRowFormat.shelf_item_id.in_(chunk)
+            )
+        )
+        _upsert_tombstones(
+            db,
+            [
+                {
+                    "user_id": user_id,
+                    "shelf_item_id": sid,
+                    "change_seq": change_seq,
+                    "deleted_at": now,
+                }
+                for sid in chunk
+            ],
+        )
+    _prune_tombstones(db, user_id=user_id, now=now)
+
+
+def _upsert_tombstones(db: Session, rows: list[dict]) -> None:
+    """INSERT ... ON CONFLICT DO UPDATE, one statement per call; ORM merge elsewhere."""
+    dialect = db.get_bind().dialect
+    upsert: Any
+    if dialect.name == "postgresql":
+        upsert = postgresql.insert
+    elif dialect.name == "sqlite":
+        upsert = sqlite.insert
+    else:
+        for row in rows:
+            db.merge(DashboardTombstone(**row))
+        return
+    stmt = upsert(DashboardTombstone).values(rows)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id", "shelf_item_id"],
+            set_={
+                "change_seq": stmt.excluded.change_seq,
+                "deleted_at": stmt.excluded.deleted_at,
+            },
+        )
+    )
+
+
+def _prune_tombstones(db: Session, *, user_id: str, now: datetime) -> None:
+    """Drop tombstones past the retention horizon and raise the user's floor.
+
+    Delta syncs from before the floor could miss a pruned deletion, so
+    /v1/dashboard/changes rejects them (410) and the client refetches.
+    """
+    cutoff = now - timedelta(seconds=settings.dashboard_tombstone_retention_secs)
+    expired = (
+        DashboardTombstone.user_id == user_id,
+        DashboardTombstone.deleted_at < cutoff,
+    )
+    floor = db.execute(
+        select(func.max(DashboardTombstone.change_seq)).where(*expired)
+    ).scalar_one_or_none()
+    if floor is None:
+        return
+    db.execute(delete(DashboardTombstone).where(*expired))
+    db.execute(
+        update(User)
+        .where(User.id == user_id, User.changes_floor < floor)
+        .values(changes_floor=floor)
+        .execution_options(synchronize_session="fetch")
+    )
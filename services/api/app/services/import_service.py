@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from app.domain.normalize import build_normalized
+from app.domain.normalize import build_normalized, content_fingerprint
 from app.models.shelf_item import ShelfItem
+from app.services.dashboard_rows import refresh_dashboard_rows
 from sqlalchemy.orm import Session
 
 
@@ -44,6 +45,7 @@ def upsert_shelf_items(
         existing_by_ext = {it.external_id: it for it in existing if it.external_id}
 
     created = updated = skipped = 0
+    touched: list[ShelfItem] = []
 
     for it in items:
         title = (it.get("title") or "").strip()
@@ -79,6 +81,14 @@ def upsert_shelf_items(
             asin=asin,
         )
 
+        fingerprint = content_fingerprint(
+            title=title,
+            author=author,
+            isbn13=norm.isbn13,
+            isbn10=norm.isbn10,
+            asin=norm.asin,
+        )
+
         existing_item = existing_by_ext.get(external_id) if external_id else None
         if existing_item:
             # Update key fields (keep this conservative).
@@ -90,9 +100,12 @@ def upsert_shelf_items(
             existing_item.normalized_title = norm.normalized_title
             existing_item.normalized_author = norm.normalized_author
             existing_item.needs_fuzzy_match = norm.needs_fuzzy_match
+            existing_item.content_fingerprint = fingerprint
             existing_item.shelf_source_id = shelf_source_id
             existing_item.external_id = external_id
             existing_item.shelf = it.get("shelf")
+            if db.is_modified(existing_item):
+                touched.append(existing_item)
 
             updated += 1
             continue
@@ -110,12 +123,17 @@ def upsert_shelf_items(
             normalized_author=norm.normalized_author,
             shelf=it.get("shelf"),
             needs_fuzzy_match=norm.needs_fuzzy_match,
+            content_fingerprint=fingerprint,
         )
         db.add(new_item)
+        touched.append(new_item)
         if external_id:
             existing_by_ext[external_id] = new_item
         created += 1
 
+    db.flush()
+    refresh_dashboard_rows(db, user_id=user_id, shelf_item_ids=[i.id for i in touched])
+
     return ImportSummary(
         created=created, updated=updated, skipped=skipped, errors=errors_out
     )
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Iterator, Sequence, cast
+
+from app.crud.availability import NotificationCreated, upsert_library_availability
+from app.crud.library_system import library_system_expr
+from app.models.catalog_item import CatalogItem
+from app.models.catalog_match import CatalogMatch
+from app.models.user import User
+from app.models.user_settings import UserSettings
+from app.providers.types import AvailabilityResult
+from app.services.availability_cache import CacheStats, refresh_availability
+from app.services.catalog.provider import CatalogProvider
+from app.services.catalog.types import Format
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RefreshTarget:
+    library_system: str
+    catalog_item_id: str
+    provider_item_id: str
+
+
+@dataclass
+class LibraryRefreshStats:
+    libraries: int = 0
+    items: int = 0
+    provider_calls: int = 0
+    rows_written: int = 0
+    notifications: int = 0
+
+
+def iter_refresh_targets(
+    db: Session, *, provider: str
+) -> Iterator[list[RefreshTarget]]:
+    """Yield the distinct (library_system, provider item) set, one list per library.
+
+    Only catalog items matched by at least one active user are included, so the
+    work per cycle is bounded by the catalog actually in use rather than by
+    users x shelf size.
+    """
+    lib = library_system_expr()
+    stmt = (
+        select(lib, CatalogItem.id, CatalogItem.provider_item_id)
+        .select_from(CatalogMatch)
+        .join(CatalogItem, CatalogItem.id == CatalogMatch.catalog_item_id)
+        .join(User, User.id == CatalogMatch.user_id)
+        .outerjoin(UserSettings, UserSettings.user_id == CatalogMatch.user_id)
+        .where(User.is_active.is_(True))
+        .where(CatalogItem.provider == provider)
+        .distinct()
+        .order_by(lib, CatalogItem.provider_item_id)
+    )
+
+    # Materialized up front: callers commit between batches.
+    rows = cast(Sequence[tuple[str, str, str]], db.execute(stmt).all())
+
+    current: list[RefreshTarget] = []
+    for library_system, catalog_item_id, provider_item_id in rows:
+        if current and current[0].library_system != library_system:
+            yield current
+            current = []
+        current.append(
+            RefreshTarget(
+                library_system=library_system,
+                catalog_item_id=catalog_item_id,
+                provider_item_id=provider_item_id,
+            )
+        )
+    if current:
+        yield current
+
+
+def refresh_library_availability(
+    db: Session,
+    provider: CatalogProvider,
+    *,
+    batch_size: int,
+    on_notifications: Callable[[list[NotificationCreated]], None] | None = None,
+) -> LibraryRefreshStats:
+    """Refresh every distinct matched item once and fan results out to users.
+
+    Each batch of distinct provider items costs one provider call (written
+    through to the Redis availability cache) and one write of the library's
+    shared availability rows, which also notifies every subscribed user.
+    Commits once per batch and hands new notifications to `on_notifications`
+    after the commit.
+    """
+    stats = LibraryRefreshStats()
+    cache_stats = CacheStats()
+    formats = [f.value for f in Format]
+    step = max(1, batch_size)
+
+    for targets in iter_refresh_targets(db, provider=provider.name):
+        library_system = targets[0].library_system
+        stats.libraries += 1
+
+        for i in range(0, len(targets), step):
+            batch = targets[i : i + step]
+            by_pid = {t.provider_item_id: t.catalog_item_id for t in batch}
+
+            fetched = refresh_availability(
+                library_system=library_system,
+                provider_item_ids=list(by_pid),
+                formats=formats,
+                provider=provider,
+                stats=cache_stats,
+            )
+            results = [
+                AvailabilityResult(
+                    catalog_item_id=by_pid[pid], availability=entry.availability
+                )
+                for (pid, _), entry in sorted(fetched.items())
+                if pid in by_pid
+            ]
+            created = upsert_library_availability(
+                db, library_system=library_system, results=results
+            )
+            db.commit()
+
+            stats.items += len(batch)
+            stats.rows_written += len(results)
+            stats.notifications += len(created)
+            if on_notifications is not None and created:
+                on_notifications(created)
+
+    stats.provider_calls = cache_stats.provider_calls
+    logger.info(
+        "library availability refresh finished",
+        extra={
+            "libraries": stats.libraries,
+            "items": stats.items,
+            "provider_calls": stats.provider_calls,
+            "rows_written": stats.rows_written,
+            "notifications": stats.notifications,
+        },
+    )
+    return stats
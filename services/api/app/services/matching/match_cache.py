@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Sequence, cast
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.domain.normalize import build_normalized
+from app.models.catalog_item import CatalogItem
+from app.models.match_cache import MatchCacheEntry
+from app.models.shelf_item import ShelfItem
+from app.services.catalog.types import ProviderBook
+from app.services.matching.matcher import MatchResult
+from app.services.matching.persist import MatchCacheUpsert, bulk_upsert_match_cache
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Keeps the IN (...) list well under bind parameter limits.
+_LOOKUP_CHUNK = 500
+
+
+@dataclass(frozen=True)
+class CachedMatch:
+    catalog_item_id: str
+    result: MatchResult
+
+
+def match_key(item: ShelfItem) -> str:
+    """Identity shared by every user's copy of the same book."""
+    return build_normalized(
+        title=item.title,
+        author=item.author,
+        isbn13=item.isbn13,
+        isbn10=item.isbn10,
+        asin=item.asin,
+    ).normalized_key
+
+
+def _cache_key(provider: str, key: str) -> str:
+    return f"matchcache:{provider}:{key}"
+
+
+def _dump(entry: CachedMatch) -> str:
+    return json.dumps(
+        {
+            "catalog_item_id": entry.catalog_item_id,
+            "book": entry.result.book.model_dump(mode="json"),
+            "method": entry.result.method,
+            "confidence": entry.result.confidence,
+            "evidence": entry.result.evidence,
+        }
+    )
+
+
+def _load(raw: str) -> CachedMatch:
+    payload = json.loads(raw)
+    return CachedMatch(
+        catalog_item_id=payload["catalog_item_id"],
+        result=MatchResult(
+            book=ProviderBook.model_validate(payload["book"]),
+            method=payload["method"],
+            confidence=float(payload["confidence"]),
+            evidence=payload["evidence"],
+        ),
+    )
+
+
+def lookup_matches(
+    db: Session, *, provider: str, keys: Iterable[str]
+) -> dict[str, CachedMatch]:
+    """Return cached match results for the given normalized keys.
+
+    Behavior:
+    - Reads from Redis first.
+    - Falls back to the match_cache table for Redis misses (entries older than
+      MATCH_CACHE_TTL_SECS are ignored) and writes DB hits back to Redis.
+    - Keys with no cached result are simply absent from the returned map.
+    """
+    wanted = sorted(set(keys))
+    if not wanted:
+        return {}
+
+    r = get_redis()
+    ttl = int(settings.match_cache_ttl_secs)
+    out: dict[str, CachedMatch] = {}
+
+    # 1) Redis
+    if r is not None:
+        try:
+            values = r.mget([_cache_key(provider, k) for k in wanted])
+        except Exception:
+            logger.warning("match cache read failed; falling back to DB")
+            values = [None] * len(wanted)
+        for k, raw in zip(wanted, values):
+            if not raw:
+                continue
+            try:
+                out[k] = _load(cast(str, raw))
+            except Exception:
+                continue
+
+    # 2) Table
+    missing = [k for k in wanted if k not in out]
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=ttl)
+    found: dict[str, CachedMatch] = {}
+    for i in range(0, len(missing), _LOOKUP_CHUNK):
+        rows = db.execute(
+            select(MatchCacheEntry, CatalogItem)
+            .join(CatalogItem, CatalogItem.id == MatchCacheEntry.catalog_item_id)
+            .where(MatchCacheEntry.provider == provider)
+            .where(MatchCacheEntry.normalized_key.in_(missing[i : i + _LOOKUP_CHUNK]))
+            .where(MatchCacheEntry.updated_at >= cutoff)
+        ).all()
+        for entry, ci in rows:
+            found[entry.normalized_key] = CachedMatch(
+                catalog_item_id=ci.id,
+                result=MatchResult(
+                    book=ProviderBook(
+                        provider=ci.provider,
+                        provider_item_id=ci.provider_item_id,
+                        title=ci.title,
+                        author=ci.author,
+                        isbn10=ci.isbn10,
+                        isbn13=ci.isbn13,
+                        asin=ci.asin,
+                        raw=ci.raw or {},
+                    ),
+                    method=entry.method,
+                    confidence=entry.confidence,
+                    evidence=entry.evidence,
+                ),
+            )
+
+    if found:
+        out.update(found)
+        _write_redis(provider, found)
+
+    return out
+
+
+def remember_matches(
+    db: Session, *, provider: str, entries: Sequence[tuple[str, CachedMatch]]
+) -> None:
+    """Store fresh match results under their normalized keys.
+
+    Only the table is written, as part of the caller's transaction. Call
+    `warm_matches` once it is committed so Redis never points at rows that
+    were rolled back.
+    """
+    if not entries:
+        return
+
+    bulk_upsert_match_cache(
+        db,
+        [
+            MatchCacheUpsert(
+                provider=provider,
+                normalized_key=key,
+                catalog_item_id=entry.catalog_item_id,
+                method=entry.result.method,
+                confidence=entry.result.confidence,
+                evidence=entry.result.evidence,
+            )
+            for key, entry in entries
+        ],
+    )
+
+
+def warm_matches(*, provider: str, entries: Sequence[tuple[str, CachedMatch]]) -> None:
+    """Mirror committed cache entries into Redis (best effort)."""
+    if entries:
+        _write_redis(provider, dict(entries))
+
+
+def _write_redis(provider: str, entries: dict[str, CachedMatch]) -> None:
+    r = get_redis()
+    if r is None:
+        return
+    ttl = int(settings.match_cache_ttl_secs)
+    try:
+        pipe = r.pipeline()
+        for k, entry in entries.items():
+            pipe.setex(_cache_key(provider, k), ttl, _dump(entry))
+        pipe.execute()
+    except Exception:
+        logger.warning("match cache write failed", exc_info=True)
@@ -1,25 +1,17 @@
 from __future__ import annotations
 
-import re
 from dataclasses import dataclass
-from difflib import SequenceMatcher
+from typing import Sequence
 
 from app.models.shelf_item import ShelfItem
 from app.services.catalog.provider import CatalogProvider
 from app.services.catalog.types import ProviderBook
-
-
-def _norm_text(s: str) -> str:
-    s = s.lower().strip()
-    s = re.sub(r"[^a-z0-9\s]", " ", s)
-    s = re.sub(r"\s+", " ", s)
-    return s
-
-
-def _ratio(a: str, b: str) -> float:
-    if not a or not b:
-        return 0.0
-    return SequenceMatcher(None, a, b).ratio()
+from app.services.matching.scoring import (
+    MATCH_THRESHOLD,
+    BatchScores,
+    norm_text,
+    score_batch,
+)
 
 
 @dataclass(frozen=True)
@@ -33,7 +25,6 @@ class MatchResult:
 async def match_shelf_item(
     provider: CatalogProvider, item: ShelfItem, *, limit: int = 10
 ) -> MatchResult | None:
-    # 1) ISBN exact
     candidates = await provider.search(
         title=item.title,
         author=item.author,
@@ -41,7 +32,42 @@ async def match_shelf_item(
         isbn13=item.isbn13,
         limit=limit,
     )
+    return resolve_matches([item], [candidates])[0]
+
+
+def resolve_matches(
+    items: Sequence[ShelfItem], candidates: Sequence[Sequence[ProviderBook]]
+) -> list[MatchResult | None]:
+    """Pick the best candidate for each shelf item.
+
+    ISBN-exact candidates win outright; everything else is fuzzy-scored in a
+    single batch.
+    """
+    out: list[MatchResult | None] = [None] * len(items)
+    fuzzy: list[int] = []
+
+    # 1) ISBN exact
+    for i, (item, cands) in enumerate(zip(items, candidates)):
+        res = _isbn_match(item, cands)
+        if res is not None:
+            out[i] = res
+        else:
+            fuzzy.append(i)
+
+    # 2) Fuzzy (title + author)
+    scores = score_batch(
+        [(items[i].title, items[i].author) for i in fuzzy],
+        [candidates[i] for i in fuzzy],
+    )
+    for j, i in enumerate(fuzzy):
+        out[i] = _fuzzy_match(items[i], candidates[i], scores, j)
+
+    return out
+
 
+def _isbn_match(
+    item: ShelfItem, candidates: Sequence[ProviderBook]
+) -> MatchResult | None:
     if item.isbn13:
         for c in candidates:
             if c.isbn13 and c.isbn13.replace("-", "") == item.isbn13.replace("-", ""):
@@ -62,33 +88,32 @@ async def match_shelf_item(
                     evidence={"reason": "isbn10 exact", "candidates": [c.model_dump()]},
                 )
 
-    # 2) Fuzzy (title + author)
-    t = _norm_text(item.title or "")
-    a = _norm_text(item.author or "")
-
-    scored: list[tuple[float, float, ProviderBook]] = []
-    for c in candidates:
-        ct = _norm_text(c.title or "")
-        ca = _norm_text(c.author or "")
-        title_score = _ratio(t, ct)
-        author_score = _ratio(a, ca) if a and ca else 0.5
-        combined = 0.75 * title_score + 0.25 * author_score
-        scored.append((combined, title_score, c))
-
-    if not scored:
+    return None
+
+
+def _fuzzy_match(
+    item: ShelfItem,
+    candidates: Sequence[ProviderBook],
+    scores: BatchScores,
+    j: int,
+) -> MatchResult | None:
+    if not candidates:
         return None
 
-    scored.sort(key=lambda x: (x[0], x[1]), reverse=True)
-    best_combined, best_title, best = scored[0]
+    lo = int(scores.offsets[j])
+    ranked = [
+        (float(scores.combined[lo + k]), float(scores.title[lo + k]), candidates[k])
+        for k in scores.ranked(j)[:5]
+    ]
+    best_combined, best_title, best = ranked[0]
 
-    # Threshold: tune later; keep conservative to avoid false positives
-    if best_combined < 0.72:
+    if best_combined < MATCH_THRESHOLD:
         return None
 
     evidence = {
-        "threshold": 0.72,
-        "title_norm": t,
-        "author_norm": a,
+        "threshold": MATCH_THRESHOLD,
+        "title_norm": norm_text(item.title or ""),
+        "author_norm": norm_text(item.author or ""),
         "best": {
             "combined": best_combined,
             "title_score": best_title,
@@ -100,10 +125,10 @@ async def match_shelf_item(
                 "title_score": s[1],
                 "book": s[2].model_dump(),
             }
-            for s in scored[:5]
+            for s in ranked
         ],
     }
 
     return MatchResult(
-        book=best, method="fuzzy", confidence=float(best_combined), evidence=evidence
+        book=best, method="fuzzy", confidence=best_combined, evidence=evidence
     )
@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Any, Iterable, Sequence
+from uuid import uuid4
 
-from app.models.availability_snapshot import AvailabilitySnapshot
 from app.models.catalog_item import CatalogItem
 from app.models.catalog_match import CatalogMatch
+from app.models.library_availability import LibraryAvailability
+from app.models.match_cache import MatchCacheEntry
+from app.models.shelf_item import ShelfItem
+from app.providers.types import AvailabilityResult
 from app.services.catalog.types import ProviderAvailability, ProviderBook
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
+# Keeps each multi-row INSERT well under Postgres' 65535 bind parameter limit.
+_BULK_CHUNK = 500
+
 
 def upsert_catalog_item(db: Session, book: ProviderBook) -> CatalogItem:
     existing = db.execute(
@@ -78,33 +88,32 @@ def upsert_match(
     return m
 
 
-def upsert_availability_snapshot(
+def upsert_library_availability_row(
     db: Session,
     *,
-    user_id: str,
+    library_system: str,
     catalog_item_id: str,
     a: ProviderAvailability,
-) -> AvailabilitySnapshot:
+    checked_at: datetime,
+) -> LibraryAvailability:
     existing = db.execute(
-        select(AvailabilitySnapshot)
-        .where(AvailabilitySnapshot.user_id == user_id)
-        .where(AvailabilitySnapshot.catalog_item_id == catalog_item_id)
-        .where(AvailabilitySnapshot.format == a.format.value)
+        select(LibraryAvailability)
+        .where(LibraryAvailability.library_system == library_system)
+        .where(LibraryAvailability.catalog_item_id == catalog_item_id)
+        .where(LibraryAvailability.format == a.format.value)
     ).scalar_one_or_none()
 
-    now = datetime.now(timezone.utc)
-
     if existing:
         existing.status = a.status.value
         existing.copies_available = a.copies_available
         existing.copies_total = a.copies_total
         existing.holds = a.holds
         existing.deep_link = a.deep_link
-        existing.last_checked_at = now
+        existing.last_checked_at = checked_at
         return existing
 
-    row = AvailabilitySnapshot(
-        user_id=user_id,
+    row = LibraryAvailability(
+        library_system=library_system,
         catalog_item_id=catalog_item_id,
         format=a.format.value,
         status=a.status.value,
@@ -112,7 +121,328 @@ def upsert_availability_snapshot(
         copies_total=a.copies_total,
         holds=a.holds,
         deep_link=a.deep_link,
-        last_checked_at=now,
+        last_checked_at=checked_at,
     )
     db.add(row)
     return row
+
+
+@dataclass(frozen=True)
+class MatchCacheUpsert:
+    provider: str
+    normalized_key: str
+    catalog_item_id: str
+    method: str
+    confidence: float
+    evidence: dict
+
+
+@dataclass(frozen=True)
+class MatchUpsert:
+    user_id: str
+    shelf_item_id: str
+    catalog_item_id: str
+    provider: str
+    method: str
+    confidence: float
+    evidence: dict
+
+
+def _upsert_returning_ids(
+    db: Session,
+    model: Any,
+    rows: Iterable[dict[str, Any]],
+    *,
+    conflict_cols: Sequence[str],
+    update_cols: Sequence[str],
+) -> dict[tuple[Any, ...], str] | None:
+    """INSERT ... ON CONFLICT DO UPDATE ... RETURNING id, one statement per chunk.
+
+    Rows sharing a conflict key are collapsed (last one wins), since Postgres
+    refuses to update the same row twice in one statement. Returns ids keyed by
+    the conflict columns, or None when the dialect has no native upsert.
+
+    Writes go straight to the table, so ORM objects already loaded in `db` are
+    not refreshed.
+    """
+    dialect = db.get_bind().dialect
+    insert: Any
+    if dialect.name == "postgresql":
+        insert = postgresql.insert
+    elif dialect.name == "sqlite" and dialect.insert_returning:
+        insert = sqlite.insert
+    else:
+        return None
+
+    by_key = {tuple(r[c] for c in conflict_cols): r for r in rows}
+    values = list(by_key.values())
+    table = model.__table__
+
+    out: dict[tuple[Any, ...], str] = {}
+    for i in range(0, len(values), _BULK_CHUNK):
+        stmt = insert(table).values(values[i : i + _BULK_CHUNK])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(conflict_cols),
+            set_={c: stmt.excluded[c] for c in update_cols},
+        ).returning(table.c.id, *(table.c[c] for c in conflict_cols))
+        for row in db.execute(stmt):
+            out[tuple(row[1:])] = row[0]
+    return out
+
+
+def bulk_upsert_catalog_items(
+    db: Session, books: Sequence[ProviderBook]
+) -> dict[tuple[str, str], str]:
+    """Upsert catalog items; returns ids keyed by (provider, provider_item_id)."""
+    if not books:
+        return {}
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": str(uuid4()),
+            "provider": b.provider,
+            "provider_item_id": b.provider_item_id,
+            "title": b.title,
+            "author": b.author,
+            "isbn10": b.isbn10,
+            "isbn13": b.isbn13,
+            "asin": b.asin,
+            "raw": b.raw,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for b in books
+    ]
+    ids = _upsert_returning_ids(
+        db,
+        CatalogItem,
+        rows,
+        conflict_cols=("provider", "provider_item_id"),
+        update_cols=(
+            "title",
+            "author",
+            "isbn10",
+            "isbn13",
+            "asin",
+            "raw",
+            "updated_at",
+        ),
+    )
+    if ids is not None:
+        return ids  # type: ignore[return-value]
+
+    items = {
+        (b.provider, b.provider_item_id): upsert_catalog_item(db, b) for b in books
+    }
+    db.flush()
+    return {k: ci.id for k, ci in items.items()}
+
+
+def bulk_upsert_matches(
+    db: Session, matches: Sequence[MatchUpsert]
+) -> dict[tuple[str, str], str]:
+    """Upsert catalog matches; returns ids keyed by (user_id, shelf_item_id)."""
+    if not matches:
+        return {}
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": str(uuid4()),
+            "user_id": m.user_id,
+            "shelf_item_id": m.shelf_item_id,
+            "catalog_item_id": m.catalog_item_id,
+            "provider": m.provider,
+            "method": m.method,
+            "confidence": m.confidence,
+            "evidence": m.evidence,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for m in matches
+    ]
+    ids = _upsert_returning_ids(
+        db,
+        CatalogMatch,
+        rows,
+        conflict_cols=("user_id", "shelf_item_id"),
+        update_cols=(
+            "catalog_item_id",
+            "provider",
+            "method",
+            "confidence",
+            "evidence",
+            "updated_at",
+        ),
+    )
+    if ids is not None:
+        return {(u, sid): i for (u, sid), i in ids.items()}
+
+    unique = {(m.user_id, m.shelf_item_id): m for m in matches}
+    out = {
+        k: upsert_match(
+            db,
+            user_id=m.user_id,
+            shelf_item_id=m.shelf_item_id,
+            catalog_item_id=m.catalog_item_id,
+            provider=m.provider,
+            method=m.method,
+            confidence=m.confidence,
+            evidence=m.evidence,
+        )
+        for k, m in unique.items()
+    }
+    db.flush()
+    return {k: row.id for k, row in out.items()}
+
+
+def record_match_attempts(
+    db: Session, attempts: Sequence[tuple[ShelfItem, str]]
+) -> None:
+    """Stamp each shelf item with the content fingerprint it was matched at.
+
+    Written for misses too, so an unmatched item is only retried once it
+    changes. `updated_at` is passed through so the stamp doesn't count as an
+    edit of the item.
+    """
+    if not attempts:
+        return
+    db.execute(
+        update(ShelfItem),
+        [
+            {
+                "id": item.id,
+                "match_attempt_fingerprint": fp,
+                "updated_at": item.updated_at,
+            }
+            for item, fp in attempts
+        ],
+    )
+
+
+def bulk_upsert_library_availability(
+    db: Session,
+    *,
+    library_system: str,
+    results: Sequence[AvailabilityResult],
+    checked_at: datetime,
+) -> dict[tuple[str, str], str]:
+    """Upsert shared availability rows.
+
+    Returns ids keyed by (catalog_item_id, format).
+    """
+    if not results:
+        return {}
+
+    rows = [
+        {
+            "id": str(uuid4()),
+            "library_system": library_system,
+            "catalog_item_id": r.catalog_item_id,
+            "format": r.availability.format.value,
+            "status": r.availability.status.value,
+            "copies_available": r.availability.copies_available,
+            "copies_total": r.availability.copies_total,
+            "holds": r.availability.holds,
+            "deep_link": r.availability.deep_link,
+            "last_checked_at": checked_at,
+        }
+        for r in results
+    ]
+    ids = _upsert_returning_ids(
+        db,
+        LibraryAvailability,
+        rows,
+        conflict_cols=("library_system", "catalog_item_id", "format"),
+        update_cols=(
+            "status",
+            "copies_available",
+            "copies_total",
+            "holds",
+            "deep_link",
+            "last_checked_at",
+        ),
+    )
+    if ids is not None:
+        return {(cid, fmt): i for (_, cid, fmt), i in ids.items()}
+
+    unique = {(r.catalog_item_id, r.availability.format.value): r for r in results}
+    out = {
+        k: upsert_library_availability_row(
+            db,
+            library_system=library_system,
+            catalog_item_id=r.catalog_item_id,
+            a=r.availability,
+            checked_at=checked_at,
+        )
+        for k, r in unique.items()
+    }
+    db.flush()
+    return {k: row.id for k, row in out.items()}
+
+
+def bulk_upsert_match_cache(db: Session, entries: Sequence[MatchCacheUpsert]) -> None:
+    """Upsert shared match cache rows keyed by (provider, normalized_key)."""
+    if not entries:
+        return
+
+    now = datetime.now(timezone.utc)
+    unique = {(e.provider, e.normalized_key): e for e in entries}
+    rows = [
+        {
+            "id": str(uuid4()),
+            "provider": e.provider,
+            "normalized_key": e.normalized_key,
+            "catalog_item_id": e.catalog_item_id,
+            "method": e.method,
+            "confidence": e.confidence,
+            "evidence": e.evidence,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for e in unique.values()
+    ]
+    ids = _upsert_returning_ids(
+        db,
+        MatchCacheEntry,
+        rows,
+        conflict_cols=("provider", "normalized_key"),
+        update_cols=(
+            "catalog_item_id",
+            "method",
+            "confidence",
+            "evidence",
+            "updated_at",
+        ),
+    )
+    if ids is not None:
+        return
+
+    existing = {
+        (row.provider, row.normalized_key): row
+        for row in db.execute(
+            select(MatchCacheEntry).where(
+                MatchCacheEntry.normalized_key.in_([k for _, k in unique])
+            )
+        ).scalars()
+    }
+    for key, e in unique.items():
+        row = existing.get(key)
+        if row is None:
+            db.add(
+                MatchCacheEntry(
+                    provider=e.provider,
+                    normalized_key=e.normalized_key,
+                    catalog_item_id=e.catalog_item_id,
+                    method=e.method,
+                    confidence=e.confidence,
+                    evidence=e.evidence,
+                )
+            )
+            continue
+        row.catalog_item_id = e.catalog_item_id
+        row.method = e.method
+        row.confidence = e.confidence
+        row.evidence = e.evidence
+    db.flush()
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from app.domain.normalize import content_fingerprint
+from app.models.shelf_item import ShelfItem
+from app.services.catalog.provider import CatalogProvider
+from app.services.catalog.types import ProviderBook
+from app.services.dashboard_rows import refresh_dashboard_rows
+from app.services.matching.match_cache import (
+    CachedMatch,
+    lookup_matches,
+    match_key,
+    remember_matches,
+    warm_matches,
+)
+from app.services.matching.matcher import MatchResult, resolve_matches
+from app.services.matching.persist import (
+    MatchUpsert,
+    bulk_upsert_catalog_items,
+    bulk_upsert_matches,
+    record_match_attempts,
+)
+from sqlalchemy.orm import Session
+
+
+@dataclass(frozen=True)
+class ItemMatch:
+    shelf_item: ShelfItem
+    result: MatchResult | None
+    # Set when the result came from the shared match cache.
+    catalog_item_id: str | None = None
+
+
+@dataclass
+class PipelineStats:
+    total: int = 0
+    matched: int = 0
+    unmatched: int = 0
+    cache_hits: int = 0
+
+
+async def match_items(
+    provider: CatalogProvider,
+    items: Sequence[ShelfItem],
+    *,
+    concurrency: int,
+    batch_size: int,
+    on_batch: Callable[[list[ItemMatch]], None],
+) -> None:
+    """Match shelf items concurrently and hand results over in batches.
+
+    At most `concurrency` provider searches are in flight at once. Candidates
+    are collected in completion order, so a slow item never holds back a batch,
+    and each batch is scored in one vectorized pass.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def _one(item: ShelfItem) -> tuple[ShelfItem, list[ProviderBook]]:
+        async with sem:
+            cands = await provider.search(
+                title=item.title,
+                author=item.author,
+                isbn10=item.isbn10,
+                isbn13=item.isbn13,
+                limit=10,
+            )
+            return item, cands
+
+    def _emit(pending: list[tuple[ShelfItem, list[ProviderBook]]]) -> None:
+        results = resolve_matches([p[0] for p in pending], [p[1] for p in pending])
+        on_batch(
+            [
+                ItemMatch(shelf_item=item, result=res)
+                for (item, _), res in zip(pending, results)
+            ]
+        )
+
+    tasks = [asyncio.create_task(_one(it)) for it in items]
+    batch: list[tuple[ShelfItem, list[ProviderBook]]] = []
+    try:
+        for fut in asyncio.as_completed(tasks):
+            batch.append(await fut)
+            if len(batch) >= batch_size:
+                _emit(batch)
+                batch = []
+        if batch:
+            _emit(batch)
+    finally:
+        for t in tasks:
+            t.cancel()
+
+
+def persist_matches(db: Session, *, user_id: str, batch: list[ItemMatch]) -> int:
+    """Write CatalogItem/CatalogMatch rows for one batch and commit. Returns matches.
+
+    Every item, matched or not, records the fingerprint it was attempted at.
+    Fresh (non-cached) results are also recorded in the shared match cache.
+    """
+    fingerprints = {
+        m.shelf_item.id: content_fingerprint(
+            title=m.shelf_item.title,
+            author=m.shelf_item.author,
+            isbn13=m.shelf_item.isbn13,
+            isbn10=m.shelf_item.isbn10,
+            asin=m.shelf_item.asin,
+        )
+        for m in batch
+    }
+    record_match_attempts(
+        db, [(m.shelf_item, fingerprints[m.shelf_item.id]) for m in batch]
+    )
+
+    matched = [(m, m.result) for m in batch if m.result is not None]
+    if not matched:
+        db.commit()
+        return 0
+
+    catalog_ids = bulk_upsert_catalog_items(
+        db, [res.book for m, res in matched if m.catalog_item_id is None]
+    )
+
+    resolved: list[tuple[ShelfItem, MatchResult, str]] = []
+    new_entries: dict[str, list[tuple[str, CachedMatch]]] = {}
+    for m, res in matched:
+        catalog_item_id = (
+            m.catalog_item_id
+            or catalog_ids[(res.book.provider, res.book.provider_item_id)]
+        )
+        resolved.append((m.shelf_item, res, catalog_item_id))
+        if m.catalog_item_id is None:
+            new_entries.setdefault(res.book.provider, []).append(
+                (
+                    match_key(m.shelf_item),
+                    CachedMatch(catalog_item_id=catalog_item_id, result=res),
+                )
+            )
+
+    bulk_upsert_matches(
+        db,
+        [
+            MatchUpsert(
+                user_id=user_id,
+                shelf_item_id=shelf_item.id,
+                catalog_item_id=catalog_item_id,
+                provider=res.book.provider,
+                method=res.method,
+                confidence=res.confidence,
+                evidence=res.evidence,
+            )
+            for shelf_item, res, catalog_item_id in resolved
+        ],
+    )
+    for provider_name, entries in new_entries.items():
+        remember_matches(db, provider=provider_name, entries=entries)
+    refresh_dashboard_rows(
+        db, user_id=user_id, shelf_item_ids=[si.id for si, _, _ in resolved]
+    )
+
+    db.commit()
+
+    for provider_name, entries in new_entries.items():
+        warm_matches(provider=provider_name, entries=entries)
+    return len(matched)
+
+
+async def match_and_persist(
+    db: Session,
+    provider: CatalogProvider,
+    *,
+    user_id: str,
+    items: Sequence[ShelfItem],
+    concurrency: int,
+    batch_size: int,
+) -> PipelineStats:
+    stats = PipelineStats(total=len(items))
+
+    def _flush(batch: list[ItemMatch]) -> None:
+        n = persist_matches(db, user_id=user_id, batch=batch)
+        stats.matched += n
+        stats.unmatched += len(batch) - n
+
+    # Items whose normalized identity was already matched (by anyone) skip
+    # the provider search and scoring entirely.
+    keys = {item.id: match_key(item) for item in items}
+    cached = lookup_matches(db, provider=provider.name, keys=keys.values())
+    hits: list[ItemMatch] = []
+    misses: list[ShelfItem] = []
+    for item in items:
+        entry = cached.get(keys[item.id])
+        if entry is None:
+            misses.append(item)
+            continue
+        hits.append(
+            ItemMatch(
+                shelf_item=item,
+                result=entry.result,
+                catalog_item_id=entry.catalog_item_id,
+            )
+        )
+    stats.cache_hits = len(hits)
+
+    step = max(1, batch_size)
+    for i in range(0, len(hits), step):
+        _flush(hits[i : i + step])
+
+    await match_items(
+        provider,
+        misses,
+        concurrency=concurrency,
+        batch_size=batch_size,
+        on_batch=_flush,
+    )
+    return stats
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Any, Sequence
+
+import numpy as np
+from app.services.catalog.types import ProviderBook
+
+TITLE_WEIGHT = 0.75
+AUTHOR_WEIGHT = 0.25
+# Used when either side has no author, so title alone decides.
+MISSING_AUTHOR_SCORE = 0.5
+# Tune later; keep conservative to avoid false positives.
+MATCH_THRESHOLD = 0.72
+
+# Concrete array types for the kernel's locals (mypy 1.11 cannot read the
+# NDArray alias NumPy 2.x returns).
+_Int64s = np.ndarray[Any, np.dtype[np.int64]]
+_Float64s = np.ndarray[Any, np.dtype[np.float64]]
+
+_non_alnum_ws = re.compile(r"[^a-z0-9\s]")
+_ws = re.compile(r"\s+")
+
+
+def norm_text(s: str) -> str:
+    s = s.lower().strip()
+    s = _non_alnum_ws.sub(" ", s)
+    s = _ws.sub(" ", s)
+    return s
+
+
+@dataclass(frozen=True)
+class BatchScores:
+    """Flat score arrays for a batch of shelf items.
+
+    Candidates of item `i` live at `offsets[i]:offsets[i + 1]`, in the order
+    they were passed in.
+    """
+
+    offsets: np.ndarray
+    title: np.ndarray
+    author: np.ndarray
+    combined: np.ndarray
+
+    def ranked(self, i: int) -> np.ndarray:
+        """Candidate positions (relative to the item) best first.
+
+        Ranks by combined then title score; ties keep input order.
+        """
+        lo, hi = int(self.offsets[i]), int(self.offsets[i + 1])
+        return np.lexsort((-self.title[lo:hi], -self.combined[lo:hi]))
+
+
+# Pairs longer than this fall back to SequenceMatcher; it also keeps difflib's
+# autojunk heuristic (which only kicks in at 200 chars) out of the vector path.
+_MAX_VECTOR_LEN = 128
+_CHUNK_PAIRS = 512
+
+
+def _pack(strings: list[bytes], lengths: np.ndarray, *, fill: int) -> np.ndarray:
+    """Left-align byte strings into one padded uint8 matrix without a Python loop."""
+    width = int(lengths.max(initial=0))
+    out = np.full((len(strings), width), fill, dtype=np.uint8)
+    flat: np.ndarray[Any, np.dtype[np.uint8]] = np.frombuffer(
+        b"".join(strings), dtype=np.uint8
+    )
+    rows = np.repeat(np.arange(len(strings)), lengths)
+    starts = np.cumsum(lengths) - lengths
+    positions: _Int64s = np.arange(flat.size)
+    cols = positions - np.repeat(starts, lengths)
+    out[rows, cols] = flat
+    return out
+
+
+def _interleave(left: _Int64s, right: _Int64s) -> _Int64s:
+    """[left[0], right[0], left[1], right[1], ...]."""
+    out: _Int64s = np.stack([left, right], axis=1)
+    return out.ravel()
+
+
+def _matched_chars(a_list: list[bytes], b_list: list[bytes]) -> np.ndarray:
+    """Total matching-block size for each (a, b) pair, as SequenceMatcher computes it.
+
+    SequenceMatcher recursively takes the longest common substring of a window
+    (first one by end position on ties) and recurses left and right of it. Here
+    every maximal diagonal run of equal characters is extracted up front, and
+    each recursion level is evaluated for all pairs and windows at once: a run
+    clipped to its window is a candidate block, and each run can only ever fall
+    into one child window.
+    """
+    n = len(a_list)
+    la: _Int64s = np.fromiter((len(a) for a in a_list), dtype=np.int64, count=n)
+    lb: _Int64s = np.fromiter((len(b) for b in b_list), dtype=np.int64, count=n)
+    A = _pack(a_list, la, fill=0)
+    B = _pack(b_list, lb, fill=1)
+
+    eq = A[:, :, None] == B[:, None, :]
+    run = np.zeros(eq.shape, dtype=np.int16)
+    run[:, 0, :] = eq[:, 0, :]
+    for i in range(1, eq.shape[1]):
+        run[:, i, 0] = eq[:, i, 0]
+        np.multiply(run[:, i - 1, :-1] + 1, eq[:, i, 1:], out=run[:, i, 1:])
+
+    ends = eq.copy()
+    ends[:, :-1, :-1] &= ~eq[:, 1:, 1:]
+    pair, ei, ej = np.nonzero(ends)
+    rlen = run[pair, ei, ej].astype(np.int64)
+    si = ei - rlen + 1
+    sj = ej - rlen + 1
+
+    # One window per pair to start with: the whole of a x b.
+    w_pair: _Int64s = np.arange(n)
+    w_alo = np.zeros(n, dtype=np.int64)
+    w_ahi = la.copy()
+    w_blo = np.zeros(n, dtype=np.int64)
+    w_bhi = lb.copy()
+    wid: _Int64s = pair
+
+    matched = np.zeros(n, dtype=np.int64)
+    big = _MAX_VECTOR_LEN + 1
+    while wid.size:
+        alo, ahi, blo, bhi = w_alo[wid], w_ahi[wid], w_blo[wid], w_bhi[wid]
+        tlo = np.maximum(np.maximum(alo - si, blo - sj), 0)
+        thi = np.minimum(np.minimum(ahi - si, bhi - sj), rlen)
+        clen = thi - tlo
+        live = clen > 0
+        if not live.any():
+            break
+        wid, si, sj, rlen = wid[live], si[live], sj[live], rlen[live]
+        alo, ahi, blo, bhi = alo[live], ahi[live], blo[live], bhi[live]
+        clen, thi = clen[live], thi[live]
+
+        # Longest clipped run wins; ties go to the earliest end cell in
+        # row-major order, which is the one find_longest_match reports.
+        end_i = si + thi - 1
+        end_j = sj + thi - 1
+        key = (clen * big - end_i) * big - end_j
+        best: _Int64s = np.full(w_pair.size, np.iinfo("int64").min)
+        np.maximum.at(best, wid, key)
+        won = key == best[wid]
+
+        bw = wid[won]
+        bk = clen[won]
+        bi = end_i[won] - bk + 1
+        bj = end_j[won] - bk + 1
+        np.add.at(matched, w_pair[bw], bk)
+
+        # Children of each winning window: left of the block and right of it.
+        slot: _Int64s = np.full(w_pair.size, -1)
+        slot[bw] = np.arange(bw.size)
+        p = slot[wid]
+        ci, cj, ck = bi[p], bj[p], bk[p]
+        left = np.minimum(np.minimum(ci - si, cj - sj), rlen) - np.maximum(
+            np.maximum(alo - si, blo - sj), 0
+        )
+        right = np.minimum(np.minimum(ahi - si, bhi - sj), rlen) - np.maximum(
+            np.maximum(ci + ck - si, cj + ck - sj), 0
+        )
+        new_wid: _Int64s = np.where(left > 0, 2 * p, np.where(right > 0, 2 * p + 1, -1))
+
+        parent = w_pair[bw]
+        w_pair = np.repeat(parent, 2)
+        w_alo = _interleave(w_alo[bw], bi + bk)
+        w_ahi = _interleave(bi, w_ahi[bw])
+        w_blo = _interleave(w_blo[bw], bj + bk)
+        w_bhi = _interleave(bj, w_bhi[bw])
+
+        keep = new_wid >= 0
+        wid, si, sj, rlen = new_wid[keep], si[keep], sj[keep], rlen[keep]
+
+    return matched
+
+
+class _Kernel:
+    """Batched SequenceMatcher ratios.
+
+    Pairs are registered first, then `compute()` evaluates every distinct pair
+    in vectorized chunks (grouped by length to limit padding).
+    """
+
+    def __init__(self) -> None:
+        self._norm: dict[str, str] = {}
+        self._pairs: dict[tuple[str, str], int] = {}
+
+    def norm(self, s: str | None) -> str:
+        raw = s or ""
+        out = self._norm.get(raw)
+        if out is None:
+            out = self._norm[raw] = norm_text(raw)
+        return out
+
+    def pair(self, a: str, b: str) -> int:
+        """Register (a, b) and return its slot in the array `compute()` returns."""
+        return self._pairs.setdefault((a, b), len(self._pairs))
+
+    def compute(self) -> np.ndarray:
+        out = np.zeros(len(self._pairs), dtype=np.float64)
+        vector: list[tuple[int, bytes, bytes]] = []
+        for (a, b), slot in self._pairs.items():
+            if not a or not b:
+                continue
+            if len(a) > _MAX_VECTOR_LEN or len(b) > _MAX_VECTOR_LEN:
+                out[slot] = SequenceMatcher(None, a, b).ratio()
+                continue
+            # norm_text output is pure ASCII ([a-z0-9 ]).
+            vector.append((slot, a.encode("ascii"), b.encode("ascii")))
+
+        vector.sort(key=lambda v: (len(v[1]), len(v[2])))
+        for i in range(0, len(vector), _CHUNK_PAIRS):
+            chunk = vector[i : i + _CHUNK_PAIRS]
+            slots = np.fromiter((v[0] for v in chunk), dtype=np.int64, count=len(chunk))
+            a_list = [v[1] for v in chunk]
+            b_list = [v[2] for v in chunk]
+            total: _Float64s = np.fromiter(
+                (len(a) + len(b) for a, b in zip(a_list, b_list)),
+                dtype=np.float64,
+                count=len(chunk),
+            )
+            out[slots] = 2.0 * _matched_chars(a_list, b_list) / total
+        return out
+
+
+def score_batch(
+    queries: Sequence[tuple[str | None, str | None]],
+    candidates: Sequence[Sequence[ProviderBook]],
+) -> BatchScores:
+    """Score every (shelf item, candidate) pair in one pass.
+
+    `queries[i]` is the (title, author) of shelf item `i` and `candidates[i]` its
+    provider candidates. Scores match `match_shelf_item`'s historical per-pair
+    SequenceMatcher values exactly.
+    """
+    kernel = _Kernel()
+    counts = np.fromiter((len(c) for c in candidates), dtype=np.int64)
+    offsets = np.zeros(len(candidates) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    n = int(offsets[-1])
+    title_slot = np.empty(n, dtype=np.int64)
+    author_slot = np.full(n, -1, dtype=np.int64)
+
+    pos = 0
+    for (q_title, q_author), cands in zip(queries, candidates):
+        t = kernel.norm(q_title)
+        a = kernel.norm(q_author)
+        for c in cands:
+            title_slot[pos] = kernel.pair(t, kernel.norm(c.title))
+            ca = kernel.norm(c.author)
+            if a and ca:
+                author_slot[pos] = kernel.pair(a, ca)
+            pos += 1
+
+    ratios = kernel.compute()
+    title: _Float64s = ratios[title_slot]
+    author: _Float64s = np.where(
+        author_slot >= 0, ratios[np.maximum(author_slot, 0)], MISSING_AUTHOR_SCORE
+    )
+    combined: _Float64s = np.add(TITLE_WEIGHT * title, AUTHOR_WEIGHT * author)
+    return BatchScores(offsets=offsets, title=title, author=author, combined=combined)
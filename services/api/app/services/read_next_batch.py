@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import numpy as np
+from app.services.read_next_scoring import (
+    _STATUS_WEIGHT,
+    ReadNextScore,
+    _get,
+    compute_read_next,
+)
+
+# Format index compute_read_next assigns to non-preferred formats.
+_NOT_PREFERRED = 999
+
+# Explicitly typed locals for the vectorized pass; NumPy 2.x's own return
+# types (NDArray, _Array1D) are aliases mypy 1.11 cannot resolve.
+_Int64s = np.ndarray[Any, np.dtype[np.int64]]
+_Float64s = np.ndarray[Any, np.dtype[np.float64]]
+_Bools = np.ndarray[Any, np.dtype[np.bool_]]
+
+
+@dataclass(frozen=True)
+class AvailabilityColumns:
+    """Availability entries of many rows as flat arrays.
+
+    Entries of row `i` live at `offsets[i]:offsets[i + 1]`, in input order.
+    `status` and `fmt` index into the `statuses` / `formats` vocabularies
+    (`fmt` is -1 for a missing format). Counts are float64 with NaN for None.
+    """
+
+    offsets: np.ndarray
+    status: np.ndarray
+    fmt: np.ndarray
+    copies_available: np.ndarray
+    copies_total: np.ndarray
+    holds: np.ndarray
+    statuses: list[str]
+    formats: list[str]
+
+    @property
+    def rows(self) -> int:
+        return len(self.offsets) - 1
+
+    @classmethod
+    def from_rows(
+        cls, availability: Sequence[Sequence[Any] | None]
+    ) -> AvailabilityColumns:
+        """Build columns from per-row lists of dicts or objects.
+
+        Accepts the same inputs as compute_read_next.
+        """
+        statuses: dict[str, int] = {}
+        formats: dict[str, int] = {}
+        status: list[int] = []
+        fmt: list[int] = []
+        counts: list[tuple[Any, Any, Any]] = []
+        offsets = [0]
+        for entries in availability:
+            for a in entries or []:
+                f = _get(a, "format")
+                fmt.append(formats.setdefault(f, len(formats)) if f else -1)
+                s = _get(a, "status") or "not_owned"
+                status.append(statuses.setdefault(s, len(statuses)))
+                counts.append(
+                    (
+                        _get(a, "copies_available"),
+                        _get(a, "copies_total"),
+                        _get(a, "holds"),
+                    )
+                )
+            offsets.append(len(status))
+
+        def _col(i: int) -> np.ndarray:
+            return np.array(
+                [np.nan if c[i] is None else float(c[i]) for c in counts],
+                dtype=np.float64,
+            )
+
+        return cls(
+            offsets=np.array(offsets, dtype=np.int64),
+            status=np.array(status, dtype=np.int64),
+            fmt=np.array(fmt, dtype=np.int64),
+            copies_available=_col(0),
+            copies_total=_col(1),
+            holds=_col(2),
+            statuses=list(statuses),
+            formats=list(formats),
+        )
+
+
+@dataclass(frozen=True)
+class ReadNextBatch:
+    """compute_read_next results for every row of an AvailabilityColumns.
+
+    Numeric results are arrays; `tier`/`best_format` are strings per row.
+    `best` is the winning entry's position in the columns (-1 when none), and
+    reason strings are only built by `result(i)`.
+    """
+
+    columns: AvailabilityColumns
+    preferred_formats: list[str]
+    score: np.ndarray
+    hold_ratio: np.ndarray
+    best: np.ndarray
+    fmt_index: np.ndarray
+
+    def tier(self, i: int) -> str:
+        b = int(self.best[i])
+        return "not_owned" if b < 0 else self.columns.statuses[self.columns.status[b]]
+
+    def best_format(self, i: int) -> str | None:
+        b = int(self.best[i])
+        return None if b < 0 else self.columns.formats[self.columns.fmt[b]]
+
+    def hold_ratio_at(self, i: int) -> float | None:
+        v = self.hold_ratio[i]
+        return None if np.isnan(v) else float(v)
+
+    def result(self, i: int) -> ReadNextScore:
+        """Full ReadNextScore for row `i`, reasons included."""
+        return ReadNextScore(
+            score=float(self.score[i]),
+            tier=self.tier(i),
+            best_format=self.best_format(i),
+            hold_ratio=self.hold_ratio_at(i),
+            reasons=self.reasons(i),
+        )
+
+    def reasons(self, i: int) -> list[str]:
+        cols = self.columns
+        b = int(self.best[i])
+        if b < 0:
+            if cols.offsets[i] == cols.offsets[i + 1]:
+                return compute_read_next([], self.preferred_formats).reasons
+            return ["No preferred-format availability data", "Tier: not_owned"]
+
+        tier = self.tier(i)
+        best_format = self.best_format(i)
+        rank = int(self.fmt_index[b]) + 1
+        preferred = best_format in self.preferred_formats
+        copies_available = _count(float(cols.copies_available[b]))
+        copies_total = _count(float(cols.copies_total[b]))
+        holds = _count(float(cols.holds[b]))
+        hold_ratio = self.hold_ratio_at(i)
+
+        reasons: list[str] = []
+        if tier == "available":
+            reasons.append(
+                f"Available now in {best_format} (preferred #{rank})"
+                if preferred
+                else f"Available now in {best_format}"
+            )
+            if copies_available is not None or copies_total is not None:
+                reasons.append(
+                    f"Copies available: {copies_available or 0} / {copies_total or 0}"
+                )
+        elif tier == "hold":
+            reasons.append(
+                f"On hold in {best_format} (preferred #{rank})"
+                if preferred
+                else f"On hold in {best_format}"
+            )
+            if (
+                hold_ratio is not None
+                and holds is not None
+                and copies_total is not None
+            ):
+                reasons.append(
+                    f"Hold queue: {holds} holds / {copies_total} copies (ratio {hold_ratio:.2f})"
+                )
+            elif holds is not None:
+                reasons.append(f"Hold queue: {holds} holds")
+            else:
+                reasons.append("Hold queue length unavailable")
+        else:
+            reasons.append("Not owned in your selected library/catalog")
+        reasons.append(f"Tier: {tier}")
+        return reasons
+
+
+def _count(v: float) -> int | None:
+    return None if np.isnan(v) else int(v)
+
+
+def compute_read_next_batch(
+    columns: AvailabilityColumns, preferred_formats: Sequence[str]
+) -> ReadNextBatch:
+    """Vectorized compute_read_next over every row of `columns`.
+
+    Scores, tiers, best formats and hold ratios match compute_read_next
+    exactly (same float operations in the same order; counts are assumed to be
+    integers). Candidate selection keeps its tie-break: highest score, then
+    lowest preferred index, then first in input order.
+    """
+    preferred = list(preferred_formats or [])
+    n_rows = columns.rows
+
+    # Per-vocabulary lookups, gathered per entry. Each has a trailing slot so
+    # an empty vocabulary (or fmt == -1) still indexes.
+    fmt_pref: _Int64s = np.array(
+        [
+            preferred.index(f) if f in preferred else _NOT_PREFERRED
+            for f in columns.formats
+        ]
+        + [_NOT_PREFERRED],
+        dtype=np.int64,
+    )
+    status_weight: _Float64s = np.array(
+        [_STATUS_WEIGHT.get(s, _STATUS_WEIGHT["not_owned"]) for s in columns.statuses]
+        + [0.0],
+        dtype=np.float64,
+    )
+    status_available: _Bools = np.array(
+        [s == "available" for s in columns.statuses] + [False], dtype=bool
+    )
+    status_hold: _Bools = np.array(
+        [s == "hold" for s in columns.statuses] + [False], dtype=bool
+    )
+
+    fmt_index = fmt_pref[columns.fmt]
+    valid = columns.fmt >= 0
+    if preferred:
+        valid &= fmt_index != _NOT_PREFERRED
+
+    fmt_bonus = np.where(fmt_index != _NOT_PREFERRED, 20.0 / (fmt_index + 1), 0.0)
+    base = status_weight[columns.status]
+
+    available = status_available[columns.status]
+    ca = np.nan_to_num(columns.copies_available, nan=0.0)
+    copies_bonus = np.where(available, np.minimum(np.maximum(ca, 0.0), 10.0), 0.0)
+
+    hold = status_hold[columns.status]
+    h, ct = columns.holds, columns.copies_total
+    has_h, has_ct = ~np.isnan(h), ~np.isnan(ct)
+    by_ratio = hold & has_h & has_ct & (np.nan_to_num(ct) > 0)
+    by_holds = hold & has_h & ~by_ratio
+    with np.errstate(invalid="ignore"):
+        ratio = h / np.maximum(ct, 1.0)
+    hold_ratio: _Float64s = np.where(by_ratio, ratio, np.nan)
+    hold_penalty = np.where(
+        by_ratio,
+        np.minimum(ratio * 25.0, 400.0),
+        np.where(by_holds, np.minimum(h * 2.0, 400.0), 0.0),
+    )
+
+    score = base + fmt_bonus + copies_bonus - hold_penalty
+
+    # Best valid entry per row: order by (row, -score, fmt_index, position)
+    # and take the first entry of each row.
+    row_of: _Int64s = np.repeat(np.arange(n_rows), np.diff(columns.offsets))
+    cand: _Int64s = np.flatnonzero(valid)
+    order = cand[np.lexsort((cand, fmt_index[cand], -score[cand], row_of[cand]))]
+    rows_with, first = np.unique(row_of[order], return_index=True)
+
+    best = np.full(n_rows, -1, dtype=np.int64)
+    best[rows_with] = order[first]
+    has_best = best >= 0
+
+    out_score = np.full(n_rows, _STATUS_WEIGHT["not_owned"], dtype=np.float64)
+    out_score[has_best] = score[best[has_best]]
+    out_ratio = np.full(n_rows, np.nan, dtype=np.float64)
+    out_ratio[has_best] = hold_ratio[best[has_best]]
+
+    return ReadNextBatch(
+        columns=columns,
+        preferred_formats=preferred,
+        score=out_score,
+        hold_ratio=out_ratio,
+        best=best,
+        fmt_index=fmt_index,
+    )
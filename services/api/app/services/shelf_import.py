@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
+from app.domain.normalize import content_fingerprint
 from app.models.shelf_item import ShelfItem
 from app.models.shelf_source import ShelfSource
+from app.services.dashboard_rows import refresh_dashboard_rows
 from app.services.normalization import normalize_text
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -44,6 +46,7 @@ def upsert_shelf_items(
         )
         existing_by_ext = {r.external_id: r for r in rows if r.external_id}
 
+    touched: list[ShelfItem] = []
     for it in items:
         try:
             title = (it.get("title") or "").strip()
@@ -60,6 +63,9 @@ def upsert_shelf_items(
             norm_title = normalize_text(title)
             norm_author = normalize_text(author)
             needs_fuzzy = not (isbn10 or isbn13 or asin)
+            fingerprint = content_fingerprint(
+                title=title, author=author, isbn13=isbn13, isbn10=isbn10, asin=asin
+            )
 
             row = existing_by_ext.get(ext) if ext else None
             if row:
@@ -72,24 +78,28 @@ def upsert_shelf_items(
                 row.normalized_author = norm_author
                 row.shelf = it.get("shelf")
                 row.needs_fuzzy_match = needs_fuzzy
+                row.content_fingerprint = fingerprint
+                if db.is_modified(row):
+                    touched.append(row)
                 summary.updated += 1
             else:
-                db.add(
-                    ShelfItem(
-                        user_id=user_id,
-                        shelf_source_id=source.id,
-                        external_id=ext,
-                        title=title,
-                        author=author,
-                        isbn10=isbn10,
-                        isbn13=isbn13,
-                        asin=asin,
-                        normalized_title=norm_title,
-                        normalized_author=norm_author,
-                        shelf=it.get("shelf"),
-                        needs_fuzzy_match=needs_fuzzy,
-                    )
+                new_item = ShelfItem(
+                    user_id=user_id,
+                    shelf_source_id=source.id,
+                    external_id=ext,
+                    title=title,
+                    author=author,
+                    isbn10=isbn10,
+                    isbn13=isbn13,
+                    asin=asin,
+                    normalized_title=norm_title,
+                    normalized_author=norm_author,
+                    shelf=it.get("shelf"),
+                    needs_fuzzy_match=needs_fuzzy,
+                    content_fingerprint=fingerprint,
                 )
+                db.add(new_item)
+                touched.append(new_item)
                 summary.created += 1
 
         except Exception as e:
@@ -97,5 +107,7 @@ def upsert_shelf_items(
                 ImportErrorItem(key=str(it.get("external_id") or title), error=str(e))
             )
 
+    db.flush()
+    refresh_dashboard_rows(db, user_id=user_id, shelf_item_ids=[r.id for r in touched])
     db.commit()
     return summary
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_PENDING = "unread_counter_pending"
+_HOOKED = "unread_counter_hooked"
+
+
+def _key(user_id: str) -> str:
+    return f"unread:{user_id}"
+
+
+def get_cached(user_id: str) -> int | None:
+    """The user's unread counter, or None on a miss, drift or Redis error.
+
+    One round trip (GET + TTL). Counters are only ever created by `store`,
+    with a TTL; a key without one was created by a blind INCRBY after it had
+    expired, and a negative value means a missed update. A drifted counter is
+    deleted so the caller's rebuild can replace it.
+    """
+    r = get_redis()
+    if r is None:
+        return None
+    key = _key(user_id)
+    try:
+        pipe = r.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.ttl(key)
+        value, ttl = pipe.execute()
+    except Exception:
+        return None
+    if value is None:
+        return None
+    if ttl == -1 or int(value) < 0:
+        try:
+            r.delete(key)
+        except Exception:
+            pass
+        return None
+    return int(value)
+
+
+def store(user_id: str, count: int) -> None:
+    """Build a missing counter from an authoritative count (SET NX).
+
+    If an INCRBY/DECRBY created the key between the count and this call, the
+    counter is left alone: it has no TTL, so the next read sees it as drift
+    and rebuilds, rather than the stale count overwriting the update.
+    """
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        r.set(_key(user_id), count, ex=settings.unread_counter_ttl_secs, nx=True)
+    except Exception:
+        return
+
+
+def note_created(db: Session, user_ids: Iterable[str]) -> None:
+    """Count new unread events toward their users' counters once `db` commits.
+
+    A rollback discards them, so counters only move for durable rows.
+    """
+    pending: Counter[str] = db.info.setdefault(_PENDING, Counter())
+    pending.update(user_ids)
+    if not db.info.get(_HOOKED):
+        event.listen(db, "after_commit", _apply_pending)
+        event.listen(db, "after_rollback", _discard_pending)
+        db.info[_HOOKED] = True
+
+
+def note_read(user_id: str, n: int = 1) -> None:
+    """Decrement after `n` notifications were marked read (and committed)."""
+    _incr({user_id: -n})
+
+
+def _apply_pending(session: Session) -> None:
+    pending: Counter[str] | None = session.info.pop(_PENDING, None)
+    if pending:
+        _incr(dict(pending))
+
+
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+def _incr(deltas: dict[str, int]) -> None:
+    # Missing keys are left to the next read to rebuild; an INCRBY that does
+    # create one leaves it without a TTL, which reads treat as drift.
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        pipe = r.pipeline(transaction=False)
+        for user_id, delta in deltas.items():
+            pipe.incrby(_key(user_id), delta)
+        pipe.execute()
+    except Exception:
+        return
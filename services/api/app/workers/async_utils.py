@@ -1,22 +1,104 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Awaitable, TypeVar
+import atexit
+import os
+import threading
+from concurrent.futures import Future
+from typing import Coroutine, TypeVar
 
 T = TypeVar("T")
 
 
-def run_async(coro: Awaitable[T]) -> T:
-    """Run an async coroutine from a sync context.
+class AsyncRuntime:
+    """A long-lived event loop running on a daemon thread.
+
+    Sync code (RQ jobs, provider adapters) submits coroutines here instead of
+    spinning up a loop per call, so loop-bound resources such as pooled HTTP
+    connections survive across chunks and jobs in the same process.
 
-    Uses a fresh event loop to avoid "asyncio.run() cannot be called" edge cases.
+    The loop is started lazily and restarted after a fork: RQ's forking worker
+    runs each job in a child process that inherits the parent's loop object but
+    not its thread.
     """
-    loop = asyncio.new_event_loop()
-    try:
-        asyncio.set_event_loop(loop)
-        return loop.run_until_complete(coro)
-    finally:
-        try:
+
+    def __init__(self, name: str = "async-runtime") -> None:
+        self._name = name
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            current = self._loop
+            if (
+                current is not None
+                and self._thread is not None
+                and self._thread.is_alive()
+                and self._pid == os.getpid()
+            ):
+                return current
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_run, name=self._name, daemon=True)
+            thread.start()
+            ready.wait()
+
+            self._loop, self._thread, self._pid = loop, thread, os.getpid()
+            return loop
+
+    def submit(self, coro: Coroutine[object, object, T]) -> Future[T]:
+        """Schedule `coro` on the runtime loop and return a concurrent Future."""
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError(
+                "AsyncRuntime.submit() called from the runtime loop; await instead"
+            )
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run(
+        self, coro: Coroutine[object, object, T], timeout: float | None = None
+    ) -> T:
+        """Run `coro` on the runtime loop and block until it finishes."""
+        return self.submit(coro).result(timeout)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            owned = self._pid == os.getpid()
+            self._loop = self._thread = self._pid = None
+
+        if loop is None or thread is None or not owned:
+            return
+        if thread.is_alive():
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+        if not loop.is_running():
             loop.close()
-        finally:
-            asyncio.set_event_loop(None)
+
+
+_runtime = AsyncRuntime()
+atexit.register(_runtime.shutdown)
+
+
+def get_runtime() -> AsyncRuntime:
+    """Process-wide runtime shared by all sync callers."""
+    return _runtime
+
+
+def run_async(coro: Coroutine[object, object, T]) -> T:
+    """Run an async coroutine from a sync context.
+
+    Runs on the shared worker runtime loop rather than a fresh loop per call,
+    which also works when the calling thread already has a running loop.
+    """
+    return _runtime.run(coro)
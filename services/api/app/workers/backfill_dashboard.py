@@ -0,0 +1,69 @@
+"""Rebuild the dashboard_rows read model (scores included) for existing users.
+
+    python -m app.workers.backfill_dashboard              # users without rows
+    python -m app.workers.backfill_dashboard --all        # every user
+    python -m app.workers.backfill_dashboard --user-id ID
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from typing import Sequence
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.dashboard_row import DashboardRow
+from app.models.shelf_item import ShelfItem
+from app.services.dashboard_rows import refresh_dashboard_rows
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_dashboard_rows(
+    db: Session, *, user_ids: Sequence[str] | None = None, only_missing: bool = True
+) -> int:
+    """Rebuild rows per user, committing after each. Returns users processed.
+
+    With `only_missing`, users that already have rows are skipped; writes keep
+    those current incrementally.
+    """
+    if user_ids is None:
+        stmt = select(ShelfItem.user_id).distinct().order_by(ShelfItem.user_id)
+        if only_missing:
+            stmt = stmt.where(
+                ShelfItem.user_id.not_in(select(DashboardRow.user_id).distinct())
+            )
+        user_ids = list(db.execute(stmt).scalars().all())
+
+    for n, user_id in enumerate(user_ids, start=1):
+        rows = refresh_dashboard_rows(db, user_id=user_id)
+        db.commit()
+        logger.info(
+            "dashboard rows rebuilt",
+            extra={"user_id": user_id, "rows": rows, "done": n, "of": len(user_ids)},
+        )
+    return len(user_ids)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--all", action="store_true", help="rebuild every user")
+    parser.add_argument("--user-id", action="append", dest="user_ids")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=settings.log_level)
+    db = SessionLocal()
+    try:
+        count = backfill_dashboard_rows(
+            db, user_ids=args.user_ids, only_missing=not args.all
+        )
+    finally:
+        db.close()
+    logger.info("dashboard backfill finished", extra={"users": count})
+
+
+if __name__ == "__main__":
+    main()
@@ -21,12 +21,37 @@ def publish_sync_event(
     r.publish(channel, json.dumps(body))
 
 
+# Idle per-user streams expire after a week.
+NOTIFICATION_STREAM_TTL_SECS = 7 * 24 * 3600
+
+
+def notification_stream_key(user_id: str) -> str:
+    return f"notify-stream:{user_id}"
+
+
 def publish_notification_event(*, user_id: str, payload: dict[str, Any]) -> None:
+    """Append to the user's capped notification stream, then announce it live.
+
+    The stream entry id becomes the SSE event id, so a reconnecting client can
+    resume with Last-Event-ID. The PUBLISH carries the same id and body for
+    clients that are connected now.
+    """
     r = get_redis(settings.redis_url)
-    channel = f"notify:{user_id}"
-    body = {
-        "type": "notification",
-        "payload": payload,
-        "ts": datetime.utcnow().isoformat() + "Z",
-    }
-    r.publish(channel, json.dumps(body))
+    key = notification_stream_key(user_id)
+    data = json.dumps(
+        {
+            "type": "notification",
+            "payload": payload,
+            "ts": datetime.utcnow().isoformat() + "Z",
+        }
+    )
+    event_id = r.xadd(
+        key,
+        {"data": data},
+        maxlen=settings.notification_stream_maxlen,
+        approximate=True,
+    )
+    pipe = r.pipeline(transaction=False)
+    pipe.expire(key, NOTIFICATION_STREAM_TTL_SECS)
+    pipe.publish(f"notify:{user_id}", json.dumps({"id": event_id, "data": data}))
+    pipe.execute()
@@ -4,11 +4,16 @@ import asyncio
 import importlib
 import inspect
 import logging
+import time
 from datetime import datetime, timezone
 from typing import Any
 
-from app.crud.availability import upsert_snapshots
-from app.crud.shelf_items import list_shelf_items_for_user
+from app.core.config import settings
+from app.crud.availability import NotificationCreated, upsert_snapshots
+from app.crud.shelf_items import (
+    list_shelf_items_for_user,
+    list_shelf_items_needing_match,
+)
 from app.crud.sync_runs import (
     get_sync_run,
     set_sync_run_failed,
@@ -19,6 +24,10 @@ from app.crud.sync_runs import (
 from app.db.session import SessionLocal
 from app.models.shelf_item import ShelfItem
 from app.providers.factory import get_provider as get_availability_provider
+from app.services.catalog.factory import get_provider as get_catalog_provider
+from app.services.library_refresh import refresh_library_availability
+from app.services.matching.pipeline import match_and_persist
+from app.workers.async_utils import run_async
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
@@ -68,6 +77,28 @@ def publish_sync_event(
     )
 
 
+def _publish_created(db: Session, *, created: list[NotificationCreated]) -> None:
+    # Hydrate titles for nicer live notifications
+    ids = [c.shelf_item_id for c in created]
+    rows = (
+        db.execute(select(ShelfItem.id, ShelfItem.title).where(ShelfItem.id.in_(ids)))
+        .tuples()
+        .all()
+    )
+    id_to_title: dict[str, str] = {sid: title for sid, title in rows}
+
+    for c in created:
+        publish_notification_event(
+            user_id=c.user_id,
+            payload={
+                "id": c.id,
+                "shelf_item_id": c.shelf_item_id,
+                "title": id_to_title.get(c.shelf_item_id, ""),
+                "format": c.format,
+            },
+        )
+
+
 def availability_refresh_job(sync_run_id: str) -> None:
     db: Session = SessionLocal()
     run = None
@@ -93,32 +124,16 @@ def availability_refresh_job(sync_run_id: str) -> None:
             created = upsert_snapshots(db, user_id=run.user_id, results=results)
             processed += len(chunk)
 
-            update_progress(db, run=run, current=processed)  # typically commits
+            update_progress(
+                db,
+                run=run,
+                current=processed,
+                cache_hits=provider.cache_stats.hits,
+                cache_misses=provider.cache_stats.misses,
+            )  # typically commits
 
             if created:
-                # Hydrate titles for nicer live notifications
-                ids = [c.shelf_item_id for c in created]
-                rows = (
-                    db.execute(
-                        select(ShelfItem.id, ShelfItem.title).where(
-                            ShelfItem.id.in_(ids)
-                        )
-                    )
-                    .tuples()
-                    .all()
-                )
-                id_to_title: dict[str, str] = {sid: title for sid, title in rows}
-
-                for c in created:
-                    publish_notification_event(
-                        user_id=run.user_id,
-                        payload={
-                            "id": c.id,
-                            "shelf_item_id": c.shelf_item_id,
-                            "title": id_to_title.get(c.shelf_item_id, ""),
-                            "format": c.format,
-                        },
-                    )
+                _publish_created(db, created=created)
 
             publish_sync_event(
                 user_id=run.user_id,
@@ -132,7 +147,12 @@ def availability_refresh_job(sync_run_id: str) -> None:
             user_id=run.user_id,
             run_id=run.id,
             type_="availability_succeeded",
-            payload={"current": processed, "total": total},
+            payload={
+                "current": processed,
+                "total": total,
+                "cache_hits": provider.cache_stats.hits,
+                "cache_misses": provider.cache_stats.misses,
+            },
         )
 
     except Exception as e:
@@ -153,18 +173,76 @@ def availability_refresh_job(sync_run_id: str) -> None:
         db.close()
 
 
-def refresh_matching_for_user(user_id: str) -> dict[str, int]:
+def library_availability_refresh_job() -> dict[str, int]:
+    """Refresh availability once per distinct (library, provider item) for all users.
+
+    Scheduled by app.workers.scheduler; complements the per-user
+    availability_refresh_job, which stays available for on-demand syncs.
     """
-    TODO: Implement matching refresh using app/services/matching/*.
+    db: Session = SessionLocal()
+    try:
+        started = time.perf_counter()
+        stats = refresh_library_availability(
+            db,
+            get_catalog_provider(),
+            batch_size=settings.library_refresh_batch_size,
+            on_notifications=lambda created: _publish_created(db, created=created),
+        )
+        return {
+            "libraries": stats.libraries,
+            "items": stats.items,
+            "provider_calls": stats.provider_calls,
+            "rows_written": stats.rows_written,
+            "notifications": stats.notifications,
+            "elapsed_ms": int((time.perf_counter() - started) * 1000),
+        }
+    finally:
+        db.close()
+
 
-    This function is kept so imports and job registration remain stable,
-    but matching refresh is currently a no-op.
+def refresh_matching_for_user(user_id: str, full: bool = False) -> dict[str, int]:
+    """Match a user's new or changed shelf items against the catalog provider.
+
+    Items whose content is unchanged since they were last matched (or found
+    no match) are skipped unless `full` is set. Provider searches run
+    concurrently inside one event loop (bounded by MATCHING_CONCURRENCY) and
+    results are written in MATCHING_BATCH_SIZE batches.
     """
     db: Session = SessionLocal()
     try:
-        items = list_shelf_items_for_user(db, user_id=user_id)
-        total = len(items)
-        return {"matched": 0, "total": total}
+        items = list_shelf_items_needing_match(db, user_id=user_id, full=full)
+        started = time.perf_counter()
+
+        stats = run_async(
+            match_and_persist(
+                db,
+                get_catalog_provider(),
+                user_id=user_id,
+                items=items,
+                concurrency=settings.matching_concurrency,
+                batch_size=settings.matching_batch_size,
+            )
+        )
+
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+        logger.info(
+            "matching refresh finished",
+            extra={
+                "user_id": user_id,
+                "full": full,
+                "total": stats.total,
+                "matched": stats.matched,
+                "cache_hits": stats.cache_hits,
+                "elapsed_ms": elapsed_ms,
+            },
+        )
+        return {
+            "matched": stats.matched,
+            "unmatched": stats.unmatched,
+            "total": stats.total,
+            "cache_hits": stats.cache_hits,
+            "elapsed_ms": elapsed_ms,
+        }
     finally:
         db.close()
 
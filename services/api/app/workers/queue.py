@@ -3,6 +3,7 @@ from __future__ import annotations
 from app.core.config import settings
 from app.workers.redis_conn import get_redis_connection
 from rq import Queue, Retry
+from rq.exceptions import NoSuchJobError
 from rq.job import Job
 
 
@@ -19,3 +20,22 @@ def enqueue_availability_refresh(*, sync_run_id: str) -> Job:
         retry=Retry(max=2, interval=[5, 15]),
         job_timeout=settings.worker_job_timeout_secs,
     )
+
+
+LIBRARY_REFRESH_JOB_ID = "library-availability-refresh"
+
+
+def enqueue_library_availability_refresh() -> Job | None:
+    """Enqueue one library-wide refresh cycle unless one is already pending."""
+    q = get_queue()
+    try:
+        existing = Job.fetch(LIBRARY_REFRESH_JOB_ID, connection=q.connection)
+    except NoSuchJobError:
+        existing = None
+    if existing is not None and existing.get_status() in ("queued", "started"):
+        return None
+    return q.enqueue(
+        "app.workers.jobs.library_availability_refresh_job",
+        job_id=LIBRARY_REFRESH_JOB_ID,
+        job_timeout=max(settings.worker_job_timeout_secs, 600),
+    )
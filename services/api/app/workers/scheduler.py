@@ -0,0 +1,48 @@
+"""Periodic enqueuer for library-wide jobs.
+
+Run alongside the RQ worker:
+    python -m app.workers.scheduler
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.workers.queue import enqueue_library_availability_refresh
+from apscheduler.schedulers.blocking import (  # type: ignore[import-untyped]
+    BlockingScheduler,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _enqueue_library_refresh() -> None:
+    job = enqueue_library_availability_refresh()
+    if job is None:
+        logger.info("library availability refresh still pending; skipping cycle")
+    else:
+        logger.info("enqueued library availability refresh", extra={"job_id": job.id})
+
+
+def build_scheduler() -> BlockingScheduler:
+    scheduler = BlockingScheduler(timezone=timezone.utc)
+    scheduler.add_job(
+        _enqueue_library_refresh,
+        "interval",
+        seconds=settings.library_refresh_interval_secs,
+        next_run_time=datetime.now(timezone.utc),
+        max_instances=1,
+        coalesce=True,
+    )
+    return scheduler
+
+
+def main() -> None:
+    logging.basicConfig(level=settings.log_level)
+    build_scheduler().start()
+
+
+if __name__ == "__main__":
+    main()
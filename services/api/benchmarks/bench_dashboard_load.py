@@ -0,0 +1,193 @@
+"""Rows/second of the dashboard row loader: four ORM round trips vs one join.
+
+Seeds one user with N shelf items (matched, with two formats of availability
+and a realistically sized CatalogItem.raw) in an in-memory SQLite database.
+
+Usage (from services/api):
+    python -m benchmarks.bench_dashboard_load [--items 5000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timezone
+
+from app.models import (
+    Base,
+    CatalogItem,
+    CatalogMatch,
+    LibraryAvailability,
+    ShelfItem,
+    User,
+)
+from app.services.dashboard_rows import load_dashboard_items
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+
+_LIBRARY = "default"
+
+
+def _legacy_load(db: Session, user_id: str) -> dict[str, dict]:
+    """The previous loader: entities per table, chained through IN lists."""
+    items = db.execute(select(ShelfItem).where(ShelfItem.user_id == user_id)).scalars()
+    items = list(items)
+    ids = [i.id for i in items]
+    matches = {
+        m.shelf_item_id: m
+        for m in db.execute(
+            select(CatalogMatch).where(
+                CatalogMatch.user_id == user_id, CatalogMatch.shelf_item_id.in_(ids)
+            )
+        ).scalars()
+    }
+    catalog_ids = list({m.catalog_item_id for m in matches.values()})
+    catalog = {
+        c.id: c
+        for c in db.execute(
+            select(CatalogItem).where(CatalogItem.id.in_(catalog_ids))
+        ).scalars()
+    }
+    availability: dict[str, list] = {}
+    for a in db.execute(
+        select(LibraryAvailability)
+        .where(
+            LibraryAvailability.library_system == _LIBRARY,
+            LibraryAvailability.catalog_item_id.in_(catalog_ids),
+        )
+        .order_by(LibraryAvailability.format)
+    ).scalars():
+        availability.setdefault(a.catalog_item_id, []).append(a)
+
+    out: dict[str, dict] = {}
+    for item in items:
+        m = matches.get(item.id)
+        c = catalog.get(m.catalog_item_id) if m else None
+        out[item.id] = {
+            "shelf_source_id": item.shelf_source_id,
+            "title": item.title,
+            "title_key": item.title.lower(),
+            "author": item.author,
+            "shelf": item.shelf,
+            "needs_fuzzy_match": item.needs_fuzzy_match,
+            "match": (
+                {
+                    "catalog_item_id": c.id,
+                    "provider": m.provider,
+                    "provider_item_id": c.provider_item_id,
+                    "method": m.method,
+                    "confidence": m.confidence,
+                }
+                if m and c
+                else None
+            ),
+            "availability": [
+                {
+                    "format": a.format,
+                    "status": a.status,
+                    "copies_available": a.copies_available,
+                    "copies_total": a.copies_total,
+                    "holds": a.holds,
+                    "deep_link": a.deep_link,
+                    "last_checked_at": a.last_checked_at.isoformat(),
+                }
+                for a in (availability.get(c.id, []) if c else [])
+            ],
+            "item_updated_at": item.updated_at,
+        }
+    return out
+
+
+def _seed(db: Session, n: int) -> str:
+    user = User(email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    now = datetime.now(timezone.utc)
+    raw = {"description": "x" * 2000, "subjects": ["fiction"] * 20}
+    for i in range(n):
+        item = ShelfItem(
+            id=f"si-{i:06d}",
+            user_id=user.id,
+            title=f"Book {i}",
+            author=f"Author {i % 97}",
+            normalized_title=f"book {i}",
+            normalized_author=f"author {i % 97}",
+            shelf="to-read",
+        )
+        catalog = CatalogItem(
+            id=f"ci-{i:06d}",
+            provider="bench",
+            provider_item_id=f"p{i}",
+            title=item.title,
+            raw=raw,
+        )
+        db.add_all([item, catalog])
+        if i % 10 == 0:
+            continue  # some unmatched items
+        db.add(
+            CatalogMatch(
+                user_id=user.id,
+                shelf_item_id=item.id,
+                catalog_item_id=catalog.id,
+                provider="bench",
+                method="isbn",
+                confidence=1.0,
+            )
+        )
+        for fmt, status in (("audiobook", "hold"), ("ebook", "available")):
+            db.add(
+                LibraryAvailability(
+                    library_system=_LIBRARY,
+                    catalog_item_id=catalog.id,
+                    format=fmt,
+                    status=status,
+                    copies_available=i % 3,
+                    copies_total=3,
+                    holds=i % 40,
+                    last_checked_at=now,
+                )
+            )
+    db.commit()
+    return user.id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    make_session = sessionmaker(bind=engine)
+    with make_session() as db:
+        user_id = _seed(db, args.items)
+
+    def timed(fn) -> tuple[dict, float]:
+        best = float("inf")
+        out: dict = {}
+        for _ in range(args.repeat):
+            with make_session() as db:  # cold identity map each run
+                t0 = time.perf_counter()
+                out = fn(db)
+                best = min(best, time.perf_counter() - t0)
+        return out, best
+
+    legacy, legacy_s = timed(lambda db: _legacy_load(db, user_id))
+    joined, joined_s = timed(
+        lambda db: load_dashboard_items(db, user_id=user_id, library_system=_LIBRARY)
+    )
+    assert joined == legacy, "loaders disagree"
+
+    print(f"items:           {args.items}")
+    print(
+        f"4 ORM queries:   {legacy_s * 1000:.1f} ms ({args.items / legacy_s:,.0f} rows/s)"
+    )
+    print(
+        f"1 joined query:  {joined_s * 1000:.1f} ms ({args.items / joined_s:,.0f} rows/s)"
+    )
+    print(f"speedup:         {legacy_s / joined_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Compare indexed vs. linear FixtureProvider.search on a synthetic catalog.
+
+Usage (from services/api):
+    python -m benchmarks.bench_fixture_search [--items 100000] [--queries 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app.services.catalog.fixture_provider import FixtureProvider
+
+_SYLLABLES = ["ka", "lo", "mi", "ra", "to", "ven", "sor", "eth", "and", "qui", "bel"]
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def _synthetic_items(n: int, rng: random.Random) -> list[dict]:
+    items = []
+    for i in range(n):
+        items.append(
+            {
+                "provider_item_id": f"syn_{i}",
+                "title": " ".join(_word(rng) for _ in range(rng.randint(1, 5))),
+                "author": f"{_word(rng).title()} {_word(rng).title()}",
+                "isbn13": f"978{i:010d}",
+                "formats": {},
+            }
+        )
+    return items
+
+
+def _queries(items: list[dict], n: int, rng: random.Random) -> list[dict]:
+    out = []
+    for _ in range(n):
+        it = rng.choice(items)
+        kind = rng.random()
+        if kind < 0.2:
+            out.append({"title": None, "author": None, "isbn13": it["isbn13"]})
+        elif kind < 0.9:
+            out.append({"title": it["title"], "author": it["author"], "isbn13": None})
+        else:
+            out.append({"title": _word(rng), "author": None, "isbn13": None})
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    items = _synthetic_items(args.items, rng)
+    queries = _queries(items, args.queries, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "catalog.json"
+        path.write_text(json.dumps({"provider": "fixture", "items": items}))
+
+        t0 = time.perf_counter()
+        provider = FixtureProvider(str(path))
+        load_s = time.perf_counter() - t0
+
+    async def run_indexed() -> list[list[str]]:
+        res = []
+        for q in queries:
+            books = await provider.search(isbn10=None, **q)
+            res.append([b.provider_item_id for b in books])
+        return res
+
+    t0 = time.perf_counter()
+    indexed = asyncio.run(run_indexed())
+    indexed_s = time.perf_counter() - t0
+
+    # The linear scan is slow; time a slice and extrapolate.
+    sample = queries[: max(1, len(queries) // 10)]
+    t0 = time.perf_counter()
+    scanned = [
+        [b.provider_item_id for b in provider._search_scan(isbn10=None, **q)]
+        for q in sample
+    ]
+    scan_s = (time.perf_counter() - t0) * len(queries) / len(sample)
+
+    assert scanned == indexed[: len(sample)], "indexed results diverge from scan"
+
+    print(f"catalog items:   {args.items}")
+    print(f"load + index:    {load_s:.2f}s")
+    print(f"indexed search:  {indexed_s * 1000 / len(queries):.3f} ms/query")
+    print(f"linear scan:     {scan_s * 1000 / len(queries):.3f} ms/query (est.)")
+    print(f"speedup:         {scan_s / indexed_s:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compare batched fuzzy scoring against the per-pair SequenceMatcher loop.
+
+Usage (from services/api):
+    python -m benchmarks.bench_fuzzy_scoring [--pairs 10000] [--per-item 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from difflib import SequenceMatcher
+
+from app.services.catalog.types import ProviderBook
+from app.services.matching.scoring import score_batch
+
+_WORDS = (
+    "the of and a night sea war peace king queen house fire ice song shadow "
+    "river garden light dark city stone star lost last first secret"
+).split()
+
+
+def _legacy_norm(s: str) -> str:
+    s = s.lower().strip()
+    s = re.sub(r"[^a-z0-9\s]", " ", s)
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+
+def _legacy(queries, candidates) -> list[float]:
+    out = []
+    for (title, author), cands in zip(queries, candidates):
+        t, a = _legacy_norm(title or ""), _legacy_norm(author or "")
+        for c in cands:
+            ct, ca = _legacy_norm(c.title or ""), _legacy_norm(c.author or "")
+            ts = SequenceMatcher(None, t, ct).ratio() if t and ct else 0.0
+            au = SequenceMatcher(None, a, ca).ratio() if a and ca else 0.5
+            out.append(0.75 * ts + 0.25 * au)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pairs", type=int, default=10_000)
+    parser.add_argument("--per-item", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+
+    def phrase(lo: int, hi: int) -> str:
+        return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(lo, hi)))
+
+    # Candidate lists overlap the way popular titles do across a real shelf.
+    pool = [
+        ProviderBook(
+            provider="fixture",
+            provider_item_id=str(i),
+            title=phrase(2, 6).title() + "!",
+            author=f"{phrase(1, 1).title()}, {phrase(1, 2).title()}",
+        )
+        for i in range(2_000)
+    ]
+    n_items = args.pairs // args.per_item
+    queries = [(phrase(2, 6), phrase(2, 3)) for _ in range(n_items)]
+    candidates = [rng.sample(pool, args.per_item) for _ in range(n_items)]
+
+    t0 = time.perf_counter()
+    legacy = _legacy(queries, candidates)
+    legacy_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = score_batch(queries, candidates)
+    batch_s = time.perf_counter() - t0
+
+    assert batch.combined.tolist() == legacy, "batched scores diverge from legacy"
+
+    pairs = len(legacy)
+    print(f"pairs:           {pairs}")
+    print(f"per-pair loop:   {legacy_s * 1000:.1f} ms")
+    print(f"batched:         {batch_s * 1000:.1f} ms")
+    print(f"speedup:         {legacy_s / batch_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
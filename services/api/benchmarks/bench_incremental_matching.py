@@ -0,0 +1,101 @@
+"""Time a steady-state matching refresh against a full pass.
+
+Seeds one user with N imported books, runs a full refresh, edits a handful of
+titles and then times the incremental and full refreshes. Uses an in-memory
+SQLite database and a provider with simulated search latency.
+
+Usage (from services/api):
+    python -m benchmarks.bench_incremental_matching [--items 3000] [--changed 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from app.crud.shelf_items import list_shelf_items_needing_match
+from app.models import Base, ShelfSource, User
+from app.services.catalog.types import ProviderBook
+from app.services.matching.pipeline import match_and_persist
+from app.services.shelf_import import upsert_shelf_items
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+class _LatencyProvider:
+    name = "bench"
+
+    async def search(self, *, title, author, isbn10, isbn13, limit=10):
+        await asyncio.sleep(0.002)
+        return [
+            ProviderBook(
+                provider="bench",
+                provider_item_id=f"pid-{title}",
+                title=title,
+                author=author,
+            )
+        ]
+
+    async def availability_bulk(self, *, provider_item_ids):
+        return []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=3_000)
+    parser.add_argument("--changed", type=int, default=10)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+
+    user = User(email="bench@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    source = ShelfSource(user_id=user.id, source_type="csv", source_ref="bench")
+    db.add(source)
+    db.flush()
+
+    def rows(titles: list[str]) -> list[dict]:
+        return [
+            {"external_id": str(i), "title": t, "author": f"Author {i % 97}"}
+            for i, t in enumerate(titles)
+        ]
+
+    titles = [f"Book number {i}" for i in range(args.items)]
+    upsert_shelf_items(db, user_id=user.id, source=source, items=rows(titles))
+
+    provider = _LatencyProvider()
+
+    def refresh(full: bool) -> tuple[int, float]:
+        t0 = time.perf_counter()
+        items = list_shelf_items_needing_match(db, user_id=user.id, full=full)
+        asyncio.run(
+            match_and_persist(
+                db,
+                provider,  # type: ignore[arg-type]
+                user_id=user.id,
+                items=items,
+                concurrency=8,
+                batch_size=100,
+            )
+        )
+        return len(items), time.perf_counter() - t0
+
+    refresh(full=True)
+    for i in range(args.changed):
+        titles[i * 7] += " (revised)"
+    upsert_shelf_items(db, user_id=user.id, source=source, items=rows(titles))
+
+    n_inc, inc_s = refresh(full=False)
+    n_full, full_s = refresh(full=True)
+
+    print(f"items:           {args.items}")
+    print(f"incremental:     {n_inc} items, {inc_s * 1000:.1f} ms")
+    print(f"full:            {n_full} items, {full_s * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
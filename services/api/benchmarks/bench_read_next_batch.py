@@ -0,0 +1,73 @@
+"""Compare batched read-next scoring against per-row compute_read_next.
+
+Usage (from services/api):
+    python -m benchmarks.bench_read_next_batch [--rows 10000] [--page 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from app.services.read_next_batch import AvailabilityColumns, compute_read_next_batch
+from app.services.read_next_scoring import compute_read_next
+
+_STATUSES = ["available", "hold", "not_owned"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--page", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    preferred = ["ebook", "audiobook"]
+    rows = [
+        [
+            {
+                "format": fmt,
+                "status": rng.choice(_STATUSES),
+                "copies_available": rng.randint(0, 5),
+                "copies_total": rng.randint(0, 5),
+                "holds": rng.randint(0, 80),
+            }
+            for fmt in rng.sample(preferred, rng.randint(0, 2))
+        ]
+        for _ in range(args.rows)
+    ]
+
+    t0 = time.perf_counter()
+    legacy = [compute_read_next(r, preferred) for r in rows]
+    legacy_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    columns = AvailabilityColumns.from_rows(rows)
+    columns_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = compute_read_next_batch(columns, preferred)
+    score_s = time.perf_counter() - t0
+
+    # Reasons are only rendered for the rows of one page.
+    t0 = time.perf_counter()
+    page = [batch.result(i) for i in range(args.page)]
+    page_s = time.perf_counter() - t0
+
+    assert batch.score.tolist() == [s.score for s in legacy], "scores diverge"
+    assert page == legacy[: args.page], "results diverge"
+
+    batch_s = columns_s + score_s + page_s
+    print(f"rows:            {args.rows}")
+    print(f"per-row loop:    {legacy_s * 1000:.1f} ms")
+    print(
+        f"batched:         {batch_s * 1000:.1f} ms "
+        f"(columns {columns_s * 1000:.1f}, score {score_s * 1000:.1f}, "
+        f"reasons for {args.page} rows {page_s * 1000:.1f})"
+    )
+    print(f"speedup:         {legacy_s / batch_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
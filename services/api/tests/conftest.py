@@ -126,3 +126,112 @@ def client(db_session: Session) -> Generator[TestClient, None, None]:
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis-py calls the app makes.
+
+    TTLs are recorded but not enforced. Tests patch it in where a module
+    imported `get_redis`.
+    """
+
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.streams: dict[str, list[tuple[str, dict[str, str]]]] = {}
+        self.published: list[tuple[str, str]] = []
+        self.ttls: dict[str, int] = {}
+
+    def get(self, key: str):
+        return self.store.get(key)
+
+    def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+    def set(self, key: str, value, ex=None, nx: bool = False):
+        if nx and key in self.store:
+            return None
+        self.store[key] = str(value)
+        self.ttls.pop(key, None)
+        if ex is not None:
+            self.ttls[key] = ex
+        return True
+
+    def setex(self, key: str, ttl: int, value) -> bool:
+        self.store[key] = str(value)
+        self.ttls[key] = ttl
+        return True
+
+    def delete(self, *keys: str) -> int:
+        for k in keys:
+            self.ttls.pop(k, None)
+        return sum(1 for k in keys if self.store.pop(k, None) is not None)
+
+    def incrby(self, key: str, amount: int = 1) -> int:
+        value = int(self.store.get(key, 0)) + amount
+        self.store[key] = str(value)
+        return value
+
+    def ttl(self, key: str) -> int:
+        if key not in self.store:
+            return -2
+        return self.ttls.get(key, -1)
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        h = self.hashes.setdefault(key, {})
+        h[field] = str(int(h.get(field, 0)) + amount)
+        return int(h[field])
+
+    def hgetall(self, key: str) -> dict[str, str]:
+        return dict(self.hashes.get(key, {}))
+
+    def expire(self, key: str, ttl: int) -> bool:
+        if key in self.store:
+            self.ttls[key] = ttl
+        return True
+
+    def publish(self, channel: str, message: str) -> int:
+        self.published.append((channel, message))
+        return 0
+
+    def xadd(self, key: str, fields: dict, maxlen=None, approximate=True) -> str:
+        entries = self.streams.setdefault(key, [])
+        entry_id = f"{len(entries) + 1}-0"
+        entries.append((entry_id, {k: str(v) for k, v in fields.items()}))
+        if maxlen is not None:
+            del entries[:-maxlen]
+        return entry_id
+
+    def xrange(self, key: str, min="-", max="+", count=None):
+        after = int(min[1:].split("-")[0]) if min.startswith("(") else 0
+        entries = [
+            e for e in self.streams.get(key, []) if int(e[0].split("-")[0]) > after
+        ]
+        return entries[:count] if count else entries
+
+    def pipeline(self, transaction: bool = True) -> "_FakePipeline":
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._calls: list = []
+
+    def __getattr__(self, name: str):
+        fn = getattr(self._redis, name)
+
+        def _queue(*args, **kwargs):
+            self._calls.append((fn, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self) -> list:
+        calls, self._calls = self._calls, []
+        return [fn(*args, **kwargs) for fn, args, kwargs in calls]
+
+
+@pytest.fixture()
+def fake_redis() -> FakeRedis:
+    return FakeRedis()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from app.workers.async_utils import AsyncRuntime, run_async
+
+
+def test_runtime_reuses_one_loop_across_calls():
+    runtime = AsyncRuntime()
+    try:
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = runtime.run(current_loop())
+        second = runtime.run(current_loop())
+        assert first is second
+
+        futures = [runtime.submit(asyncio.sleep(0.01, result=i)) for i in range(5)]
+        assert [f.result(timeout=1) for f in futures] == list(range(5))
+    finally:
+        runtime.shutdown()
+
+
+def test_runtime_rejects_blocking_submit_from_its_own_loop():
+    runtime = AsyncRuntime()
+    try:
+
+        async def nested():
+            with pytest.raises(RuntimeError):
+                runtime.submit(asyncio.sleep(0))
+            return threading.current_thread().name
+
+        assert runtime.run(nested()) == "async-runtime"
+    finally:
+        runtime.shutdown()
+
+
+async def test_run_async_works_while_caller_loop_is_running():
+    async def answer():
+        return 42
+
+    assert run_async(answer()) == 42
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from app.models import CatalogItem, CatalogMatch, ShelfItem, User, UserSettings
+from app.providers.factory import get_provider
+from app.services.availability_cache import get_availability_cached
+from app.services.catalog.types import AvailabilityStatus, Format, ProviderAvailability
+
+
+class CountingCatalog:
+    name = "fixture"
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    async def search(self, **kwargs):
+        return []
+
+    async def availability_bulk(self, *, provider_item_ids):
+        self.calls.append(list(provider_item_ids))
+        return [
+            ProviderAvailability(
+                provider="fixture",
+                provider_item_id=pid,
+                format=Format.ebook,
+                status=AvailabilityStatus.available,
+                copies_available=1,
+                copies_total=1,
+            )
+            for pid in provider_item_ids
+        ]
+
+
+def _user_owning(db_session, email: str, catalog_item: CatalogItem) -> User:
+    user = User(email=email, password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserSettings(user_id=user.id, library_system="springfield"))
+    item = ShelfItem(
+        user_id=user.id,
+        title="Dune",
+        author="Frank Herbert",
+        normalized_title="dune",
+        normalized_author="frank herbert",
+    )
+    db_session.add(item)
+    db_session.flush()
+    db_session.add(
+        CatalogMatch(
+            user_id=user.id,
+            shelf_item_id=item.id,
+            catalog_item_id=catalog_item.id,
+            provider="fixture",
+            method="isbn",
+            confidence=1.0,
+            evidence={},
+        )
+    )
+    db_session.commit()
+    return user
+
+
+def test_same_library_users_share_one_provider_call(
+    db_session, fake_redis, monkeypatch
+):
+    catalog = CountingCatalog()
+    monkeypatch.setattr("app.providers.factory.get_catalog_provider", lambda: catalog)
+    monkeypatch.setattr("app.services.availability_cache.get_redis", lambda: fake_redis)
+
+    ci = CatalogItem(provider="fixture", provider_item_id="dune-1", title="Dune")
+    db_session.add(ci)
+    db_session.flush()
+    alice = _user_owning(db_session, "a@example.com", ci)
+    bob = _user_owning(db_session, "b@example.com", ci)
+
+    results = {}
+    stats = {}
+    for user in (alice, bob):
+        provider = get_provider(db_session, user.id)
+        assert provider.library_system == "springfield"
+        items = db_session.query(ShelfItem).filter_by(user_id=user.id).all()
+        results[user.id] = provider.availability_bulk(items)
+        stats[user.id] = (provider.cache_stats.hits, provider.cache_stats.misses)
+
+    assert catalog.calls == [["dune-1"]]
+    assert stats == {alice.id: (0, 1), bob.id: (1, 0)}
+
+    # Formats the provider did not report are cached (and returned) as not_owned.
+    by_format = {r.availability.format: r.availability.status for r in results[bob.id]}
+    assert by_format == {
+        Format.ebook: AvailabilityStatus.available,
+        Format.audiobook: AvailabilityStatus.not_owned,
+    }
+
+
+class _DownPipeline:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        raise ConnectionError("redis down")
+
+
+class _DownRedis:
+    def pipeline(self, transaction=True):
+        return _DownPipeline()
+
+
+def test_cache_fails_open_when_redis_errors(monkeypatch):
+    catalog = CountingCatalog()
+    monkeypatch.setattr(
+        "app.services.availability_cache.get_redis", lambda: _DownRedis()
+    )
+
+    out = get_availability_cached(
+        library_system="springfield",
+        provider_item_ids=["dune-1"],
+        formats=["ebook"],
+        provider=catalog,  # type: ignore[arg-type]
+    )
+
+    assert catalog.calls == [["dune-1"]]
+    assert out[("dune-1", "ebook")].availability.status == AvailabilityStatus.available
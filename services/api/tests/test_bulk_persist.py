@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from app.models import CatalogItem, CatalogMatch, LibraryAvailability, ShelfItem, User
+from app.providers.types import AvailabilityResult
+from app.services.catalog.types import (
+    AvailabilityStatus,
+    Format,
+    ProviderAvailability,
+    ProviderBook,
+)
+from app.services.matching.persist import (
+    MatchUpsert,
+    bulk_upsert_catalog_items,
+    bulk_upsert_library_availability,
+    bulk_upsert_matches,
+)
+from sqlalchemy import select
+
+
+def _book(pid: str, title: str) -> ProviderBook:
+    return ProviderBook(provider="fixture", provider_item_id=pid, title=title)
+
+
+def test_bulk_upsert_catalog_items_returns_stable_ids(db_session):
+    first = bulk_upsert_catalog_items(
+        db_session, [_book("a", "A"), _book("b", "B"), _book("a", "A (dup)")]
+    )
+    assert set(first) == {("fixture", "a"), ("fixture", "b")}
+
+    second = bulk_upsert_catalog_items(
+        db_session, [_book("b", "B revised"), _book("c", "C")]
+    )
+    assert second[("fixture", "b")] == first[("fixture", "b")]
+
+    rows = {
+        ci.provider_item_id: ci.title
+        for ci in db_session.execute(select(CatalogItem)).scalars()
+    }
+    assert rows == {"a": "A (dup)", "b": "B revised", "c": "C"}
+
+
+def test_bulk_upsert_matches_and_library_availability(db_session):
+    user = User(email="bulk@example.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    shelf = ShelfItem(
+        user_id=user.id,
+        title="A",
+        author="Z",
+        normalized_title="a",
+        normalized_author="z",
+    )
+    db_session.add(shelf)
+    db_session.flush()
+
+    catalog_ids = bulk_upsert_catalog_items(db_session, [_book("a", "A")])
+    cid = catalog_ids[("fixture", "a")]
+
+    def _match(confidence: float) -> MatchUpsert:
+        return MatchUpsert(
+            user_id=user.id,
+            shelf_item_id=shelf.id,
+            catalog_item_id=cid,
+            provider="fixture",
+            method="fuzzy",
+            confidence=confidence,
+            evidence={},
+        )
+
+    m1 = bulk_upsert_matches(db_session, [_match(0.8)])
+    m2 = bulk_upsert_matches(db_session, [_match(0.9)])
+    assert m1 == m2
+    assert db_session.execute(select(CatalogMatch.confidence)).scalar_one() == 0.9
+
+    def _avail(status: AvailabilityStatus) -> AvailabilityResult:
+        return AvailabilityResult(
+            catalog_item_id=cid,
+            availability=ProviderAvailability(
+                provider="fixture",
+                provider_item_id="a",
+                format=Format.ebook,
+                status=status,
+            ),
+        )
+
+    checked_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    s1 = bulk_upsert_library_availability(
+        db_session,
+        library_system="springfield",
+        results=[_avail(AvailabilityStatus.hold)],
+        checked_at=checked_at,
+    )
+    s2 = bulk_upsert_library_availability(
+        db_session,
+        library_system="springfield",
+        results=[_avail(AvailabilityStatus.available)],
+        checked_at=checked_at,
+    )
+    assert list(s1) == [(cid, "ebook")]
+    assert s1 == s2
+    assert (
+        db_session.execute(select(LibraryAvailability.status)).scalar_one()
+        == "available"
+    )
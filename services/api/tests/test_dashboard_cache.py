@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+
+def test_dashboard_etag_cache_and_invalidation(client, fake_redis, monkeypatch):
+    monkeypatch.setattr("app.services.dashboard_cache.get_redis", lambda: fake_redis)
+    client.post(
+        "/v1/auth/signup", json={"email": "etag@example.com", "password": "password123"}
+    )
+
+    first = client.get("/v1/dashboard")
+    assert first.status_code == 200
+    assert first.headers["x-cache"] == "MISS"
+    etag = first.headers["etag"]
+
+    second = client.get("/v1/dashboard")
+    assert second.headers["x-cache"] == "HIT"
+    assert second.headers["etag"] == etag
+    assert second.json() == first.json()
+
+    revalidated = client.get("/v1/dashboard", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+    # Other pages have their own validators.
+    other = client.get("/v1/dashboard", params={"sort": "title"})
+    assert other.headers["etag"] != etag
+
+    assert client.patch(
+        "/v1/settings", json={"notifications_enabled": False}
+    ).is_success
+    after = client.get("/v1/dashboard", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["etag"] != etag
+
+    stats = client.get("/health/dashboard-cache").json()
+    assert stats == {"hits": 1, "misses": 3, "not_modified": 1, "hit_ratio": 0.4}
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import pytest
+from app.api.routes.dashboard_build import build_dashboard_changes_out
+from app.core.config import settings
+from app.models import DashboardTombstone, ShelfSource, User
+from app.services.dashboard_rows import refresh_dashboard_rows, remove_source_rows
+from app.services.shelf_import import upsert_shelf_items
+from fastapi import HTTPException
+
+
+def test_changes_return_changed_rows_and_tombstones(db_session):
+    user = User(email="changes@example.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    source = ShelfSource(user_id=user.id, source_type="csv", source_ref="x")
+    db_session.add(source)
+    db_session.flush()
+
+    upsert_shelf_items(
+        db_session,
+        user_id=user.id,
+        source=source,
+        items=[
+            {"external_id": "1", "title": "Dune", "author": "Herbert"},
+            {"external_id": "2", "title": "Emma", "author": "Austen"},
+        ],
+    )
+    db_session.commit()
+
+    first = build_dashboard_changes_out(db=db_session, user=user, since=0)
+    assert sorted(r.title for r in first.items) == ["Dune", "Emma"]
+    assert first.deleted == []
+
+    # A rebuild that changes nothing stamps no rows.
+    refresh_dashboard_rows(db_session, user_id=user.id)
+    db_session.commit()
+    same = build_dashboard_changes_out(db=db_session, user=user, since=first.version)
+    assert same.items == [] and same.version > first.version
+
+    upsert_shelf_items(
+        db_session,
+        user_id=user.id,
+        source=source,
+        items=[{"external_id": "1", "title": "Dune Messiah", "author": "Herbert"}],
+    )
+    db_session.commit()
+    edited = build_dashboard_changes_out(db=db_session, user=user, since=same.version)
+    assert [r.title for r in edited.items] == ["Dune Messiah"]
+
+    ids = {r.shelf_item_id for r in first.items}
+    remove_source_rows(db_session, user_id=user.id, shelf_source_id=source.id)
+    db_session.delete(source)
+    db_session.commit()
+    gone = build_dashboard_changes_out(db=db_session, user=user, since=edited.version)
+    assert gone.items == [] and set(gone.deleted) == ids
+
+    with pytest.raises(HTTPException) as exc:
+        build_dashboard_changes_out(db=db_session, user=user, since=gone.version + 1)
+    assert exc.value.status_code == 409
+
+
+def test_expired_tombstones_are_pruned_and_old_versions_rejected(
+    db_session, monkeypatch
+):
+    user = User(email="expired@example.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    source = ShelfSource(user_id=user.id, source_type="csv", source_ref="x")
+    db_session.add(source)
+    db_session.flush()
+    upsert_shelf_items(
+        db_session,
+        user_id=user.id,
+        source=source,
+        items=[{"external_id": "1", "title": "Dune", "author": "Herbert"}],
+    )
+    db_session.commit()
+    before = build_dashboard_changes_out(db=db_session, user=user, since=0)
+
+    remove_source_rows(db_session, user_id=user.id, shelf_source_id=source.id)
+    db_session.commit()
+    assert db_session.query(DashboardTombstone).count() == 1
+
+    # With no retention, the next removal prunes every tombstone.
+    other = ShelfSource(user_id=user.id, source_type="csv", source_ref="y")
+    db_session.add(other)
+    db_session.flush()
+    upsert_shelf_items(
+        db_session,
+        user_id=user.id,
+        source=other,
+        items=[{"external_id": "2", "title": "Emma", "author": "Austen"}],
+    )
+    db_session.commit()
+    monkeypatch.setattr(settings, "dashboard_tombstone_retention_secs", -1)
+    remove_source_rows(db_session, user_id=user.id, shelf_source_id=other.id)
+    db_session.commit()
+    assert db_session.query(DashboardTombstone).count() == 0
+    db_session.refresh(user)
+    assert user.changes_floor > before.version
+
+    with pytest.raises(HTTPException) as exc:
+        build_dashboard_changes_out(db=db_session, user=user, since=before.version)
+    assert exc.value.status_code == 410
+    build_dashboard_changes_out(db=db_session, user=user, since=user.changes_floor)
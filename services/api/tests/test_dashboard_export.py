@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+from app.models import ShelfSource, User
+from app.services.shelf_import import upsert_shelf_items
+from sqlalchemy import select
+
+
+def test_export_streams_every_row_as_ndjson_and_csv(client, db_session, monkeypatch):
+    monkeypatch.setattr("app.api.routes.dashboard_build.EXPORT_BATCH_SIZE", 2)
+    client.post(
+        "/v1/auth/signup",
+        json={"email": "export@example.com", "password": "password123"},
+    )
+    user = db_session.execute(
+        select(User).where(User.email == "export@example.com")
+    ).scalar_one()
+    source = ShelfSource(user_id=user.id, source_type="csv", source_ref="x")
+    db_session.add(source)
+    db_session.flush()
+    upsert_shelf_items(
+        db_session,
+        user_id=user.id,
+        source=source,
+        items=[
+            {"external_id": str(i), "title": f"Book {i}", "author": "Author"}
+            for i in range(5)
+        ],
+    )
+    db_session.commit()
+
+    resp = client.get("/v1/dashboard/export")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert sorted(r["title"] for r in lines) == [f"Book {i}" for i in range(5)]
+    assert lines[0]["read_next"]["tier"] == "not_owned"
+
+    resp = client.get("/v1/dashboard/export", params={"format": "csv"})
+    assert resp.status_code == 200
+    assert "shelfsync-shelf.csv" in resp.headers["content-disposition"]
+    records = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [r["shelf_item_id"] for r in records] == [r["shelf_item_id"] for r in lines]
+    assert records[0]["read_next_tier"] == "not_owned"
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from app.api.pagination import encode_cursor
+from app.api.routes.dashboard_build import build_dashboard_out
+from app.api.routes.dashboard_queries import DashboardFilters
+from app.models import (
+    CatalogItem,
+    CatalogMatch,
+    LibraryAvailability,
+    ShelfItem,
+    ShelfSource,
+    User,
+)
+from fastapi import HTTPException
+
+
+def _seed(db_session) -> User:
+    user = User(email="pages@example.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    source = ShelfSource(user_id=user.id, source_type="csv", source_ref="x")
+    db_session.add(source)
+    db_session.flush()
+
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    statuses = ["available", "hold", None, "available", "not_owned", None, "hold"]
+    for i, status in enumerate(statuses):
+        item = ShelfItem(
+            user_id=user.id,
+            shelf_source_id=source.id,
+            external_id=f"ext-{i}",
+            title=f"Title {(i * 3) % 7}",
+            author="Author",
+            normalized_title=f"title {i}",
+            normalized_author="author",
+            updated_at=base + timedelta(days=i % 3),
+        )
+        db_session.add(item)
+        db_session.flush()
+        if status is None:
+            continue
+        catalog = CatalogItem(
+            provider="fixture", provider_item_id=f"pid-{i}", title=item.title
+        )
+        db_session.add(catalog)
+        db_session.flush()
+        db_session.add(
+            CatalogMatch(
+                user_id=user.id,
+                shelf_item_id=item.id,
+                catalog_item_id=catalog.id,
+                provider="fixture",
+                method="isbn",
+                confidence=1.0,
+            )
+        )
+        db_session.add(
+            LibraryAvailability(
+                library_system="default",
+                catalog_item_id=catalog.id,
+                format="ebook",
+                status=status,
+                copies_available=1 if status == "available" else 0,
+                copies_total=1,
+                holds=i,
+                last_checked_at=base,
+            )
+        )
+    db_session.commit()
+    return user
+
+
+@pytest.mark.parametrize("sort", ["read_next", "title", "updated"])
+def test_cursor_pages_match_offset_pages(db_session, sort):
+    user = _seed(db_session)
+
+    full = build_dashboard_out(db=db_session, user=user, limit=50, offset=0, sort=sort)
+    expected = [r.shelf_item_id for r in full.items]
+    assert full.page.total == 7 and full.page.next_cursor is None
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        out = build_dashboard_out(
+            db=db_session, user=user, limit=3, offset=0, sort=sort, cursor=cursor
+        )
+        assert out.page.total == 7
+        seen.extend(r.shelf_item_id for r in out.items)
+        cursor = out.page.next_cursor
+        if cursor is None:
+            break
+    assert seen == expected
+
+    by_offset = build_dashboard_out(
+        db=db_session, user=user, limit=3, offset=3, sort=sort
+    )
+    assert [r.shelf_item_id for r in by_offset.items] == expected[3:6]
+
+
+def test_cursor_for_another_sort_is_rejected(db_session):
+    user = _seed(db_session)
+    out = build_dashboard_out(db=db_session, user=user, limit=2, offset=0, sort="title")
+    assert out.page.next_cursor
+
+    with pytest.raises(HTTPException) as exc:
+        build_dashboard_out(
+            db=db_session,
+            user=user,
+            limit=2,
+            offset=0,
+            sort="updated",
+            cursor=out.page.next_cursor,
+        )
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "sort,values",
+    [
+        ("read_next", ["high", "id"]),
+        ("title", [None, "id"]),
+        ("updated", ["yesterday", "id"]),
+        ("updated", [0, "id"]),
+    ],
+)
+def test_cursor_with_bad_values_is_rejected(db_session, sort, values):
+    user = _seed(db_session)
+    with pytest.raises(HTTPException) as exc:
+        build_dashboard_out(
+            db=db_session,
+            user=user,
+            limit=2,
+            offset=0,
+            sort=sort,
+            cursor=encode_cursor(sort, values),
+        )
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "filters,expected",
+    [
+        (DashboardFilters(tier="available", format="ebook"), 2),
+        (DashboardFilters(tier="available", format="audiobook"), 0),
+        (DashboardFilters(format="ebook"), 4),
+        (DashboardFilters(tier="hold", format="ebook"), 2),
+        (DashboardFilters(tier="not_owned"), 3),
+        (DashboardFilters(unmatched=True), 2),
+        (DashboardFilters(needs_fuzzy_match=False, shelf="to-read"), 0),
+    ],
+)
+def test_filters_narrow_total_and_pages(db_session, filters, expected):
+    user = _seed(db_session)
+
+    out = build_dashboard_out(
+        db=db_session, user=user, limit=1, offset=0, sort="title", filters=filters
+    )
+    assert out.page.total == expected
+
+    seen = [r.shelf_item_id for r in out.items]
+    cursor = out.page.next_cursor
+    while cursor is not None:
+        out = build_dashboard_out(
+            db=db_session,
+            user=user,
+            limit=1,
+            offset=0,
+            sort="title",
+            cursor=cursor,
+            filters=filters,
+        )
+        seen.extend(r.shelf_item_id for r in out.items)
+        cursor = out.page.next_cursor
+    assert len(set(seen)) == expected
+    if filters.unmatched:
+        assert all(r.match is None for r in out.items)
+
+
+def test_format_filter_matches_every_carried_format(db_session):
+    user = User(email="formats@example.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    item = ShelfItem(
+        user_id=user.id,
+        title="Dune",
+        author="Herbert",
+        normalized_title="dune",
+        normalized_author="herbert",
+    )
+    catalog = CatalogItem(provider="fixture", provider_item_id="dune", title="Dune")
+    db_session.add_all([item, catalog])
+    db_session.flush()
+    db_session.add(
+        CatalogMatch(
+            user_id=user.id,
+            shelf_item_id=item.id,
+            catalog_item_id=catalog.id,
+            provider="fixture",
+            method="isbn",
+            confidence=1.0,
+        )
+    )
+    for fmt, status in (("ebook", "available"), ("audiobook", "hold")):
+        db_session.add(
+            LibraryAvailability(
+                library_system="default",
+                catalog_item_id=catalog.id,
+                format=fmt,
+                status=status,
+                holds=1,
+                last_checked_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            )
+        )
+    db_session.commit()
+
+    def _total(filters: DashboardFilters) -> int:
+        out = build_dashboard_out(
+            db=db_session, user=user, limit=10, offset=0, sort="title", filters=filters
+        )
+        return out.page.total
+
+    # The row's best format is the ebook; it is still carried as an audiobook.
+    assert _total(DashboardFilters(format="audiobook")) == 1
+    assert _total(DashboardFilters(tier="available", format="audiobook")) == 0
+    assert _total(DashboardFilters(tier="available", format="ebook")) == 1
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from app.crud.availability import upsert_snapshots
+from app.models import (
+    CatalogItem,
+    CatalogMatch,
+    DashboardRow,
+    ShelfItem,
+    ShelfSource,
+    User,
+    UserSettings,
+)
+from app.providers.types import AvailabilityResult
+from app.services.catalog.types import AvailabilityStatus, Format, ProviderAvailability
+from app.services.dashboard_rows import refresh_dashboard_rows
+from app.services.shelf_import import upsert_shelf_items
+from app.workers.backfill_dashboard import backfill_dashboard_rows
+from sqlalchemy import select
+
+
+def _availability(status: AvailabilityStatus, fmt: Format = Format.ebook):
+    return ProviderAvailability(
+        provider="fixture",
+        provider_item_id="p1",
+        format=fmt,
+        status=status,
+        copies_available=1 if status == AvailabilityStatus.available else 0,
+        copies_total=1,
+        holds=0,
+        deep_link=None,
+    )
+
+
+def test_rows_follow_imports_availability_and_settings(db_session):
+    user = User(email="rows@example.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserSettings(user_id=user.id, preferred_formats=["ebook"]))
+    source = ShelfSource(user_id=user.id, source_type="csv", source_ref="x")
+    db_session.add(source)
+    db_session.flush()
+
+    upsert_shelf_items(
+        db_session,
+        user_id=user.id,
+        source=source,
+        items=[{"external_id": "1", "title": "Dune", "author": "Herbert"}],
+    )
+    row = db_session.execute(select(DashboardRow)).scalar_one()
+    assert (row.title, row.match, row.read_next_tier) == ("Dune", None, "not_owned")
+
+    db_session.add(
+        CatalogItem(id="c1", provider="fixture", provider_item_id="p1", title="Dune")
+    )
+    db_session.add(
+        CatalogMatch(
+            user_id=user.id,
+            shelf_item_id=row.shelf_item_id,
+            catalog_item_id="c1",
+            provider="fixture",
+            method="isbn",
+            confidence=1.0,
+        )
+    )
+    db_session.flush()
+
+    upsert_snapshots(
+        db_session,
+        user_id=user.id,
+        results=[
+            AvailabilityResult(
+                catalog_item_id="c1",
+                availability=_availability(AvailabilityStatus.available),
+            ),
+            AvailabilityResult(
+                catalog_item_id="c1",
+                availability=_availability(AvailabilityStatus.hold, Format.audiobook),
+            ),
+        ],
+    )
+    db_session.commit()
+    db_session.refresh(row)
+    assert row.match["catalog_item_id"] == "c1"
+    assert [a["format"] for a in row.availability] == ["audiobook", "ebook"]
+    assert (row.read_next_tier, row.best_format) == ("available", "ebook")
+
+    settings = db_session.get(UserSettings, user.id)
+    settings.preferred_formats = ["audiobook"]
+    refresh_dashboard_rows(db_session, user_id=user.id)
+    db_session.commit()
+    db_session.refresh(row)
+    assert (row.read_next_tier, row.best_format) == ("hold", "audiobook")
+
+
+def test_backfill_builds_rows_for_users_without_them(db_session):
+    user = User(email="backfill@example.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    for i in range(3):
+        db_session.add(
+            ShelfItem(
+                user_id=user.id,
+                title=f"Book {i}",
+                author="Author",
+                normalized_title=f"book {i}",
+                normalized_author="author",
+            )
+        )
+    db_session.commit()
+
+    assert backfill_dashboard_rows(db_session) == 1
+    rows = db_session.execute(select(DashboardRow)).scalars().all()
+    assert len(rows) == 3
+    assert {r.read_next_tier for r in rows} == {"not_owned"}
+
+    assert backfill_dashboard_rows(db_session) == 0
+    assert backfill_dashboard_rows(db_session, only_missing=False) == 1
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from app.models import (
+    CatalogItem,
+    CatalogMatch,
+    LibraryAvailability,
+    ShelfItem,
+    ShelfSource,
+    User,
+)
+from app.services.dashboard_rows import refresh_dashboard_rows
+from app.services.shelf_import import upsert_shelf_items
+from sqlalchemy import select
+
+
+def test_summary_counts_tiers_and_shelves_and_is_cached(
+    client, db_session, fake_redis, monkeypatch
+):
+    monkeypatch.setattr("app.services.dashboard_cache.get_redis", lambda: fake_redis)
+    client.post(
+        "/v1/auth/signup",
+        json={"email": "summary@example.com", "password": "password123"},
+    )
+    user = db_session.execute(
+        select(User).where(User.email == "summary@example.com")
+    ).scalar_one()
+    source = ShelfSource(user_id=user.id, source_type="csv", source_ref="x")
+    db_session.add(source)
+    db_session.flush()
+    upsert_shelf_items(
+        db_session,
+        user_id=user.id,
+        source=source,
+        items=[
+            {"external_id": "1", "title": "Dune", "author": "A", "shelf": "to-read"},
+            {"external_id": "2", "title": "Emma", "author": "B", "shelf": "to-read"},
+            {"external_id": "3", "title": "Ulysses", "author": "C", "shelf": "read"},
+        ],
+    )
+    dune = db_session.execute(
+        select(ShelfItem).where(ShelfItem.title == "Dune")
+    ).scalar_one()
+    db_session.add(
+        CatalogItem(id="c1", provider="fixture", provider_item_id="p1", title="Dune")
+    )
+    db_session.add(
+        CatalogMatch(
+            user_id=user.id,
+            shelf_item_id=dune.id,
+            catalog_item_id="c1",
+            provider="fixture",
+            method="isbn",
+            confidence=1.0,
+        )
+    )
+    db_session.add(
+        LibraryAvailability(
+            library_system="default",
+            catalog_item_id="c1",
+            format="ebook",
+            status="available",
+            copies_available=1,
+            copies_total=1,
+            holds=0,
+            last_checked_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        )
+    )
+    refresh_dashboard_rows(db_session, user_id=user.id)
+    db_session.commit()
+
+    first = client.get("/v1/dashboard/summary")
+    assert first.status_code == 200
+    assert first.headers["x-cache"] == "MISS"
+    body = first.json()
+    assert body["counts"] == {
+        "total": 3,
+        "available": 1,
+        "hold": 0,
+        "not_owned": 2,
+        "unmatched": 2,
+    }
+    assert [(s["shelf"], s["total"], s["available"]) for s in body["shelves"]] == [
+        ("read", 1, 0),
+        ("to-read", 2, 1),
+    ]
+
+    second = client.get("/v1/dashboard/summary")
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == body
+    etag = first.headers["etag"]
+    assert (
+        client.get("/v1/dashboard/summary", headers={"If-None-Match": etag}).status_code
+        == 304
+    )
@@ -0,0 +1,73 @@
+import json
+import random
+
+import pytest
+from app.core.config import DEFAULT_FIXTURE_CATALOG_PATH
+from app.services.catalog.fixture_provider import FixtureProvider
+
+_WORDS = ["the", "hobbit", "war", "peace", "dune", "a", "of", "night", "sea", "x"]
+
+
+def _write_catalog(tmp_path, n: int) -> str:
+    rng = random.Random(7)
+    items = []
+    for i in range(n):
+        items.append(
+            {
+                "provider_item_id": f"p{i}",
+                "title": " ".join(rng.choice(_WORDS) for _ in range(3)).title() + "!",
+                "author": f"{rng.choice(_WORDS)}, {rng.choice(_WORDS)}",
+                "isbn13": f"978-{i % 50:010d}",
+                "isbn10": f"{i % 40:09d}X" if i % 3 else None,
+                "formats": {},
+            }
+        )
+    fixture = tmp_path / "catalog.json"
+    fixture.write_text(json.dumps({"provider": "fixture", "items": items}))
+    return str(fixture)
+
+
+@pytest.mark.asyncio
+async def test_indexed_search_matches_linear_scan(tmp_path):
+    provider = FixtureProvider(_write_catalog(tmp_path, 400))
+
+    queries = [
+        {"title": "Hobbit", "author": "Sea"},
+        {"title": "the war", "author": None},
+        {"title": "of", "author": None},
+        {"title": "Dune Dune!", "author": None},
+        {"title": None, "author": "night, a"},
+        {"title": None, "author": "x"},
+        {"title": "", "author": ""},
+        {"title": "nothing like this", "author": "sea"},
+    ]
+    isbns = [
+        {"isbn13": None, "isbn10": None},
+        {"isbn13": "9780000000007", "isbn10": None},
+        {"isbn13": None, "isbn10": "000000012x"},
+    ]
+
+    for q in queries:
+        for isbn in isbns:
+            for limit in (1, 10, 1000):
+                kwargs = {**q, **isbn, "limit": limit}
+                got = await provider.search(**kwargs)
+                want = provider._search_scan(**kwargs)
+                assert [b.provider_item_id for b in got] == [
+                    b.provider_item_id for b in want
+                ], kwargs
+
+
+@pytest.mark.asyncio
+async def test_availability_bulk_keeps_catalog_order():
+    provider = FixtureProvider(str(DEFAULT_FIXTURE_CATALOG_PATH))
+
+    got = await provider.availability_bulk(
+        provider_item_ids=["fx_002", "missing", "fx_001"]
+    )
+    assert [(a.provider_item_id, a.format.value) for a in got] == [
+        ("fx_001", "ebook"),
+        ("fx_001", "audiobook"),
+        ("fx_002", "ebook"),
+        ("fx_002", "audiobook"),
+    ]
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from app.crud.shelf_items import list_shelf_items_needing_match
+from app.models import ShelfItem, ShelfSource, User
+from app.services.catalog.types import ProviderBook
+from app.services.matching.pipeline import match_and_persist
+from app.services.shelf_import import upsert_shelf_items
+
+
+class EchoProvider:
+    name = "fixture"
+
+    async def search(self, *, title, author, isbn10, isbn13, limit=10):
+        return [
+            ProviderBook(
+                provider="fixture",
+                provider_item_id=f"pid-{title}",
+                title=title,
+                author=author,
+            )
+        ]
+
+    async def availability_bulk(self, *, provider_item_ids):
+        return []
+
+
+class EmptyProvider:
+    name = "fixture"
+
+    async def search(self, *, title, author, isbn10, isbn13, limit=10):
+        return []
+
+    async def availability_bulk(self, *, provider_item_ids):
+        return []
+
+
+def _import(db_session, user, source, titles):
+    upsert_shelf_items(
+        db_session,
+        user_id=user.id,
+        source=source,
+        items=[
+            {"external_id": f"ext-{i}", "title": t, "author": "Author"}
+            for i, t in enumerate(titles)
+        ],
+    )
+
+
+async def test_refresh_only_processes_new_or_changed_items(db_session):
+    user = User(email="inc@example.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    source = ShelfSource(user_id=user.id, source_type="csv", source_ref="x")
+    db_session.add(source)
+    db_session.flush()
+
+    titles = [f"Book {i}" for i in range(5)]
+    _import(db_session, user, source, titles)
+
+    pending = list_shelf_items_needing_match(db_session, user_id=user.id)
+    assert len(pending) == 5
+    await match_and_persist(
+        db_session,
+        EchoProvider(),  # type: ignore[arg-type]
+        user_id=user.id,
+        items=pending,
+        concurrency=2,
+        batch_size=10,
+    )
+    assert list_shelf_items_needing_match(db_session, user_id=user.id) == []
+
+    # Re-importing identical rows is a no-op; an edited title and a new row are not.
+    titles[2] = "Book 2 (Revised)"
+    _import(db_session, user, source, titles + ["Book 5"])
+    pending = list_shelf_items_needing_match(db_session, user_id=user.id)
+    assert sorted(i.title for i in pending) == ["Book 2 (Revised)", "Book 5"]
+
+    everything = list_shelf_items_needing_match(db_session, user_id=user.id, full=True)
+    assert len(everything) == 6
+
+
+async def test_items_without_fingerprint_are_matched_once(db_session):
+    user = User(email="legacy@example.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    item = ShelfItem(
+        user_id=user.id,
+        title="Legacy",
+        author="Author",
+        normalized_title="legacy",
+        normalized_author="author",
+    )
+    db_session.add(item)
+    db_session.commit()
+
+    await match_and_persist(
+        db_session,
+        EchoProvider(),  # type: ignore[arg-type]
+        user_id=user.id,
+        items=[item],
+        concurrency=1,
+        batch_size=10,
+    )
+    assert list_shelf_items_needing_match(db_session, user_id=user.id) == []
+
+
+async def test_unmatched_items_are_not_retried_until_they_change(db_session):
+    user = User(email="miss@example.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    source = ShelfSource(user_id=user.id, source_type="csv", source_ref="x")
+    db_session.add(source)
+    db_session.flush()
+    _import(db_session, user, source, ["Obscure Book"])
+
+    async def _refresh():
+        return await match_and_persist(
+            db_session,
+            EmptyProvider(),  # type: ignore[arg-type]
+            user_id=user.id,
+            items=list_shelf_items_needing_match(db_session, user_id=user.id),
+            concurrency=1,
+            batch_size=10,
+        )
+
+    first = await _refresh()
+    assert (first.total, first.unmatched) == (1, 1)
+    assert (await _refresh()).total == 0
+
+    _import(db_session, user, source, ["Obscure Book (2nd ed.)"])
+    assert (await _refresh()).total == 1
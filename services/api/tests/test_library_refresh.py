@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from app.models import (
+    CatalogItem,
+    CatalogMatch,
+    LibraryAvailability,
+    NotificationEvent,
+    ShelfItem,
+    User,
+    UserSettings,
+)
+from app.services.catalog.types import AvailabilityStatus, Format, ProviderAvailability
+from app.services.library_refresh import refresh_library_availability
+from sqlalchemy import select
+
+
+class CountingCatalog:
+    name = "fixture"
+
+    def __init__(self, status: AvailabilityStatus):
+        self.status = status
+        self.calls: list[list[str]] = []
+
+    async def search(self, **kwargs):
+        return []
+
+    async def availability_bulk(self, *, provider_item_ids):
+        self.calls.append(sorted(provider_item_ids))
+        return [
+            ProviderAvailability(
+                provider="fixture",
+                provider_item_id=pid,
+                format=Format.ebook,
+                status=self.status,
+            )
+            for pid in provider_item_ids
+        ]
+
+
+def _seed(db_session, *, users: int, library: str | None, books: list[CatalogItem]):
+    for n in range(users):
+        user = User(email=f"{library}-{n}@example.com", password_hash="x")
+        db_session.add(user)
+        db_session.flush()
+        db_session.add(UserSettings(user_id=user.id, library_system=library))
+        for ci in books:
+            si = ShelfItem(
+                user_id=user.id,
+                title=ci.title,
+                author="A",
+                normalized_title=ci.title.lower(),
+                normalized_author="a",
+            )
+            db_session.add(si)
+            db_session.flush()
+            db_session.add(
+                CatalogMatch(
+                    user_id=user.id,
+                    shelf_item_id=si.id,
+                    catalog_item_id=ci.id,
+                    provider="fixture",
+                    method="isbn",
+                    confidence=1.0,
+                    evidence={},
+                )
+            )
+    db_session.commit()
+
+
+def test_refresh_queries_each_library_item_once_and_fans_out(db_session):
+    books = [
+        CatalogItem(provider="fixture", provider_item_id=f"p{i}", title=f"B{i}")
+        for i in range(3)
+    ]
+    db_session.add_all(books)
+    db_session.flush()
+    _seed(db_session, users=4, library="springfield", books=books)
+    _seed(db_session, users=2, library=None, books=books[:1])
+
+    hold = CountingCatalog(AvailabilityStatus.hold)
+    stats = refresh_library_availability(db_session, hold, batch_size=2)  # type: ignore[arg-type]
+
+    # "default" library: p0; springfield: p0..p2 in batches of two.
+    assert hold.calls == [["p0"], ["p0", "p1"], ["p2"]]
+    assert (stats.libraries, stats.items, stats.provider_calls) == (2, 4, 3)
+    shared = db_session.execute(select(LibraryAvailability)).scalars().all()
+    # One row per (library, book, format), however many users shelved the book:
+    # ebook from the provider, audiobook filled in as not_owned.
+    assert len(shared) == (3 + 1) * 2
+    assert stats.rows_written == len(shared)
+
+    notified: dict[str, int] = {}
+
+    def _collect(created):
+        for c in created:
+            notified[c.user_id] = notified.get(c.user_id, 0) + 1
+
+    available = CountingCatalog(AvailabilityStatus.available)
+    stats = refresh_library_availability(
+        db_session,
+        available,  # type: ignore[arg-type]
+        batch_size=100,
+        on_notifications=_collect,
+    )
+    assert len(available.calls) == 2
+    assert stats.notifications == 4 * 3 + 2 * 1
+    assert sorted(notified.values()) == [1, 1, 3, 3, 3, 3]
+    events = db_session.execute(select(NotificationEvent)).scalars().all()
+    assert {(e.old_status, e.new_status) for e in events} == {("hold", "available")}
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from app.models import CatalogMatch, MatchCacheEntry, ShelfItem, User
+from app.services.catalog.types import ProviderBook
+from app.services.matching.pipeline import match_and_persist
+from sqlalchemy import select
+
+
+class CountingProvider:
+    name = "fixture"
+
+    def __init__(self):
+        self.searches = 0
+
+    async def search(self, *, title, author, isbn10, isbn13, limit=10):
+        self.searches += 1
+        return [
+            ProviderBook(
+                provider="fixture",
+                provider_item_id=f"pid-{title}",
+                title=title,
+                author=author,
+                isbn13=isbn13,
+            )
+        ]
+
+    async def availability_bulk(self, *, provider_item_ids):
+        return []
+
+
+def _user_with_books(db_session, email: str) -> tuple[User, list[ShelfItem]]:
+    user = User(email=email, password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    items = [
+        ShelfItem(
+            user_id=user.id,
+            title="Dune",
+            author="Frank Herbert",
+            isbn13="9780441172719",
+            normalized_title="dune",
+            normalized_author="frank herbert",
+        ),
+        ShelfItem(
+            user_id=user.id,
+            # Punctuation/case differences collapse to the same normalized key.
+            title="The Hobbit!" if email.startswith("a") else "the hobbit",
+            author="J.R.R. Tolkien",
+            normalized_title="the hobbit",
+            normalized_author="j r r tolkien",
+        ),
+    ]
+    db_session.add_all(items)
+    db_session.commit()
+    return user, items
+
+
+async def _run(db_session, provider, user, items):
+    return await match_and_persist(
+        db_session,
+        provider,  # type: ignore[arg-type]
+        user_id=user.id,
+        items=items,
+        concurrency=2,
+        batch_size=10,
+    )
+
+
+async def test_second_user_reuses_cached_matches(db_session):
+    provider = CountingProvider()
+    alice, alice_items = _user_with_books(db_session, "a@example.com")
+    bob, bob_items = _user_with_books(db_session, "b@example.com")
+
+    first = await _run(db_session, provider, alice, alice_items)
+    assert (first.matched, first.cache_hits, provider.searches) == (2, 0, 2)
+    assert len(db_session.execute(select(MatchCacheEntry)).scalars().all()) == 2
+
+    second = await _run(db_session, provider, bob, bob_items)
+    assert (second.matched, second.cache_hits, provider.searches) == (2, 2, 2)
+
+    by_user: dict[str, dict[str, str]] = {}
+    for m in db_session.execute(select(CatalogMatch)).scalars():
+        by_user.setdefault(m.user_id, {})[m.method] = m.catalog_item_id
+    assert by_user[alice.id] == by_user[bob.id]
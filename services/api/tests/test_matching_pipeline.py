@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.models import CatalogItem, CatalogMatch, ShelfItem, User
+from app.services.catalog.types import ProviderBook
+from app.services.matching.pipeline import match_and_persist
+from sqlalchemy import select
+
+
+class SlowProvider:
+    """Catalog provider with I/O latency that records peak in-flight searches."""
+
+    name = "fixture"
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+
+    async def search(self, *, title, author, isbn10, isbn13, limit=10):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if title.startswith("Unknown"):
+            return []
+        # Two shelf items share each catalog book to exercise in-batch dedupe.
+        n = int(title.split()[-1]) // 2
+        return [
+            ProviderBook(
+                provider="fixture",
+                provider_item_id=f"book-{n}",
+                title=title,
+                author=author,
+            )
+        ]
+
+    async def availability_bulk(self, *, provider_item_ids):
+        return []
+
+
+def _seed(db_session, n: int) -> tuple[User, list[ShelfItem]]:
+    user = User(email="m@example.com", password_hash="x")
+    db_session.add(user)
+    db_session.flush()
+    items = []
+    for i in range(n):
+        title = f"Unknown {i}" if i % 5 == 4 else f"Title {i}"
+        items.append(
+            ShelfItem(
+                user_id=user.id,
+                title=title,
+                author="Author",
+                normalized_title=title.lower(),
+                normalized_author="author",
+            )
+        )
+    db_session.add_all(items)
+    db_session.commit()
+    return user, items
+
+
+async def test_pipeline_bounds_concurrency_and_persists_batches(db_session):
+    user, items = _seed(db_session, 20)
+    provider = SlowProvider()
+
+    stats = await match_and_persist(
+        db_session,
+        provider,  # type: ignore[arg-type]
+        user_id=user.id,
+        items=items,
+        concurrency=4,
+        batch_size=3,
+    )
+
+    assert provider.peak == 4
+    assert (stats.total, stats.matched, stats.unmatched) == (20, 16, 4)
+
+    matches = db_session.execute(select(CatalogMatch)).scalars().all()
+    assert len(matches) == 16
+    assert {m.method for m in matches} == {"fuzzy"}
+    assert len(db_session.execute(select(CatalogItem)).scalars().all()) == 10
+
+
+async def test_pipeline_rerun_updates_in_place(db_session):
+    user, items = _seed(db_session, 6)
+    provider = SlowProvider(delay=0)
+
+    for _ in range(2):
+        await match_and_persist(
+            db_session,
+            provider,  # type: ignore[arg-type]
+            user_id=user.id,
+            items=items,
+            concurrency=2,
+            batch_size=100,
+        )
+
+    assert len(db_session.execute(select(CatalogMatch)).scalars().all()) == 5
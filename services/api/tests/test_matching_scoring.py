@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import random
+import re
+from difflib import SequenceMatcher
+
+from app.services.catalog.types import ProviderBook
+from app.services.matching.matcher import resolve_matches
+from app.services.matching.scoring import score_batch
+
+_WORDS = ["The", "hobbit", "Tolkien", "J.R.R.", "war", "&", "Peace", "dune:", "Ünï"]
+
+
+def _legacy_norm(s: str) -> str:
+    s = s.lower().strip()
+    s = re.sub(r"[^a-z0-9\s]", " ", s)
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+
+def _legacy_ratio(a: str, b: str) -> float:
+    if not a or not b:
+        return 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def _legacy_score(title, author, c: ProviderBook) -> tuple[float, float]:
+    t, a = _legacy_norm(title or ""), _legacy_norm(author or "")
+    ct, ca = _legacy_norm(c.title or ""), _legacy_norm(c.author or "")
+    title_score = _legacy_ratio(t, ct)
+    author_score = _legacy_ratio(a, ca) if a and ca else 0.5
+    return 0.75 * title_score + 0.25 * author_score, title_score
+
+
+class _Item:
+    def __init__(self, title, author):
+        self.title = title
+        self.author = author
+        self.isbn10 = None
+        self.isbn13 = None
+
+
+def _phrase(rng: random.Random) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(0, 4)))
+
+
+def test_batch_scores_match_legacy_pairwise_scores():
+    rng = random.Random(3)
+    pool = [
+        ProviderBook(
+            provider="fixture",
+            provider_item_id=str(i),
+            title=_phrase(rng),
+            author=_phrase(rng) or None,
+        )
+        for i in range(40)
+    ]
+    queries = [(_phrase(rng), _phrase(rng)) for _ in range(60)]
+    candidates = [rng.sample(pool, rng.randint(0, 8)) for _ in queries]
+
+    scores = score_batch(queries, candidates)
+
+    pos = 0
+    for (title, author), cands in zip(queries, candidates):
+        for c in cands:
+            combined, title_score = _legacy_score(title, author, c)
+            assert scores.combined[pos] == combined
+            assert scores.title[pos] == title_score
+            pos += 1
+    assert pos == len(scores.combined)
+
+    results = resolve_matches([_Item(t, a) for t, a in queries], candidates)  # type: ignore[misc]
+    for (title, author), cands, res in zip(queries, candidates, results):
+        legacy = [(*_legacy_score(title, author, c), c) for c in cands]
+        legacy.sort(key=lambda x: (x[0], x[1]), reverse=True)
+        if not legacy or legacy[0][0] < 0.72:
+            assert res is None
+        else:
+            assert res is not None
+            assert res.book is legacy[0][2]
+            assert res.confidence == legacy[0][0]
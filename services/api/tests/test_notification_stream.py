@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import gc
+import json
+import sys
+
+from app.api.routes import notifications
+from app.core.pubsub_hub import PubSubHub
+from app.models import User
+from app.workers.events import notification_stream_key, publish_notification_event
+
+
+async def test_events_resume_from_last_event_id(fake_redis, monkeypatch):
+    monkeypatch.setattr("app.workers.events.get_redis", lambda url: fake_redis)
+    for n in range(3):
+        publish_notification_event(user_id="u1", payload={"n": n})
+    key = notification_stream_key("u1")
+    assert [e[0] for e in fake_redis.streams[key]] == ["1-0", "2-0", "3-0"]
+    channel, message = fake_redis.published[-1]
+    assert channel == "notify:u1" and json.loads(message)["id"] == "3-0"
+
+    hub = PubSubHub("redis://unused")
+    monkeypatch.setattr(hub, "_ensure_running", lambda: None)
+
+    async def _read_stream(key, *, after, count):
+        return fake_redis.xrange(key, min=f"({after}", count=count)
+
+    async def _first_stream_id(key):
+        entries = fake_redis.xrange(key, min="-", count=1)
+        return entries[0][0] if entries else None
+
+    monkeypatch.setattr(hub, "read_stream", _read_stream)
+    monkeypatch.setattr(hub, "first_stream_id", _first_stream_id)
+    monkeypatch.setattr(notifications, "get_pubsub_hub", lambda: hub)
+
+    resp = await notifications.stream_notifications(
+        user=User(id="u1", email="x", password_hash="x"), last_event_id="1-0"
+    )
+    events = resp.body_iterator
+    replayed = [await events.__anext__() for _ in range(2)]
+    assert [e.split("\n")[0] for e in replayed] == ["id: 2-0", "id: 3-0"]
+    assert json.loads(replayed[0].split("data: ")[1])["payload"] == {"n": 1}
+
+    # Live messages already covered by the replay are skipped.
+    hub.dispatch("notify:u1", message)
+    publish_notification_event(user_id="u1", payload={"n": 3})
+    hub.dispatch("notify:u1", fake_redis.published[-1][1])
+    live = await events.__anext__()
+    assert live.startswith("id: 4-0\n")
+    await events.aclose()
+    assert hub.subscriber_count == 0
+
+    # A client that disconnects mid-replay closes the replay with it. A replay
+    # left to the asyncio finalizer instead warns "coroutine method 'aclose'
+    # ... was never awaited" once the loop shuts down.
+    finalized: list[str] = []
+    hooks = sys.get_asyncgen_hooks()
+    sys.set_asyncgen_hooks(
+        firstiter=hooks.firstiter,
+        finalizer=lambda agen: finalized.append(agen.__qualname__),
+    )
+    try:
+        resp = await notifications.stream_notifications(
+            user=User(id="u1", email="x", password_hash="x"), last_event_id="1-0"
+        )
+        events = resp.body_iterator
+        assert (await events.__anext__()).startswith("id: 2-0\n")
+        await events.aclose()
+        del resp, events
+        gc.collect()
+    finally:
+        sys.set_asyncgen_hooks(*hooks)
+    assert finalized == []
+    assert hub.subscriber_count == 0
+
+    # Once 1-0 is trimmed, resuming from it could miss events: reset instead.
+    fake_redis.streams[key].pop(0)
+    resp = await notifications.stream_notifications(
+        user=User(id="u1", email="x", password_hash="x"), last_event_id="1-0"
+    )
+    events = resp.body_iterator
+    assert await events.__anext__() == "event: reset\ndata: {}\n\n"
+    await events.aclose()
+
+    # As does an expired stream.
+    resp = await notifications.stream_notifications(
+        user=User(id="u2", email="y", password_hash="x"), last_event_id="1-0"
+    )
+    events = resp.body_iterator
+    assert (await events.__anext__()).startswith("event: reset\n")
+    await events.aclose()
@@ -2,17 +2,21 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
+from app.crud import notifications as notifications_crud
 from app.crud.availability import upsert_snapshots
+from app.crud.notifications import mark_all_read, mark_read, unread_count
 from app.models import (
     AvailabilitySnapshot,
     CatalogItem,
     CatalogMatch,
+    LibraryAvailability,
     ShelfItem,
     User,
     UserSettings,
 )
 from app.models.notification_event import NotificationEvent
 from app.providers.types import AvailabilityResult
+from app.services import unread_counter
 from app.services.catalog.types import AvailabilityStatus, Format, ProviderAvailability
 from sqlalchemy import select
 
@@ -160,3 +164,222 @@ def test_notifications_respect_user_setting(db_session):
     assert created == []
     events = db_session.execute(select(NotificationEvent)).scalars().all()
     assert events == []
+
+
+def test_shared_availability_notifies_every_user_in_the_library(db_session):
+    user, shelf_item, catalog_item = _seed_user_item_match_and_hold_snapshot(
+        db_session,
+        email="c@example.com",
+        notifications_enabled=True,
+    )
+    other = User(email="d@example.com", password_hash="x")
+    db_session.add(other)
+    db_session.flush()
+    other_item = ShelfItem(
+        user_id=other.id,
+        title="Example Title",
+        author="Example Author",
+        normalized_title="example title",
+        normalized_author="example author",
+    )
+    db_session.add(other_item)
+    db_session.flush()
+    db_session.add(
+        CatalogMatch(
+            user_id=other.id,
+            shelf_item_id=other_item.id,
+            catalog_item_id=catalog_item.id,
+            provider="fixture",
+            method="fixture",
+            confidence=1.0,
+            evidence={},
+        )
+    )
+    db_session.commit()
+
+    availability = ProviderAvailability(
+        provider="fixture",
+        provider_item_id="p1",
+        format=Format.ebook,
+        status=AvailabilityStatus.available,
+        copies_available=1,
+        copies_total=1,
+        holds=0,
+    )
+    created = upsert_snapshots(
+        db_session,
+        user_id=user.id,
+        results=[
+            AvailabilityResult(
+                catalog_item_id=catalog_item.id, availability=availability
+            )
+        ],
+    )
+    db_session.commit()
+
+    assert {(c.user_id, c.shelf_item_id) for c in created} == {
+        (user.id, shelf_item.id),
+        (other.id, other_item.id),
+    }
+    shared = db_session.execute(select(LibraryAvailability)).scalars().all()
+    assert [(s.library_system, s.status) for s in shared] == [("default", "available")]
+
+
+def test_unread_counter_tracks_creates_reads_and_drift(
+    db_session, fake_redis, monkeypatch
+):
+    monkeypatch.setattr("app.services.unread_counter.get_redis", lambda: fake_redis)
+    user, _, catalog_item = _seed_user_item_match_and_hold_snapshot(
+        db_session, email="counter@example.com", notifications_enabled=True
+    )
+    key = f"unread:{user.id}"
+
+    assert unread_count(db_session, user_id=user.id) == 0
+    assert fake_redis.store[key] == "0"
+
+    upsert_snapshots(
+        db_session,
+        user_id=user.id,
+        results=[
+            AvailabilityResult(
+                catalog_item_id=catalog_item.id,
+                availability=ProviderAvailability(
+                    provider="fixture",
+                    provider_item_id="p1",
+                    format=Format.ebook,
+                    status=AvailabilityStatus.available,
+                    copies_available=1,
+                    copies_total=1,
+                    holds=0,
+                    deep_link=None,
+                ),
+            )
+        ],
+    )
+    assert fake_redis.store[key] == "0"  # not before commit
+    db_session.commit()
+    assert fake_redis.store[key] == "1"
+    assert unread_count(db_session, user_id=user.id) == 1
+
+    # A counter recreated by a blind INCRBY has no TTL: rebuilt from the DB.
+    fake_redis.delete(key)
+    fake_redis.incrby(key, 5)
+    assert unread_count(db_session, user_id=user.id) == 1
+    assert fake_redis.ttl(key) > 0
+
+    ev = db_session.execute(select(NotificationEvent)).scalar_one()
+    assert mark_read(db_session, user_id=user.id, notification_id=ev.id)
+    assert fake_redis.store[key] == "0"
+    # Already read: still found, but only the first call decrements.
+    assert mark_read(db_session, user_id=user.id, notification_id=ev.id)
+    assert fake_redis.store[key] == "0"
+    assert not mark_read(db_session, user_id="someone-else", notification_id=ev.id)
+    assert not mark_read(db_session, user_id=user.id, notification_id="missing")
+
+    for _ in range(2):
+        _add_unread(db_session, user.id, ev.shelf_item_id)
+    assert fake_redis.store[key] == "2"
+    # Decrements by the rows it marked; it does not force the counter to 0.
+    fake_redis.incrby(key, 1)  # e.g. a notification committed meanwhile
+    assert mark_all_read(db_session, user_id=user.id) == 2
+    assert fake_redis.store[key] == "1"
+
+
+def _add_unread(db_session, user_id: str, shelf_item_id: str) -> None:
+    db_session.add(
+        NotificationEvent(
+            user_id=user_id,
+            shelf_item_id=shelf_item_id,
+            format="ebook",
+            old_status="hold",
+            new_status="available",
+            created_at=utcnow(),
+        )
+    )
+    unread_counter.note_created(db_session, [user_id])
+    db_session.commit()
+
+
+def test_counter_rebuild_does_not_overwrite_an_interleaved_increment(
+    db_session, fake_redis, monkeypatch
+):
+    monkeypatch.setattr("app.services.unread_counter.get_redis", lambda: fake_redis)
+    user, shelf_item, _ = _seed_user_item_match_and_hold_snapshot(
+        db_session, email="race@example.com", notifications_enabled=True
+    )
+    key = f"unread:{user.id}"
+    _add_unread(db_session, user.id, shelf_item.id)
+    fake_redis.delete(key)
+
+    # A notification is committed (and counted) between the rebuild's COUNT
+    # and its SET: the stale count must not replace the new counter.
+    real_count = notifications_crud._count_unread
+
+    def _count_then_interleave(db, *, user_id):
+        count = real_count(db, user_id=user_id)
+        _add_unread(db_session, user.id, shelf_item.id)
+        return count
+
+    monkeypatch.setattr(notifications_crud, "_count_unread", _count_then_interleave)
+    assert unread_count(db_session, user_id=user.id) == 1
+    monkeypatch.setattr(notifications_crud, "_count_unread", real_count)
+
+    # The INCRBY-created key has no TTL: the next read rebuilds it exactly.
+    assert unread_count(db_session, user_id=user.id) == 2
+    assert fake_redis.store[key] == "2" and fake_redis.ttl(key) > 0
+
+
+def test_notification_cursor_pages_match_offset_pages(client, db_session):
+    client.post(
+        "/v1/auth/signup",
+        json={"email": "pages@example.com", "password": "password123"},
+    )
+    user = db_session.execute(
+        select(User).where(User.email == "pages@example.com")
+    ).scalar_one()
+    item = ShelfItem(
+        user_id=user.id,
+        title="Paged",
+        author="Author",
+        normalized_title="paged",
+        normalized_author="author",
+    )
+    db_session.add(item)
+    db_session.flush()
+    same_time = utcnow()
+    for i in range(5):
+        db_session.add(
+            NotificationEvent(
+                user_id=user.id,
+                shelf_item_id=item.id,
+                format="ebook",
+                old_status="hold",
+                new_status="available",
+                created_at=same_time if i < 3 else utcnow(),
+                read_at=utcnow() if i == 0 else None,
+            )
+        )
+    db_session.commit()
+
+    full = client.get("/v1/notifications", params={"limit": 50}).json()
+    expected = [n["id"] for n in full["items"]]
+    assert full["page"]["total"] == 5 and full["page"]["next_cursor"] is None
+
+    seen: list[str] = []
+    params: dict = {"limit": 2, "include_total": False}
+    while True:
+        page = client.get("/v1/notifications", params=params).json()
+        assert page["page"]["total"] is None
+        seen.extend(n["id"] for n in page["items"])
+        if page["page"]["next_cursor"] is None:
+            break
+        params["cursor"] = page["page"]["next_cursor"]
+    assert seen == expected
+
+    unread = client.get(
+        "/v1/notifications", params={"limit": 3, "unread_only": True}
+    ).json()
+    assert unread["page"]["total"] == 4 and unread["page"]["next_cursor"]
+
+    bad = client.get("/v1/notifications", params={"cursor": "nope"})
+    assert bad.status_code == 400
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+
+from app.core.config import settings
+from app.core.pubsub_hub import PubSubHub
+from app.core.sse import ClientBuffer, sse_stats, sse_stream
+
+
+async def test_hub_fans_out_per_channel_and_drops_oldest(monkeypatch):
+    hub = PubSubHub("redis://unused", buffer_size=2)
+    monkeypatch.setattr(hub, "_ensure_running", lambda: None)
+
+    async with hub.subscribe("notify:a") as a1, hub.subscribe("notify:a") as a2:
+        async with hub.subscribe("notify:b") as b:
+            assert hub.subscriber_count == 3
+            assert hub.dispatch("notify:a", "1") == 2
+            assert hub.dispatch("sync:x:y", "ignored") == 0
+            assert (await a1.get(0), await a2.get(0)) == ("1", "1")
+            assert len(b) == 0
+
+            for n in ("2", "3", "4"):
+                hub.dispatch("notify:b", n)
+            assert [await b.get(0), await b.get(0)] == ["3", "4"]
+
+    assert hub.subscriber_count == 0
+    assert hub.dispatch("notify:a", "late") == 0
+
+
+async def test_buffer_coalesces_then_evicts_slow_consumer():
+    def key(data: str) -> str | None:
+        kind = json.loads(data)["type"]
+        return kind if kind == "progress" else None
+
+    buf = ClientBuffer(2, coalesce=key)
+    for n in range(3):
+        buf.offer(json.dumps({"type": "progress", "n": n}))
+    assert len(buf) == 2 and not buf.evicted
+    assert [json.loads(await buf.get(0))["n"] for _ in range(2)] == [0, 2]
+
+    for n in range(4):
+        buf.offer(json.dumps({"type": "done", "n": n}))
+    assert buf.evicted
+
+
+async def test_stream_heartbeats_when_quiet_and_ends_when_idle(monkeypatch):
+    monkeypatch.setattr(settings, "sse_heartbeat_secs", 0.01)
+    monkeypatch.setattr(settings, "sse_idle_timeout_secs", 0.05)
+    hub = PubSubHub("redis://unused", buffer_size=2)
+    monkeypatch.setattr(hub, "_ensure_running", lambda: None)
+    expired = sse_stats().expired_connections
+
+    chunks = [
+        chunk async for chunk in sse_stream(hub.subscribe("sync:u:r"), lambda d: d)
+    ]
+    assert chunks and set(chunks) == {": keepalive\n\n"}
+    assert sse_stats().expired_connections == expired + 1
+    assert sse_stats().active_connections == 0
+    assert hub.subscriber_count == 0
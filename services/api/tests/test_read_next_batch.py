@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+from app.services.read_next_batch import AvailabilityColumns, compute_read_next_batch
+from app.services.read_next_scoring import compute_read_next
+
+
+def _random_entry(rng: random.Random) -> dict:
+    def maybe(v):
+        return None if rng.random() < 0.2 else v
+
+    return {
+        "format": rng.choice(["ebook", "audiobook", "magazine", None]),
+        "status": rng.choice(["available", "hold", "not_owned", "unknown", None]),
+        "copies_available": maybe(rng.randint(-1, 15)),
+        "copies_total": maybe(rng.randint(0, 6)),
+        "holds": maybe(rng.randint(0, 300)),
+    }
+
+
+@pytest.mark.parametrize(
+    "preferred", [[], ["ebook"], ["audiobook", "ebook"], ["ebook", "audiobook"]]
+)
+def test_batch_reproduces_compute_read_next(preferred):
+    rng = random.Random(1234)
+    rows = [[_random_entry(rng) for _ in range(rng.randint(0, 4))] for _ in range(2000)]
+    rows.append(None)
+
+    batch = compute_read_next_batch(AvailabilityColumns.from_rows(rows), preferred)
+
+    for i, entries in enumerate(rows):
+        assert batch.result(i) == compute_read_next(entries, preferred), entries